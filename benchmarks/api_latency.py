@@ -0,0 +1,153 @@
+"""
+Prediction API latency benchmark
+
+Starts wellwatch.api in a subprocess (or targets --host/--port of a
+running server) and sends POST /predict requests at a fixed rate from a
+pool of keep-alive connections. Requests are scheduled open-loop, so a
+slow response delays neither the schedule nor the latency it reports.
+
+Usage:
+    python -m benchmarks.api_latency --rps 300 --seconds 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+PATIENTS = [
+    {'patient_id': 'PAT00123', 'age': 35, 'gender': 'Female', 'location': 'Semi-Urban',
+     'height_cm': 160, 'weight_kg': 58, 'systolic_bp': 120, 'diastolic_bp': 78, 'pulse_rate': 72,
+     'fasting_glucose': 98, 'smoking': 0, 'alcohol': 0, 'physical_activity': 'Moderate',
+     'diet_quality': 'Average', 'family_diabetes': 0, 'family_hypertension': 0,
+     'family_heart_disease': 0, 'fatigue': 0, 'breathlessness': 0, 'chest_pain': 0,
+     'frequent_urination': 0, 'blurred_vision': 0},
+    {'patient_id': 'PAT00456', 'age': 62, 'gender': 'Male', 'systolic_bp': 158, 'fasting_glucose': 142},
+]
+
+def synthetic_patients(n, seed=42):
+    """n distinct patients (distinct vitals, so the result cache rarely hits)"""
+    rng = np.random.default_rng(seed)
+    return [
+        {**PATIENTS[i % 2], 'patient_id': f'PAT{i:06d}', 'age': int(rng.integers(18, 85)),
+         'systolic_bp': int(rng.integers(95, 190)), 'fasting_glucose': int(rng.integers(70, 250))}
+        for i in range(n)
+    ]
+
+async def _connection(host, port, queue, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while (item := await queue.get()) is not None:
+            scheduled, body = item
+            writer.write(f'POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n'
+                         f'Content-Length: {len(body)}\r\n\r\n'.encode() + body)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) != b'\r\n':
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            await reader.readexactly(length)
+            latencies.append((time.perf_counter() - scheduled) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+async def run_load(host, port, rps, seconds, connections, unique):
+    bodies = [json.dumps(patient).encode() for patient in synthetic_patients(unique)]
+    queue = asyncio.Queue()
+    latencies, errors = [], []
+    workers = [asyncio.create_task(_connection(host, port, queue, latencies, errors))
+               for _ in range(connections)]
+
+    start = time.perf_counter()
+    total = int(rps * seconds)
+    for i in range(total):
+        scheduled = start + i / rps
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        queue.put_nowait((scheduled, bodies[i % len(bodies)]))
+    for _ in workers:
+        queue.put_nowait(None)
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'target_rps': rps,
+        'achieved_rps': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+    }
+
+def wait_for_server(host, port, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'API server did not start on {host}:{port}')
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark POST /predict latency at a fixed request rate')
+    parser.add_argument('--host', default='127.0.0.1', help='Server host')
+    parser.add_argument('--port', type=int, default=8765, help='Server port')
+    parser.add_argument('--external', action='store_true', help='Use a running server instead of starting one')
+    parser.add_argument('--rps', type=float, default=300, help='Requests per second')
+    parser.add_argument('--seconds', type=float, default=20, help='Test duration')
+    parser.add_argument('--connections', type=int, default=32, help='Keep-alive connections')
+    parser.add_argument('--unique', type=int, default=100_000, help='Distinct patients to cycle through')
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        help='Server micro-batch size (1 disables batching)')
+    parser.add_argument('--max-wait-ms', type=float, default=2.0, help='Server micro-batch wait')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    server = None
+    if not args.external:
+        server = subprocess.Popen([sys.executable, '-W', 'ignore', '-m', 'wellwatch.api',
+                                   '--host', args.host, '--port', str(args.port),
+                                   '--max-batch-size', str(args.max_batch_size),
+                                   '--max-wait-ms', str(args.max_wait_ms)],
+                                  stdout=subprocess.DEVNULL, env={**os.environ, 'PYTHONPATH': os.getcwd()})
+    try:
+        wait_for_server(args.host, args.port)
+        # Warm-up: first requests pay for lazy imports and allocator growth
+        asyncio.run(run_load(args.host, args.port, 100, 1, 4, 100))
+        results = asyncio.run(run_load(args.host, args.port, args.rps, args.seconds,
+                                       args.connections, args.unique))
+        with urllib.request.urlopen(f'http://{args.host}:{args.port}/health') as response:
+            batching = json.load(response)['data'].get('batching')
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{results['requests']:,} requests at {results['achieved_rps']:.0f}/s "
+          f"(target {args.rps:.0f}/s), {results['errors']} errors")
+    print(f"p50 {results['p50_ms']:.2f} ms   p99 {results['p99_ms']:.2f} ms   max {results['max_ms']:.2f} ms")
+    if batching:
+        results['batching'] = batching
+        print(f"server batches: mean size {batching['mean_batch_size']:.1f}, "
+              f"queue delay p99 {batching['queue_delay_ms']['p99']:.2f} ms")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
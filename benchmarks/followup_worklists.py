@@ -0,0 +1,118 @@
+"""
+Follow-up worklist benchmark
+
+Saves synthetic screenings for a CHW workforce into a scratch database
+through storage.save_screenings() (which schedules the follow-ups), then
+times the daily worklists of every CHW from one query against a call per
+CHW (chw_worklist(), and its bare SQL with and without the (chw_id,
+status, due_date) index).
+
+Usage:
+    python -m benchmarks.followup_worklists --chws 10000 --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from wellwatch.followup import OPEN_STATUS, chw_worklist, worklist_sql, worklists
+from wellwatch.storage import close_databases, get_database, save_screenings
+
+def populate(db_path, n_rows, n_chws, batch_size=50_000, seed=42):
+    """Save n_rows screenings over the last year, four per patient on average, each patient with one CHW"""
+    rng = np.random.default_rng(seed)
+    n_patients = max(n_rows // 4, 1)
+    patient_chw = np.char.add('CHW', np.char.zfill(rng.integers(1, n_chws + 1, n_patients).astype(str), 5))
+    now = pd.Timestamp(datetime.now()).floor('s')
+
+    for start in range(0, n_rows, batch_size):
+        n = min(batch_size, n_rows - start)
+        patients = rng.integers(0, n_patients, n)
+        save_screenings(pd.DataFrame({
+            'patient_id': np.char.add('PAT', patients.astype(str)),
+            'screening_date': (now - pd.to_timedelta(rng.integers(0, 365 * 86400, n), unit='s'))
+                              .strftime('%Y-%m-%d %H:%M:%S'),
+            'risk_level': rng.choice(['Low', 'Medium', 'High'], n, p=[0.55, 0.30, 0.15]),
+            'risk_score': rng.integers(0, 101, n),
+            'chw_id': patient_chw[patients],
+        }), db_path=db_path)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark daily follow-up worklists')
+    parser.add_argument('--chws', type=int, default=10_000, help='CHWs in the workforce')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic screenings to save')
+    parser.add_argument('--sample', type=int, default=200, help='CHWs timed for the per-CHW queries')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'bench.db')
+        start = time.perf_counter()
+        populate(db_path, args.rows, args.chws)
+        print(f'Saved {args.rows:,} screenings for {args.chws:,} CHWs in {time.perf_counter() - start:.1f}s')
+
+        db = get_database(db_path)
+        (open_count,), = db.query("SELECT COUNT(*) FROM interventions WHERE status = 'scheduled'")
+        (patients,), = db.query('SELECT COUNT(DISTINCT patient_id) FROM screenings')
+        assert open_count == patients, 'every patient should have exactly one open follow-up'
+        chw_ids = [row[0] for row in db.query('SELECT DISTINCT chw_id FROM interventions')]
+        sample = chw_ids[:args.sample]
+
+        start = time.perf_counter()
+        frame = worklists(db_path=db_path)
+        all_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for chw_id in sample:
+            chw_worklist(chw_id, db_path=db_path)
+        per_chw_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+        def time_sql(chw_ids):
+            """Mean ms of the bare worklist query for one CHW"""
+            day_end = (pd.Timestamp('today').normalize() + pd.Timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
+            start = time.perf_counter()
+            for chw_id in chw_ids:
+                sql, params = worklist_sql([chw_id])
+                db.query(sql, (*params, OPEN_STATUS, day_end))
+            return (time.perf_counter() - start) / len(chw_ids) * 1000
+
+        sql_ms = time_sql(sample)
+        with db.transaction() as conn:
+            conn.execute('DROP INDEX idx_interventions_chw_status_due')
+        unindexed_ms = time_sql(sample[:10])
+        close_databases()
+
+    results = {
+        'rows': args.rows,
+        'chws': len(chw_ids),
+        'open_follow_ups': open_count,
+        'due_today': len(frame),
+        'all_chws_one_query_s': all_seconds,
+        'per_chw_call_ms': per_chw_ms,
+        'per_chw_calls_all_s': per_chw_ms * len(chw_ids) / 1000,
+        'per_chw_sql_ms': sql_ms,
+        'per_chw_sql_all_s': sql_ms * len(chw_ids) / 1000,
+        'per_chw_unindexed_ms': unindexed_ms,
+        'per_chw_unindexed_all_s': unindexed_ms * len(chw_ids) / 1000,
+    }
+    print(f"\n{results['due_today']:,} due or overdue of {open_count:,} open follow-ups")
+    print(f"{'all CHWs, one query':<36}{all_seconds:>10.2f} s")
+    print(f"{'chw_worklist() per CHW':<36}{results['per_chw_calls_all_s']:>10.2f} s"
+          f'  ({per_chw_ms:.2f} ms each)')
+    print(f"{'bare SQL per CHW (indexed)':<36}{results['per_chw_sql_all_s']:>10.2f} s"
+          f'  ({sql_ms:.3f} ms each)')
+    print(f"{'bare SQL per CHW (no index)':<36}{results['per_chw_unindexed_all_s']:>10.2f} s"
+          f'  ({unindexed_ms:.1f} ms each)')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
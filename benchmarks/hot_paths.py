@@ -0,0 +1,435 @@
+"""
+Hot-path benchmark suite
+
+Builds synthetic cohorts with the training notebook's
+generate_synthetic_data() (read from WELLWATCH_INDIA.ipynb, so the
+distributions and missing values follow the notebook) at each --sizes row
+count, scores them with the rules to get stored screenings, and times the
+hot paths on them:
+
+    scoring_simple   predict_risk_simple(), one patient per call
+    scoring_batch    predict_risk_batch() over --chunk-size rows
+    preprocess       RiskEngine.build_features() (the notebook's preprocess() at inference time)
+    model_single     RiskEngine.predict(), one patient per call
+    model_batch      RiskEngine.predict_batch() over --chunk-size rows
+    shap_explain     RiskExplainer.explain(), one patient per call
+    pdf_report       report_pdf() with a shared ReportTemplate, one patient per call
+    sqlite_insert    save_screenings() of --chunk-size rows into an empty database
+    sqlite_query     Admin Panel pages and patient timelines on the cohort's database
+    dashboard        the Community Dashboard's rollup aggregation queries
+
+Each case runs in a fresh interpreter, so its peak RSS is its own. Per-call
+cases time up to --max-calls patients; batch cases time every chunk of the
+cohort --repeat times. Results are JSON: throughput, p50/p99/mean latency
+and peak RSS per case and size. With --baseline they are compared against a
+stored run, and the exit status is 1 when any case regressed by more than
+--tolerance.
+
+Usage:
+    python -m benchmarks.hot_paths --sizes 1000 100000 1000000
+    python -m benchmarks.hot_paths --sizes 1000 --cases scoring_batch model_batch --baseline
+    python -m benchmarks.hot_paths --update-baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+NOTEBOOK_PATH = 'WELLWATCH_INDIA.ipynb'
+BASELINE_PATH = os.path.join('benchmarks', 'baselines', 'hot_paths.json')
+
+RANDOM_SEED = 42  # the notebook's
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+DEFAULT_CHUNK_SIZE = 10_000
+DEFAULT_MAX_CALLS = 2_000
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+N_CHWS = 500
+SCREENING_DAYS = 90
+
+# Columns generate_synthetic_data() adds that are not screening inputs
+LABEL_COLUMNS = ('risk_label',)
+
+# ================================================================================
+# COHORTS
+# ================================================================================
+
+def load_generator(notebook_path=NOTEBOOK_PATH):
+    """generate_synthetic_data() from the training notebook"""
+    with open(notebook_path, encoding='utf-8') as f:
+        cells = json.load(f)['cells']
+    for cell in cells:
+        source = ''.join(cell['source'])
+        if cell['cell_type'] == 'code' and 'def generate_synthetic_data' in source:
+            namespace = {'np': np, 'pd': pd, 'RANDOM_SEED': RANDOM_SEED}
+            exec(source, namespace)
+            return namespace['generate_synthetic_data']
+    raise ValueError(f'{notebook_path} has no generate_synthetic_data() cell')
+
+def synthetic_cohort(n_rows, notebook_path=NOTEBOOK_PATH):
+    """
+    n_rows screenings: the notebook's synthetic patients, scored with the
+    rules and spread over the last SCREENING_DAYS days across N_CHWS CHWs
+    """
+    from wellwatch.scoring import predict_risk_batch
+
+    cohort = load_generator(notebook_path)(n_samples=n_rows).drop(columns=list(LABEL_COLUMNS))
+    batch = predict_risk_batch(cohort)
+    rng = np.random.default_rng(RANDOM_SEED)
+    now = pd.Timestamp('now').floor('s')
+
+    cohort['risk_level'] = batch['risk_level']
+    cohort['risk_score'] = batch['risk_score']
+    cohort['screening_date'] = (now - pd.to_timedelta(rng.integers(0, SCREENING_DAYS * 86400, n_rows), unit='s')
+                                ).strftime('%Y-%m-%d %H:%M:%S')
+    cohort['chw_id'] = np.char.add('CHW', np.char.zfill(rng.integers(1, N_CHWS + 1, n_rows).astype(str), 3))
+    cohort['model_version'] = 'rules'
+    return cohort
+
+def patient_records(cohort, n):
+    """The first n patients as predict()-style input dicts"""
+    return cohort.head(n).to_dict('records')
+
+def chunks(cohort, size):
+    """Consecutive row slices of at most size rows"""
+    return [cohort.iloc[start:start + size] for start in range(0, len(cohort), size)]
+
+def ensure_database(cohort, db_path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """The cohort's screening database, saved by sqlite_insert or built here when that case did not run"""
+    from wellwatch.storage import close_databases, save_screenings
+
+    if not os.path.exists(db_path):
+        for chunk in chunks(cohort, chunk_size):
+            save_screenings(chunk, db_path=db_path)
+        close_databases()
+    return db_path
+
+# ================================================================================
+# CASES
+# ================================================================================
+
+class Workload:
+    """
+    One benchmark case, ready to time
+
+    call(item) is timed once per item (repeat times over items); rows is
+    the number of cohort rows each item stands for.
+    """
+
+    def __init__(self, call, items, rows=None, repeat=1, warmup=True, teardown=None):
+        self.call = call
+        self.items = items
+        self.rows = rows if rows is not None else [1] * len(items)
+        self.repeat = repeat
+        self.warmup = warmup
+        self.teardown = teardown
+
+CASES = {}
+
+def case(name, unit):
+    """Register a workload builder(cohort, workdir, args) under name; unit names what throughput counts"""
+    def register(builder):
+        builder.unit = unit
+        CASES[name] = builder
+        return builder
+    return register
+
+def _engine():
+    from wellwatch.inference import RiskEngine
+    return RiskEngine.load(cache_size=0)
+
+def _batch(call, cohort, args):
+    """Workload timing call() on every --chunk-size chunk, --repeat times"""
+    parts = chunks(cohort, args.chunk_size)
+    return Workload(call, parts, [len(part) for part in parts], repeat=args.repeat)
+
+@case('scoring_simple', 'patients/s')
+def scoring_simple(cohort, workdir, args):
+    from wellwatch.scoring import predict_risk_simple
+    return Workload(predict_risk_simple, patient_records(cohort, args.max_calls))
+
+@case('scoring_batch', 'rows/s')
+def scoring_batch(cohort, workdir, args):
+    from wellwatch.scoring import predict_risk_batch
+    return _batch(predict_risk_batch, cohort, args)
+
+@case('preprocess', 'rows/s')
+def preprocess(cohort, workdir, args):
+    return _batch(_engine().build_features, cohort, args)
+
+@case('model_single', 'patients/s')
+def model_single(cohort, workdir, args):
+    return Workload(_engine().predict, patient_records(cohort, args.max_calls))
+
+@case('model_batch', 'rows/s')
+def model_batch(cohort, workdir, args):
+    return _batch(_engine().predict_batch, cohort, args)
+
+@case('shap_explain', 'patients/s')
+def shap_explain(cohort, workdir, args):
+    from wellwatch.explain import RiskExplainer
+    explainer = RiskExplainer(_engine(), cache_size=0)
+    return Workload(explainer.explain, patient_records(cohort, args.max_calls))
+
+@case('pdf_report', 'reports/s')
+def pdf_report(cohort, workdir, args):
+    from wellwatch.reports import ReportTemplate, report_pdf
+    from wellwatch.scoring import predict_risk_simple
+
+    template = ReportTemplate()
+    records = [(record, predict_risk_simple(record)) for record in patient_records(cohort, args.max_calls)]
+    return Workload(lambda item: report_pdf(*item, template=template), records)
+
+@case('sqlite_insert', 'rows/s')
+def sqlite_insert(cohort, workdir, args):
+    from wellwatch.storage import close_databases, get_database, save_screenings
+
+    db_path = os.path.join(workdir, 'insert.db')
+    shared_path = os.path.join(workdir, 'screenings.db')
+    get_database(db_path)  # schema and migrations are not part of the timing
+
+    def keep_database():
+        """Hand the filled database to the query cases"""
+        close_databases()
+        if not os.path.exists(shared_path):
+            os.replace(db_path, shared_path)
+
+    parts = chunks(cohort, args.chunk_size)
+    return Workload(lambda part: save_screenings(part, db_path=db_path), parts, [len(part) for part in parts],
+                    warmup=False, teardown=keep_database)
+
+@case('sqlite_query', 'queries/s')
+def sqlite_query(cohort, workdir, args):
+    from wellwatch.history import TIMELINE_SQL
+    from wellwatch.storage import get_database, screening_list_sql
+
+    db = get_database(ensure_database(cohort, os.path.join(workdir, 'screenings.db'), args.chunk_size))
+    today = pd.Timestamp('today').normalize()
+    pages = [
+        screening_list_sql(limit=50),
+        screening_list_sql(limit=50, start_date=today - pd.Timedelta(days=30), end_date=today),
+        screening_list_sql(limit=50, risk_levels=['High'], locations=['Rural']),
+        screening_list_sql(limit=50, chw_ids=['CHW001'], start_date=today - pd.Timedelta(days=30),
+                           end_date=today),
+    ]
+    rng = np.random.default_rng(RANDOM_SEED)
+    patients = cohort['patient_id'].to_numpy()[rng.integers(0, len(cohort), args.max_calls)]
+    queries = [pages[i % len(pages)] if i % 2 else (TIMELINE_SQL, [patient])
+               for i, patient in enumerate(patients)]
+    return Workload(lambda query: db.query(*query), queries)
+
+@case('dashboard', 'refreshes/s')
+def dashboard(cohort, workdir, args):
+    from wellwatch.ui.data import dashboard_metrics
+
+    db_path = ensure_database(cohort, os.path.join(workdir, 'screenings.db'), args.chunk_size)
+    today = pd.Timestamp('today').normalize()
+    return Workload(lambda _: dashboard_metrics(today, db_path), list(range(max(args.max_calls // 20, 1))))
+
+# ================================================================================
+# MEASUREMENT
+# ================================================================================
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far"""
+    # ru_maxrss survives exec on Linux, so a case would inherit the parent's
+    # peak; VmHWM belongs to this process image only
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 2 ** 10  # kB
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10  # bytes on macOS, KiB elsewhere
+
+def measure(workload):
+    """Latency of every timed call (seconds) and the rows they covered"""
+    if workload.warmup:
+        workload.call(workload.items[0])  # lazy imports, allocator growth, first-use caches
+    latencies, rows = [], 0
+    for _ in range(workload.repeat):
+        for item, item_rows in zip(workload.items, workload.rows):
+            start = time.perf_counter()
+            workload.call(item)
+            latencies.append(time.perf_counter() - start)
+            rows += item_rows
+    if workload.teardown is not None:
+        workload.teardown()
+    return np.array(latencies), rows
+
+def run_case(name, cohort_path, workdir, args):
+    """Time one case on one cohort in this process, returns its result dict"""
+    cohort = pd.read_pickle(cohort_path)
+    workload = CASES[name](cohort, workdir, args)
+    del cohort
+    gc.collect()
+    setup_rss = peak_rss_mb()
+
+    latencies, rows = measure(workload)
+    total = float(latencies.sum())
+    return {
+        'case': name,
+        'unit': CASES[name].unit,
+        'calls': len(latencies),
+        'rows': rows,
+        'total_s': total,
+        'throughput': rows / total if total else None,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p99_ms': float(np.percentile(latencies, 99) * 1000),
+        'mean_ms': float(latencies.mean() * 1000),
+        'setup_rss_mb': setup_rss,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+def case_command(name, cohort_path, workdir, args):
+    """Interpreter command line that runs one case and prints its result as JSON"""
+    return [sys.executable, '-W', 'ignore', '-m', 'benchmarks.hot_paths', '--run-case', name,
+            '--cohort', cohort_path, '--workdir', workdir, '--chunk-size', str(args.chunk_size),
+            '--max-calls', str(args.max_calls), '--repeat', str(args.repeat)]
+
+def environment():
+    """Where the numbers were measured; comparisons across machines are only indicative"""
+    import fpdf
+    import xgboost
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'xgboost': xgboost.__version__,
+        'fpdf': fpdf.__version__,
+    }
+
+# ================================================================================
+# BASELINE
+# ================================================================================
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare a run against a baseline run, case by case and size by size
+
+    Returns:
+    --------
+    list of (case, size, metric, baseline value, current value) for every
+    throughput drop, p99 increase or peak RSS increase beyond tolerance
+    """
+    previous = {(r['case'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        before = previous.get((result['case'], result['size']))
+        if before is None:
+            continue
+        checks = (
+            ('throughput', before['throughput'] is not None and result['throughput'] is not None and
+             result['throughput'] < before['throughput'] * (1 - tolerance)),
+            ('p99_ms', result['p99_ms'] > before['p99_ms'] * (1 + tolerance)),
+            ('peak_rss_mb', result['peak_rss_mb'] > before['peak_rss_mb'] * (1 + tolerance)),
+        )
+        regressions += [(result['case'], result['size'], metric, before[metric], result[metric])
+                        for metric, regressed in checks if regressed]
+    return regressions
+
+def print_results(results, baseline=None):
+    previous = {(r['case'], r['size']): r for r in baseline['results']} if baseline else {}
+    print(f"\n{'case':<16}{'rows':>10}{'throughput':>14}{'':<12}{'p50 ms':>10}{'p99 ms':>10}"
+          f"{'peak MB':>9}{'vs baseline':>13}")
+    for result in results['results']:
+        before = previous.get((result['case'], result['size']))
+        change = ''
+        if before and before['throughput'] and result['throughput']:
+            change = f"{result['throughput'] / before['throughput'] - 1:+.0%}"
+        print(f"{result['case']:<16}{result['size']:>10,}{result['throughput'] or 0:>14,.0f} "
+              f"{result['unit']:<11}{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}"
+              f"{result['peak_rss_mb']:>9.0f}{change:>13}")
+
+# ================================================================================
+# CLI
+# ================================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scoring, preprocessing and reporting hot paths')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='Cohort row counts')
+    parser.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES), help='Cases to run')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per batch call')
+    parser.add_argument('--max-calls', type=int, default=DEFAULT_MAX_CALLS,
+                        help='Patients (or queries) timed by per-call cases')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Passes over the cohort by batch cases')
+    parser.add_argument('--notebook', default=NOTEBOOK_PATH, help='Notebook with generate_synthetic_data()')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    parser.add_argument('--baseline', nargs='?', const=BASELINE_PATH,
+                        help=f'Compare against this results file (default {BASELINE_PATH})')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Relative change counted as a regression')
+    parser.add_argument('--update-baseline', action='store_true', help=f'Write results to {BASELINE_PATH}')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    parser.add_argument('--cohort', help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(args.run_case, args.cohort, args.workdir, args)))
+        return
+
+    results = {
+        'environment': environment(),
+        'config': {'chunk_size': args.chunk_size, 'max_calls': args.max_calls, 'repeat': args.repeat},
+        'results': [],
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            workdir = os.path.join(tmp, str(size))
+            os.makedirs(workdir)
+            cohort_path = os.path.join(workdir, 'cohort.pkl')
+            start = time.perf_counter()
+            synthetic_cohort(size, args.notebook).to_pickle(cohort_path)
+            print(f'Cohort of {size:,} rows in {time.perf_counter() - start:.1f}s')
+
+            for name in args.cases:
+                completed = subprocess.run(case_command(name, cohort_path, workdir, args),
+                                           capture_output=True, text=True)
+                if completed.returncode != 0:
+                    print(f'❌ {name} ({size:,} rows) failed:\n{completed.stderr}', file=sys.stderr)
+                    sys.exit(1)
+                result = {**json.loads(completed.stdout.strip().splitlines()[-1]), 'size': size}
+                results['results'].append(result)
+                print(f"  {name:<16}{result['total_s']:>8.2f}s")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(BASELINE_PATH), exist_ok=True)
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f'✅ Baseline written to {BASELINE_PATH}')
+
+    if baseline is not None:
+        if baseline.get('environment') != results['environment']:
+            print('⚠️ Baseline was measured in a different environment; differences are indicative only')
+        regressions = compare(results, baseline, args.tolerance)
+        for name, size, metric, before, after in regressions:
+            print(f'❌ {name} ({size:,} rows): {metric} {before:,.3f} -> {after:,.3f}', file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f'✅ No regressions beyond {args.tolerance:.0%} against {args.baseline}')
+
+if __name__ == '__main__':
+    main()
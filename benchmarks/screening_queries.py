@@ -0,0 +1,132 @@
+"""
+Screening query benchmark
+
+Fills a scratch database with synthetic screenings, times the Admin Panel
+and patient-history queries on the notebook schema, then applies the
+storage MIGRATIONS (indexes) and times the same queries again.
+
+Usage:
+    python -m benchmarks.screening_queries --rows 1000000
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from wellwatch.history import TIMELINE_SQL
+from wellwatch.storage import SCHEMA, migrate, screening_list_sql, screening_stats_sql
+
+# Columns that exist after migration 1, before any index is built
+INSERT_SQL = '''
+INSERT INTO screenings (patient_id, screening_date, risk_level, risk_score, systolic_bp,
+                        diastolic_bp, fasting_glucose, bmi, chw_id, location)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def populate(conn, n_rows, seed=42):
+    """Insert n_rows synthetic screenings spread over the last two years"""
+    rng = np.random.default_rng(seed)
+    now = datetime.now().replace(microsecond=0)
+    n_patients = max(n_rows // 4, 1)
+
+    patient_ids = np.char.add('PAT', rng.integers(0, n_patients, n_rows).astype(str))
+    seconds_ago = rng.integers(0, 2 * 365 * 24 * 3600, n_rows)
+    risk_levels = rng.choice(['Low', 'Medium', 'High'], n_rows, p=[0.55, 0.30, 0.15])
+    locations = rng.choice(['Rural', 'Semi-Urban', 'Urban'], n_rows, p=[0.60, 0.25, 0.15])
+    chw_ids = np.char.add('CHW', np.char.zfill(rng.integers(1, 201, n_rows).astype(str), 3))
+    risk_scores = rng.integers(0, 101, n_rows)
+    systolic = rng.normal(125, 18, n_rows).round()
+    diastolic = rng.normal(80, 12, n_rows).round()
+    glucose = rng.normal(105, 25, n_rows).round()
+    bmi = rng.normal(25, 5, n_rows).round(1)
+
+    rows = (
+        (str(patient_ids[i]), (now - timedelta(seconds=int(seconds_ago[i]))).strftime('%Y-%m-%d %H:%M:%S'),
+         str(risk_levels[i]), int(risk_scores[i]), float(systolic[i]), float(diastolic[i]),
+         float(glucose[i]), float(bmi[i]), str(chw_ids[i]), str(locations[i]))
+        for i in range(n_rows)
+    )
+    conn.execute('BEGIN')
+    conn.executemany(INSERT_SQL, rows)
+    conn.execute('COMMIT')
+    return str(patient_ids[0]), str(chw_ids[0])
+
+def benchmark_queries(patient_id, chw_id):
+    """Named (SQL, params) pairs matching the Admin Panel filters"""
+    today = datetime.now().date()
+    # A page about a year back: keyset cursor vs. skipping rows with OFFSET
+    deep_cursor = ((datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d %H:%M:%S'), 2 ** 62)
+    offset_sql, offset_params = screening_list_sql(limit=50)
+    return {
+        'admin_page_last_30d': screening_list_sql(
+            limit=50, risk_levels=['Low', 'Medium', 'High'],
+            locations=['Rural', 'Semi-Urban', 'Urban'],
+            start_date=today - timedelta(days=30), end_date=today),
+        'admin_page_high_rural_90d': screening_list_sql(
+            limit=50, risk_levels=['High'], locations=['Rural'],
+            start_date=today - timedelta(days=90), end_date=today),
+        'admin_page_one_chw_30d': screening_list_sql(
+            limit=50, chw_ids=[chw_id], start_date=today - timedelta(days=30), end_date=today),
+        'admin_page_keyset_1y_back': screening_list_sql(limit=50, after=deep_cursor),
+        'admin_page_offset_1y_back': (offset_sql + ' OFFSET ?', offset_params + [250_000]),
+        'stats_last_30d': screening_stats_sql(
+            start_date=today - timedelta(days=30), end_date=today),
+        'stats_high_risk_365d': screening_stats_sql(
+            risk_levels=['High'], start_date=today - timedelta(days=365), end_date=today),
+        'patient_timeline': (TIMELINE_SQL, [patient_id]),
+    }
+
+def time_queries(conn, queries, repeat=5):
+    """Median wall time in milliseconds of each query"""
+    timings = {}
+    for name, (sql, params) in queries.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = float(np.median(samples))
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark screening queries before/after indexing')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic screenings to insert')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per query (median reported)')
+    parser.add_argument('--json', help='Also write results to this JSON file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'bench.db'), isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.executescript(SCHEMA)
+        migrate(conn, target=1)  # location column, no indexes yet
+
+        start = time.perf_counter()
+        patient_id, chw_id = populate(conn, args.rows)
+        print(f'Inserted {args.rows:,} screenings in {time.perf_counter() - start:.1f}s')
+
+        queries = benchmark_queries(patient_id, chw_id)
+        before = time_queries(conn, queries, args.repeat)
+
+        start = time.perf_counter()
+        migrate(conn)
+        print(f'Built indexes in {time.perf_counter() - start:.1f}s')
+        after = time_queries(conn, queries, args.repeat)
+        conn.close()
+
+    print(f"\n{'query':<28}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name in queries:
+        print(f'{name:<28}{before[name]:>14.2f}{after[name]:>14.2f}{before[name] / after[name]:>9.0f}x')
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'rows': args.rows, 'before_ms': before, 'after_ms': after}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
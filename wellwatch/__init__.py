@@ -0,0 +1,6 @@
+"""
+WellWatch India - core screening library
+
+Shared scoring, inference and storage code used by the Streamlit app
+(streamlit_app.py) and the command-line tools.
+"""
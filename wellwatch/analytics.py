@@ -0,0 +1,170 @@
+"""
+Vectorized population and fairness analytics
+
+Prevalence per community and model performance per demographic subgroup
+are computed from integer category codes with a single np.bincount, instead
+of a groupby().apply() that calls back into Python once per group. The
+same functions serve the Community Dashboard, the Explainability page and
+offline analysis of exported screenings.
+"""
+
+import numpy as np
+import pandas as pd
+
+from wellwatch.scoring import RISK_LEVELS
+
+# Dashboard age bands (same edges as the rollup age_group column)
+AGE_BANDS = ('18-30', '31-45', '46-60', '60+')
+AGE_BAND_EDGES = (30, 45, 60)
+
+# ================================================================================
+# HELPERS
+# ================================================================================
+
+def age_band(age):
+    """Dashboard age band label for each age"""
+    age = np.asarray(age, dtype=np.float64)
+    bands = np.array(AGE_BANDS, dtype=object)[np.searchsorted(AGE_BAND_EDGES, age, side='left')]
+    bands[np.isnan(age)] = 'Unknown'
+    return bands
+
+def _column(values):
+    """Series or 1-d array view of a column, without copying Series"""
+    return values if isinstance(values, (pd.Series, pd.Index, pd.Categorical)) else np.asarray(values)
+
+def _codes(values, categories=None):
+    """Integer codes and category labels for a column (-1 for missing/unlisted)"""
+    if categories is None:
+        codes, uniques = pd.factorize(_column(values), sort=True)
+        return codes, list(uniques)
+    categories = list(categories)
+    codes = pd.Categorical(_column(values), categories=categories).codes
+    return codes.astype(np.int64), categories
+
+def _counts(codes, weights, minlength):
+    """Weighted bincount that skips code -1"""
+    valid = codes >= 0
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[valid]
+    return np.bincount(codes[valid], weights=weights, minlength=minlength)
+
+# ================================================================================
+# PREVALENCE
+# ================================================================================
+
+def crosstab(index, columns, weights=None, normalize=False, index_order=None, column_order=None):
+    """
+    Counts per (index, columns) pair, like pandas.crosstab
+
+    Parameters:
+    -----------
+    index, columns : array-like of category values, same length
+    weights : optional array-like of row weights (e.g. rollup screening
+        counts); rows count once each when omitted
+    normalize : if True, each row is returned as percentages of its total
+    index_order, column_order : optional category lists fixing the order
+        (and selection) of the output rows and columns
+
+    Returns:
+    --------
+    pandas.DataFrame indexed by index categories with one column per
+    columns category
+    """
+    row_codes, row_labels = _codes(index, index_order)
+    col_codes, col_labels = _codes(columns, column_order)
+    n_cols = len(col_labels)
+
+    combined = np.where((row_codes >= 0) & (col_codes >= 0), row_codes * n_cols + col_codes, -1)
+    table = _counts(combined, weights, len(row_labels) * n_cols).reshape(len(row_labels), n_cols)
+
+    if normalize:
+        totals = table.sum(axis=1, keepdims=True)
+        table = np.divide(table * 100, totals, out=np.zeros(table.shape), where=totals > 0)
+    elif weights is None:
+        table = table.astype(np.int64)
+
+    return pd.DataFrame(table, index=pd.Index(row_labels, name=getattr(index, 'name', None)),
+                        columns=pd.Index(col_labels, name=getattr(columns, 'name', None)))
+
+def prevalence(groups, flags, weights=None, group_order=None):
+    """
+    Percentage of rows with flag set in each group
+
+    Equivalent to groupby(groups).apply(lambda x: x[flag].sum() / len(x) * 100)
+    in one pass, e.g. prevalence(df['Location'], df['Risk_Level'] == 'High').
+    """
+    codes, labels = _codes(groups, group_order)
+    flags = np.asarray(flags, dtype=np.float64)
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        flags = flags * weights
+    totals = _counts(codes, weights, len(labels))
+    positives = _counts(codes, flags, len(labels))
+    values = np.divide(positives * 100, totals, out=np.zeros(len(labels)), where=totals > 0)
+    return pd.Series(values, index=pd.Index(labels, name=getattr(groups, 'name', None)))
+
+# ================================================================================
+# SUBGROUP PERFORMANCE
+# ================================================================================
+
+def confusion_by_group(groups, y_true, y_pred, labels=RISK_LEVELS, group_order=None):
+    """
+    Confusion matrices for every group at once
+
+    Returns (matrices, group_labels) where matrices has shape
+    (n_groups, n_labels, n_labels), indexed [group, true, predicted].
+    """
+    group_codes, group_labels = _codes(groups, group_order)
+    true_codes, labels = _codes(y_true, labels)
+    pred_codes, _ = _codes(y_pred, labels)
+    k = len(labels)
+
+    valid = (group_codes >= 0) & (true_codes >= 0) & (pred_codes >= 0)
+    combined = np.where(valid, (group_codes * k + true_codes) * k + pred_codes, -1)
+    matrices = _counts(combined, None, len(group_labels) * k * k).reshape(len(group_labels), k, k)
+    return matrices.astype(np.int64), group_labels
+
+def subgroup_metrics(groups, y_true, y_pred, labels=RISK_LEVELS, average='weighted', group_order=None):
+    """
+    Accuracy, precision and recall of predictions within each group
+
+    Parameters:
+    -----------
+    groups : array-like of subgroup values (gender, age band, location...)
+    y_true, y_pred : array-like of class labels
+    labels : class labels, in order
+    average : 'weighted' or 'macro' to average per-class scores like
+        sklearn's average= argument, or one class label (e.g. 'High') for
+        one-vs-rest precision/recall of that class
+    group_order : optional list fixing the order and selection of groups
+
+    Returns:
+    --------
+    pandas.DataFrame indexed by group with Count, Accuracy, Precision and
+    Recall columns; undefined scores (no predictions or no true cases of a
+    class) count as 0, matching sklearn's zero_division default
+    """
+    matrices, group_labels = confusion_by_group(groups, y_true, y_pred, labels, group_order)
+
+    true_positives = np.diagonal(matrices, axis1=1, axis2=2).astype(np.float64)
+    support = matrices.sum(axis=2).astype(np.float64)
+    predicted = matrices.sum(axis=1).astype(np.float64)
+    count = support.sum(axis=1)
+
+    precision = np.divide(true_positives, predicted, out=np.zeros_like(true_positives), where=predicted > 0)
+    recall = np.divide(true_positives, support, out=np.zeros_like(true_positives), where=support > 0)
+
+    if average == 'weighted':
+        class_weights = np.divide(support, count[:, None], out=np.zeros_like(support), where=count[:, None] > 0)
+    elif average == 'macro':
+        class_weights = np.full(support.shape, 1 / len(labels))
+    else:
+        class_weights = np.zeros(support.shape)
+        class_weights[:, list(labels).index(average)] = 1
+
+    return pd.DataFrame({
+        'Count': count.astype(np.int64),
+        'Accuracy': np.divide(true_positives.sum(axis=1), count, out=np.zeros(len(count)), where=count > 0),
+        'Precision': (precision * class_weights).sum(axis=1),
+        'Recall': (recall * class_weights).sum(axis=1),
+    }, index=pd.Index(group_labels, name=getattr(groups, 'name', None)))
@@ -0,0 +1,446 @@
+"""
+Standalone HTTP prediction API
+
+The notebook's api_predict() simulates the mobile-app endpoint in-process.
+This module serves the same request validation and response shape over
+HTTP, with the RiskEngine (and its result cache) loaded once and kept
+resident. The server is a small HTTP/1.1 keep-alive implementation on
+asyncio streams, so it needs nothing beyond the standard library and
+never goes through Streamlit.
+
+Concurrent /predict requests are coalesced by a MicroBatcher into one
+vectorized model call (up to --max-batch-size patients or --max-wait-ms),
+so throughput per core grows with load instead of collapsing under it.
+
+Endpoints (JSON in, JSON out):
+    POST /predict         one patient            -> api_predict() response
+    POST /predict/batch   list of patients, or {"patients": [...]}
+    POST /explain         one patient, optional "risk_level" and "top"
+    GET  /timeline        ?patient_id=...: screening history with changes between visits
+    GET  /worklist        ?chw_id=...[&day=YYYY-MM-DD]: due and overdue follow-ups
+    GET  /health          model version, uptime and batching metrics
+    GET  /metrics         Prometheus text: stage timing histograms, cache and batching counters
+    GET  /profiles        recent per-request cProfile captures (with --profile)
+
+Every request is timed into the 'api.<endpoint>' histogram next to the
+engine's stage spans (see wellwatch.telemetry). --profile additionally
+runs each request under cProfile, which slows it down several times.
+
+Usage:
+    python -m wellwatch.api --host 0.0.0.0 --port 8000 --max-batch-size 64 --max-wait-ms 2
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from urllib.parse import parse_qsl
+
+import numpy as np
+
+from wellwatch.batching import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, MicroBatcher
+from wellwatch.features import BINARY_FEATURES, CATEGORICAL_FEATURES, SCALED_FEATURES
+from wellwatch.followup import chw_worklist
+from wellwatch.history import PatientHistory
+from wellwatch.inference import MODEL_DIR, RiskEngine
+from wellwatch.scoring import FOLLOW_UP_DAYS
+from wellwatch.storage import DB_PATH
+from wellwatch.telemetry import PROFILES, PROMETHEUS_CONTENT_TYPE, prometheus_text, span
+
+API_VERSION = '1.0'
+
+# Same validation as the notebook's api_predict()
+REQUIRED_FIELDS = ('age', 'gender', 'systolic_bp', 'fasting_glucose')
+
+# Optional model inputs a client may leave out: numbers become NaN (vitals
+# are imputed with the training means, the rest are missing to XGBoost)
+# and categories None
+INPUT_DEFAULTS = {
+    **{name: np.nan for name in SCALED_FEATURES if name != 'bmi'},
+    'height_cm': np.nan,
+    'weight_kg': np.nan,
+    **{name: np.nan for name in BINARY_FEATURES},
+    **{source: None for source, _, _ in CATEGORICAL_FEATURES},
+}
+
+MAX_BODY_BYTES = 8 * 1024 * 1024
+MAX_BATCH_PATIENTS = 10_000
+IDLE_TIMEOUT = 60  # seconds a keep-alive connection may sit unused
+
+class ApiError(Exception):
+    """Request problem reported to the client as {'status': 'error'}"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+# ================================================================================
+# SERVICE
+# ================================================================================
+
+def missing_fields(patient_data):
+    """REQUIRED_FIELDS absent from a patient dict"""
+    return [field for field in REQUIRED_FIELDS if field not in patient_data]
+
+def model_inputs(patient_data):
+    """Model input dict for a request, with INPUT_DEFAULTS for omitted optional fields"""
+    return {name: patient_data.get(name, default) for name, default in INPUT_DEFAULTS.items()}
+
+def assessment(patient_data, result, assessment_date):
+    """The 'data' part of an api_predict() response"""
+    risk_level = result['risk_level']
+    return {
+        'patient_id': patient_data.get('patient_id', 'UNKNOWN'),
+        'assessment_date': assessment_date,
+        'risk_level': risk_level,
+        'risk_score': result['risk_score'],
+        'probabilities': result['risk_probabilities'],
+        'recommendations': result['recommendations'],
+        'alert_chw': risk_level in ['Medium', 'High'],
+        'alert_patient': risk_level == 'High',
+        'follow_up_days': FOLLOW_UP_DAYS[risk_level]
+    }
+
+class PredictionService:
+    """Request handling independent of the HTTP layer"""
+
+    def __init__(self, engine, explainer=None, history=None, db_path=DB_PATH):
+        self.engine = engine
+        self._explainer = explainer
+        self.db_path = db_path
+        self.history = history if history is not None else PatientHistory(db_path)
+        self.started = time.time()
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR, db_path=DB_PATH):
+        return cls(RiskEngine.load(model_dir), db_path=db_path)
+
+    @property
+    def explainer(self):
+        # SHAP setup reads the booster once; only pay for it if /explain is used
+        if self._explainer is None:
+            from wellwatch.explain import RiskExplainer
+            self._explainer = RiskExplainer(self.engine)
+        return self._explainer
+
+    def _response(self, message, data, start):
+        return {
+            'status': 'success',
+            'message': message,
+            'data': data,
+            'metadata': {
+                'model_version': self.engine.model_version,
+                'api_version': API_VERSION,
+                'processing_time_ms': round((time.perf_counter() - start) * 1000, 3)
+            }
+        }
+
+    @staticmethod
+    def _patient(payload):
+        if not isinstance(payload, dict):
+            raise ApiError('Expected a JSON object with patient data')
+        missing = missing_fields(payload)
+        if missing:
+            raise ApiError(f'Missing required fields: {missing}')
+        return payload
+
+    def predict(self, payload):
+        """api_predict() for one patient"""
+        start = time.perf_counter()
+        patient_data = self._patient(payload)
+        result = self.engine.predict(model_inputs(patient_data))
+        data = assessment(patient_data, result, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        return self._response('Risk assessment completed', data, start)
+
+    async def predict_batched(self, payload, batcher):
+        """predict(), scored together with concurrent requests by a MicroBatcher over score()"""
+        start = time.perf_counter()
+        patient_data = self._patient(payload)
+        result = await batcher.submit(model_inputs(patient_data))
+        data = assessment(patient_data, result, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        return self._response('Risk assessment completed', data, start)
+
+    def score(self, inputs):
+        """predict_results() for a list of model_inputs() dicts"""
+        columns = {name: [patient_inputs[name] for patient_inputs in inputs] for name in INPUT_DEFAULTS}
+        return self.engine.predict_results(columns)
+
+    def predict_batch(self, payload):
+        """api_predict() for many patients, scored in one vectorized call"""
+        start = time.perf_counter()
+        patients = payload.get('patients') if isinstance(payload, dict) else payload
+        if not isinstance(patients, list) or not patients:
+            raise ApiError('Expected a non-empty list of patients')
+        if len(patients) > MAX_BATCH_PATIENTS:
+            raise ApiError(f'Batch too large: {len(patients)} patients (max {MAX_BATCH_PATIENTS})', 413)
+
+        errors = {}
+        for i, patient_data in enumerate(patients):
+            if not isinstance(patient_data, dict):
+                errors[i] = 'not an object'
+            elif missing_fields(patient_data):
+                errors[i] = missing_fields(patient_data)
+        if errors:
+            raise ApiError(f'Missing required fields: {errors}')
+
+        results = self.score([model_inputs(patient_data) for patient_data in patients])
+        assessment_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        data = [assessment(patient_data, result, assessment_date)
+                for patient_data, result in zip(patients, results)]
+        return self._response(f'Risk assessment completed for {len(data)} patients', data, start)
+
+    def explain(self, payload):
+        """SHAP contributions behind one patient's prediction"""
+        start = time.perf_counter()
+        patient_data = self._patient(payload)
+        inputs = model_inputs(patient_data)
+        result = self.engine.predict(inputs)
+
+        risk_level = patient_data.get('risk_level') or result['risk_level']
+        if risk_level not in FOLLOW_UP_DAYS:
+            raise ApiError(f'Unknown risk_level: {risk_level!r}')
+        explanation = self.explainer.explain(inputs, risk_level=risk_level, top=patient_data.get('top', 10))
+
+        data = {
+            'patient_id': patient_data.get('patient_id', 'UNKNOWN'),
+            'risk_level': result['risk_level'],
+            'risk_score': result['risk_score'],
+            'explained_level': risk_level,
+            'contributions': [
+                {'feature': feature, 'label': label, 'contribution': round(float(value), 6)}
+                for feature, label, value in explanation.itertuples(index=False)
+            ]
+        }
+        return self._response('Explanation completed', data, start)
+
+    def timeline(self, payload):
+        """Screening history of one patient, oldest first, with changes between visits"""
+        start = time.perf_counter()
+        patient_id = payload.get('patient_id') if isinstance(payload, dict) else None
+        if not patient_id:
+            raise ApiError('Expected a patient_id, e.g. /timeline?patient_id=PAT12345')
+        data = self.history.timeline(str(patient_id))
+        if not data['screening_count']:
+            raise ApiError(f'No screenings for patient {patient_id!r}', 404)
+        return self._response(f"Timeline of {data['screening_count']} screenings", data, start)
+
+    def worklist(self, payload):
+        """A CHW's follow-ups due by the end of the day, most overdue first"""
+        start = time.perf_counter()
+        chw_id = payload.get('chw_id') if isinstance(payload, dict) else None
+        if not chw_id:
+            raise ApiError('Expected a chw_id, e.g. /worklist?chw_id=CHW042')
+        frame = chw_worklist(str(chw_id), payload.get('day'), self.db_path)
+        frame = frame.astype(object).where(frame.notna(), None)
+        data = {'chw_id': chw_id, 'due': len(frame), 'follow_ups': frame.to_dict('records')}
+        return self._response(f'{len(frame)} follow-ups due', data, start)
+
+    def cache_stats(self):
+        """ResultCache.stats() of each cache in use, by name"""
+        caches = {'predictions': self.engine.cache, 'timelines': self.history.cache}
+        if self._explainer is not None:
+            caches['explanations'] = self._explainer.cache
+        return {name: cache.stats() for name, cache in caches.items() if cache is not None}
+
+    def health(self, payload=None):
+        return {
+            'status': 'success',
+            'message': 'ok',
+            'data': {'model_version': self.engine.model_version, 'api_version': API_VERSION,
+                     'uptime_seconds': round(time.time() - self.started, 1),
+                     'history_cache': self.history.stats()}
+        }
+
+    def metrics(self, payload=None):
+        """Metric families for GET /metrics (see telemetry.prometheus_text()): uptime and cache counters"""
+        stats = self.cache_stats()
+
+        def per_cache(key):
+            return [({'cache': name}, cache[key]) for name, cache in stats.items()]
+
+        return [
+            ('uptime_seconds', 'gauge', 'Seconds since the service started',
+             [({}, time.time() - self.started)]),
+            ('cache_entries', 'gauge', 'Entries held by each result cache', per_cache('size')),
+            ('cache_hits_total', 'counter', 'Result cache hits', per_cache('hits')),
+            ('cache_misses_total', 'counter', 'Result cache misses', per_cache('misses')),
+            ('cache_evictions_total', 'counter', 'Result cache LRU evictions', per_cache('evictions')),
+        ]
+
+# ================================================================================
+# HTTP SERVER
+# ================================================================================
+
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+def _error(message):
+    return {'status': 'error', 'message': message, 'data': None}
+
+class ApiServer:
+    """
+    HTTP/1.1 keep-alive server for a PredictionService on asyncio streams
+
+    max_batch_size=1 turns micro-batching off: each /predict is scored on
+    its own. profile=True keeps a cProfile capture of every request in
+    telemetry.PROFILES.
+    """
+
+    def __init__(self, service, host='127.0.0.1', port=8000,
+                 max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS, profile=False):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.profile = profile
+        self.batcher = MicroBatcher(service.score, max_batch_size, max_wait_ms) if max_batch_size > 1 else None
+        self.routes = {
+            '/predict': ('POST', self._predict),
+            '/predict/batch': ('POST', service.predict_batch),
+            '/explain': ('POST', service.explain),
+            '/timeline': ('GET', service.timeline),
+            '/worklist': ('GET', service.worklist),
+            '/health': ('GET', self._health),
+            '/metrics': ('GET', self._metrics),
+            '/profiles': ('GET', self._profiles),
+        }
+        self._server = None
+
+    async def _predict(self, payload):
+        if self.batcher is None:
+            return self.service.predict(payload)
+        return await self.service.predict_batched(payload, self.batcher)
+
+    def _health(self, payload):
+        response = self.service.health(payload)
+        if self.batcher is not None:
+            response['data']['batching'] = self.batcher.stats()
+        return response
+
+    def _metrics(self, payload):
+        metrics = self.service.metrics(payload)
+        if self.batcher is not None:
+            batching = self.batcher.stats()
+            metrics += [
+                ('batcher_batches_total', 'counter', 'Model calls made by the micro-batcher',
+                 [({}, batching['batches'])]),
+                ('batcher_items_total', 'counter', 'Requests scored through the micro-batcher',
+                 [({}, batching['items'])]),
+                ('batcher_failed_batches_total', 'counter', 'Batches retried one request at a time after an error',
+                 [({}, batching['failed_batches'])]),
+                ('batcher_queued', 'gauge', 'Requests waiting for a batch', [({}, batching['queued'])]),
+                ('batcher_queue_delay_seconds', 'histogram', 'Time requests waited for their batch',
+                 [({}, self.batcher.queue_delay)]),
+            ]
+        return prometheus_text(metrics=metrics)
+
+    def _profiles(self, payload):
+        if not self.profile:
+            raise ApiError('Profiling is off; start the server with --profile', 404)
+        return {'status': 'success', 'message': 'ok', 'data': PROFILES.recent()}
+
+    async def dispatch(self, method, path, body):
+        """
+        (HTTP status, response) for one request; GET query parameters are the
+        payload. The response is a dict sent as JSON, or Prometheus text.
+        """
+        path, _, query = path.partition('?')
+        path = path.rstrip('/') or '/'
+        route = self.routes.get(path)
+        if route is None:
+            return 404, _error(f'Unknown endpoint: {path}')
+        if method != route[0]:
+            return 405, _error(f'{path} expects {route[0]}')
+        try:
+            with span('api' + path.replace('/', '.')), PROFILES.maybe(f'{method} {path}', self.profile):
+                payload = json.loads(body) if body else None
+                if payload is None and query:
+                    payload = dict(parse_qsl(query))
+                response = route[1](payload)
+                if asyncio.iscoroutine(response):
+                    response = await response
+            return 200, response
+        except json.JSONDecodeError as e:
+            return 400, _error(f'Invalid JSON: {e}')
+        except ApiError as e:
+            return e.status, _error(str(e))
+        except (TypeError, ValueError) as e:
+            return 400, _error(str(e))
+        except Exception as e:
+            return 500, _error(str(e))
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+
+                headers = {}
+                while (line := await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get('content-length', 0))
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, _error(f'Request body over {MAX_BODY_BYTES} bytes')
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, response = await self.dispatch(method, path, body)
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+
+                if isinstance(response, str):
+                    content, content_type = response.encode(), PROMETHEUS_CONTENT_TYPE
+                else:
+                    content, content_type = json.dumps(response).encode(), 'application/json'
+                writer.write(f'HTTP/1.1 {status} {REASONS[status]}\r\n'
+                             f'Content-Type: {content_type}\r\n'
+                             f'Content-Length: {len(content)}\r\n'
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                             + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass  # idle, truncated or malformed connection: just drop it
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self._server
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the risk model over HTTP')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=8000, help='Port to listen on')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory with the model artifacts')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database for /timeline and /worklist')
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                        help='Most /predict requests scored together (1 disables micro-batching)')
+    parser.add_argument('--max-wait-ms', type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help='Longest a /predict request waits for others to batch with')
+    parser.add_argument('--profile', action='store_true',
+                        help='cProfile every request (slow; captures served by GET /profiles)')
+    args = parser.parse_args(argv)
+
+    server = ApiServer(PredictionService.load(args.model_dir, args.db), args.host, args.port,
+                       args.max_batch_size, args.max_wait_ms, args.profile or PROFILES.enabled)
+    print(f'WellWatch API {API_VERSION} on http://{args.host}:{args.port} '
+          f'(model {server.service.engine.model_version})')
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Micro-batching request coalescer
+
+A single-row predict_proba() call pays almost the whole fixed per-call
+cost of XGBoost (input checks, DMatrix setup, thread dispatch), so scoring
+concurrent requests one by one wastes most of each call. MicroBatcher
+collects single-item submissions on an asyncio event loop until
+max_batch_size items are waiting or the oldest has waited max_wait_ms,
+runs them through one batch function call and resolves each caller's
+future with its own result.
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+from wellwatch.telemetry import Histogram
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+
+def _resolve(future, result=None, exception=None):
+    """Set a future's outcome unless its caller has cancelled it meanwhile"""
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+class MicroBatcher:
+    """
+    Coalesce concurrent submit() calls into batches
+
+    Parameters:
+    -----------
+    fn : callable taking a list of items and returning a list of results in
+        the same order; it runs on the event loop thread. A batch with the
+        wrong number of results fails all of its callers with ValueError
+    max_batch_size : most items per fn() call
+    max_wait_ms : longest the first item of a batch waits for company
+    """
+
+    def __init__(self, fn, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._pending = deque()  # (item, future, enqueued_at)
+        self._ready = None
+        self._full = None
+        self._task = None
+
+        self.batches = 0
+        self.items = 0
+        self.failures = 0
+        self._size_counts = np.zeros(max_batch_size + 1, dtype=np.int64)
+        self.queue_delay = Histogram()  # seconds from submit() to the batch call
+
+    def _start(self):
+        self._ready = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, item):
+        """Result of fn([item, ...]) for this item, once its batch has run"""
+        if self._task is None:
+            self._start()
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future, time.perf_counter()))
+        self._ready.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return await future
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            deadline = self._pending[0][2] + self.max_wait
+            while len(self._pending) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._full.clear()
+                try:
+                    await asyncio.wait_for(self._full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [self._pending.popleft() for _ in range(min(len(self._pending), self.max_batch_size))]
+            if not self._pending:
+                self._ready.clear()
+            self._full.clear()
+            try:
+                self._execute(batch)
+            except Exception as e:
+                # Keep serving later batches; this one's callers get the error
+                self.failures += 1
+                for _, future, _ in batch:
+                    _resolve(future, exception=e)
+
+    def _execute(self, batch):
+        started = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        self._size_counts[len(batch)] += 1
+        for _, _, enqueued in batch:
+            self.queue_delay.observe(started - enqueued)
+
+        batch = [entry for entry in batch if not entry[1].done()]  # callers that went away
+        if not batch:
+            return
+
+        try:
+            results = self.fn([item for item, _, _ in batch])
+        except Exception:
+            # One bad item must not fail its neighbours: retry them one at a time
+            self.failures += 1
+            results = None
+        else:
+            if len(results) != len(batch):
+                self.failures += 1
+                error = ValueError(f'batch function returned {len(results)} results for {len(batch)} items')
+                for _, future, _ in batch:
+                    _resolve(future, exception=error)
+                return
+
+        for i, (item, future, _) in enumerate(batch):
+            if results is not None:
+                _resolve(future, results[i])
+                continue
+            try:
+                result = self.fn([item])
+                if len(result) != 1:
+                    raise ValueError(f'batch function returned {len(result)} results for 1 item')
+                _resolve(future, result[0])
+            except Exception as e:
+                _resolve(future, exception=e)
+
+    def stats(self):
+        """Batch-size and queue-delay metrics since start (delay percentiles estimated from the histogram)"""
+        delay = self.queue_delay.summary()
+        sizes = np.nonzero(self._size_counts)[0]
+        return {
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000,
+            'batches': self.batches,
+            'items': self.items,
+            'failed_batches': self.failures,
+            'queued': len(self._pending),
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0,
+            'batch_sizes': {int(size): int(self._size_counts[size]) for size in sizes},
+            'queue_delay_ms': {
+                'p50': delay['p50_ms'] or 0.0,
+                'p99': delay['p99_ms'] or 0.0,
+                'max': delay['max_ms'],
+            },
+        }
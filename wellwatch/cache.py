@@ -0,0 +1,103 @@
+"""
+Bounded result cache for model outputs
+
+Repeat screenings and demo cases produce the same 28-feature vector over
+and over. ResultCache is a thread-safe LRU with a time-to-live that sits in
+front of model prediction and SHAP explanation; entries are keyed by a
+hash of the float32 feature row plus the model version, so a new model
+never sees an old model's results.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL = 3600  # seconds
+
+def feature_key(row, model_version):
+    """Stable key for one feature row (any shape, hashed as float32) and model version"""
+    row = np.ascontiguousarray(row, dtype=np.float32)
+    digest = hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest()
+    return f'{model_version}:{digest}'
+
+class ResultCache:
+    """LRU + TTL cache with hit/miss counters"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Cached value for key, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Counters plus current size and hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+def cached_rows(cache, X, model_version, compute):
+    """
+    Per-row cached version of compute(X)
+
+    Rows found in cache are reused; the misses are computed together in one
+    compute() call and stored. Returns an array stacked in X's row order.
+    """
+    keys = [feature_key(row, model_version) for row in X]
+    results = [cache.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        computed = compute(X[missing])
+        for i, result in zip(missing, computed):
+            result = np.array(result)
+            result.setflags(write=False)
+            cache.put(keys[i], result)
+            results[i] = result
+    return np.stack(results)
@@ -0,0 +1,332 @@
+"""
+Portable compiled risk model
+
+Loading the pickled artifacts in models/ needs joblib, scikit-learn and
+XGBoost at the exact versions that wrote them, and unpickling the
+XGBClassifier dominates cold start on low-end tablets. export_model()
+flattens the 600 trees of the booster (200 rounds x 3 classes) into flat
+NumPy arrays and stores them, with the scaler parameters, class order,
+feature list and model metadata, in a single .npz file that loads with
+NumPy alone (no pickle). The booster is also saved in XGBoost's native
+UBJ format, which needs XGBoost but no scikit-learn. The .npz also records
+SHA-256 hashes of the artifacts it was exported from, so RiskEngine.load()
+can tell when the model was retrained without a re-export.
+
+CompiledModel evaluates all trees at once: every row walks every tree one
+level per step, so a prediction is max_depth rounds of vectorized gathers
+rather than a Python loop over trees. That beats XGBoost's per-call
+overhead several times over for the few rows of an interactive request;
+for bulk scoring XGBoost's C++ walk is faster, so batches of NATIVE_MIN_ROWS
+or more go to the native booster whenever XGBoost is installed.
+
+Usage:
+    python -m wellwatch.compiled export    # write models/chronic_risk_model.npz (+ .ubj)
+    python -m wellwatch.compiled verify    # compare against the pickled model
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+COMPILED_FILE = 'chronic_risk_model.npz'
+BOOSTER_FILE = 'chronic_risk_model.ubj'
+FORMAT_VERSION = 1
+CHUNK_ROWS = 4096  # rows evaluated together; bounds the (rows, trees) temporaries
+NATIVE_MIN_ROWS = 32  # from here on XGBoost (if installed) is faster than NumPy
+
+# Artifacts export_model() reads, hashed into the compiled model
+SOURCE_FILES = ('chronic_risk_model.pkl', 'scaler.pkl', 'label_encoder.pkl', 'feature_list.json',
+                'model_metadata.json')
+
+# ================================================================================
+# RUNTIME
+# ================================================================================
+
+class ScalerParams:
+    """The StandardScaler attributes FeatureTransformer.from_scaler() reads"""
+
+    def __init__(self, mean, scale):
+        self.mean_ = np.asarray(mean, dtype=np.float64)
+        self.scale_ = np.asarray(scale, dtype=np.float64)
+
+class LabelClasses:
+    """The LabelEncoder attribute RiskEngine reads"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+
+class CompiledModel:
+    """
+    Tree ensemble evaluated with NumPy
+
+    Every tree is stored as a complete binary tree of depth max_depth
+    (shallower leaves become pass-through nodes that always go left), so a
+    row's position after each level is 2 * node + 1 + went_right and the
+    whole walk is max_depth rounds of three gathers and a comparison.
+    predict_proba() follows the classes order of the exported label
+    encoder, like XGBClassifier.predict_proba().
+    """
+
+    def __init__(self, feature, threshold, default_left, leaf_value, tree_class, base_margin,
+                 feature_importances, booster_path=None):
+        n_trees, n_internal = feature.shape
+        self.n_trees = n_trees
+        self.max_depth = int(np.log2(n_internal + 1))
+        # Flat node tables indexed by tree * n_internal + node
+        self.feature = feature.ravel()
+        self.threshold = threshold.ravel()
+        self.missing_right = ~default_left.ravel()
+        self.leaf_value = leaf_value.ravel()
+        self._tree_offsets = np.arange(n_trees, dtype=np.int32) * n_internal
+        self._leaf_offsets = np.arange(n_trees, dtype=np.int32) * (n_internal + 1) - n_internal
+        self.tree_class = tree_class
+        self.base_margin = base_margin
+        self.n_classes = len(base_margin)
+        self.feature_importances_ = feature_importances
+        self.booster_path = booster_path
+        self._booster = None
+
+        # (n_trees, n_classes) indicator, so per-class sums are one matmul
+        self._class_matrix = np.zeros((n_trees, self.n_classes))
+        self._class_matrix[np.arange(n_trees), tree_class] = 1
+
+    def _margin(self, X):
+        n, n_features = X.shape
+        flat_x = X.ravel()
+        row_offsets = (np.arange(n, dtype=np.int32) * n_features)[:, None]
+        has_missing = np.isnan(flat_x).any()
+
+        node = np.zeros((n, self.n_trees), dtype=np.int32)
+        for _ in range(self.max_depth):
+            index = node + self._tree_offsets
+            x = flat_x[row_offsets + self.feature[index]]
+            right = x >= self.threshold[index]  # NaN compares False: goes left
+            if has_missing:
+                right |= np.isnan(x) & self.missing_right[index]
+            node = 2 * node + 1 + right
+        return self.leaf_value[node + self._leaf_offsets] @ self._class_matrix + self.base_margin
+
+    def get_booster(self):
+        """The native XGBoost booster (for bulk scoring and TreeSHAP); needs XGBoost"""
+        if self._booster is None:
+            if self.booster_path is None or not os.path.exists(self.booster_path):
+                raise FileNotFoundError(f'No native booster next to the compiled model: {self.booster_path}')
+            import xgboost as xgb
+            self._booster = xgb.Booster(model_file=self.booster_path)
+        return self._booster
+
+    def _native_booster(self):
+        try:
+            return self.get_booster()
+        except (ImportError, FileNotFoundError):
+            self.booster_path = None  # don't look again
+            return None
+
+    def predict_margin(self, X):
+        """Raw per-class margins (log-odds), shape (n, n_classes)"""
+        X = np.asarray(X, dtype=np.float32)
+        if len(X) >= NATIVE_MIN_ROWS and self.booster_path is not None:
+            booster = self._native_booster()
+            if booster is not None:
+                import xgboost as xgb
+                dmatrix = xgb.DMatrix(X, feature_names=booster.feature_names)
+                return booster.predict(dmatrix, output_margin=True).astype(np.float64)
+        if len(X) <= CHUNK_ROWS:
+            return self._margin(X)
+        return np.concatenate([self._margin(X[i:i + CHUNK_ROWS]) for i in range(0, len(X), CHUNK_ROWS)])
+
+    def predict_proba(self, X):
+        """Softmax of the margins, as XGBClassifier does for multi:softmax"""
+        margin = self.predict_margin(X)
+        exp = np.exp(margin - margin.max(axis=1, keepdims=True))
+        return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float32)
+
+def load_compiled(path):
+    """
+    Read a compiled model file
+
+    Returns (model, scaler, label_encoder, features, metadata) in the form
+    RiskEngine's constructor takes.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        meta = json.loads(str(data['meta']))
+        if meta['format_version'] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format {meta['format_version']} in {path}")
+        model = CompiledModel(data['feature'], data['threshold'], data['default_left'], data['leaf_value'],
+                              data['tree_class'], data['base_margin'], data['feature_importances'],
+                              os.path.join(os.path.dirname(path), BOOSTER_FILE))
+    scaler = ScalerParams(meta['scaler_mean'], meta['scaler_scale'])
+    return model, scaler, LabelClasses(meta['classes']), meta['features'], meta['metadata']
+
+def source_hashes(model_dir):
+    """SHA-256 of each SOURCE_FILES artifact present in model_dir"""
+    hashes = {}
+    for name in SOURCE_FILES:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                hashes[name] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+def stale_sources(path):
+    """
+    Artifacts next to a compiled model that differ from the ones it was
+    exported from
+
+    Files that are absent (a NumPy-only deployment ships just the .npz) do
+    not count; a file exported before hashes were recorded is stale
+    whenever any artifact is present.
+    """
+    with np.load(path, allow_pickle=False) as data:
+        exported = json.loads(str(data['meta'])).get('sources', {})
+    current = source_hashes(os.path.dirname(path))
+    return [name for name, digest in current.items() if exported.get(name) != digest]
+
+# ================================================================================
+# EXPORT
+# ================================================================================
+
+def _tree_depth(tree):
+    children = tree['left_children'], tree['right_children']
+    depth = [0] * len(children[0])
+    for node in range(len(depth)):  # XGBoost numbers parents before their children
+        for child in (children[0][node], children[1][node]):
+            if child != -1:
+                depth[child] = depth[node] + 1
+    return max(depth)
+
+def flatten_booster(booster):
+    """
+    Complete-tree arrays, per-tree class and base margin of a multi-class booster
+
+    Returns a dict of arrays for CompiledModel: feature, threshold and
+    default_left of shape (n_trees, 2**depth - 1), leaf_value of shape
+    (n_trees, 2**depth), tree_class and base_margin.
+    """
+    learner = json.loads(booster.save_raw('json'))['learner']
+    trees = learner['gradient_booster']['model']['trees']
+    n_classes = int(learner['learner_model_param']['num_class'])
+    base_score = np.asarray(json.loads(learner['learner_model_param']['base_score']), dtype=np.float64)
+
+    depth = max(_tree_depth(tree) for tree in trees)
+    n_internal = 2 ** depth - 1
+    feature = np.zeros((len(trees), n_internal), dtype=np.int32)
+    threshold = np.full((len(trees), n_internal), np.inf, dtype=np.float32)
+    default_left = np.ones((len(trees), n_internal), dtype=bool)
+    leaf_value = np.zeros((len(trees), n_internal + 1), dtype=np.float32)
+
+    for t, tree in enumerate(trees):
+        if any(tree['split_type']):
+            raise ValueError('Categorical splits are not supported')
+        # (XGBoost node, complete-tree position); a leaf above the last level
+        # keeps the pass-through defaults and is copied down its left branch
+        stack = [(0, 0)]
+        while stack:
+            node, position = stack.pop()
+            if position >= n_internal:
+                # XGBoost keeps a leaf's value in split_conditions
+                leaf_value[t, position - n_internal] = tree['split_conditions'][node]
+            elif tree['left_children'][node] == -1:
+                stack.append((node, 2 * position + 1))
+            else:
+                feature[t, position] = tree['split_indices'][node]
+                threshold[t, position] = tree['split_conditions'][node]
+                default_left[t, position] = tree['default_left'][node]
+                stack.append((tree['left_children'][node], 2 * position + 1))
+                stack.append((tree['right_children'][node], 2 * position + 2))
+
+    return {'feature': feature, 'threshold': threshold, 'default_left': default_left,
+            'leaf_value': leaf_value,
+            'tree_class': np.array(learner['gradient_booster']['model']['tree_info'], dtype=np.int32),
+            'base_margin': np.broadcast_to(base_score, (n_classes,)).copy()}
+
+def export_model(model_dir=None, out_path=None):
+    """
+    Write the compiled model (.npz) and native booster (.ubj) for model_dir
+
+    Needs the training-time stack (joblib, scikit-learn, XGBoost) to read
+    the pickles; nothing written here needs it again. Returns the .npz path.
+    """
+    import joblib
+
+    from wellwatch.inference import MODEL_DIR, load_metadata
+
+    model_dir = model_dir or MODEL_DIR
+    out_path = out_path or os.path.join(model_dir, COMPILED_FILE)
+    model = joblib.load(os.path.join(model_dir, 'chronic_risk_model.pkl'))
+    scaler = joblib.load(os.path.join(model_dir, 'scaler.pkl'))
+    label_encoder = joblib.load(os.path.join(model_dir, 'label_encoder.pkl'))
+    with open(os.path.join(model_dir, 'feature_list.json'), 'r') as f:
+        features = json.load(f)['features']
+
+    booster = model.get_booster()
+    arrays = flatten_booster(booster)
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'features': features,
+        'classes': [str(c) for c in label_encoder.classes_],
+        'scaler_mean': scaler.mean_.tolist(),
+        'scaler_scale': scaler.scale_.tolist(),
+        'metadata': load_metadata(model_dir),
+        'sources': source_hashes(model_dir),
+    }
+    np.savez_compressed(out_path, meta=np.array(json.dumps(meta)),
+                        feature_importances=np.asarray(model.feature_importances_, dtype=np.float32),
+                        **arrays)
+    booster.save_model(os.path.join(os.path.dirname(out_path), BOOSTER_FILE))
+    return out_path
+
+def verify(model_dir=None, data_path='data/cleaned_data.csv'):
+    """
+    Largest probability difference and label/score mismatches against the pickled model
+
+    The NumPy evaluator is checked on its own, scoring row by row in
+    NATIVE_MIN_ROWS - 1 row slices so the native booster is never used.
+    """
+    import pandas as pd
+
+    from wellwatch.inference import MODEL_DIR, RiskEngine
+    from wellwatch.ingest import NA_VALUES
+    from wellwatch.scoring import probability_risk_score
+
+    model_dir = model_dir or MODEL_DIR
+    reference = RiskEngine.load(model_dir, cache_size=0, compiled=False)
+    compiled = RiskEngine.load(model_dir, cache_size=0, compiled=True)
+    data = pd.read_csv(data_path, keep_default_na=False, na_values=NA_VALUES)
+
+    expected = reference.predict_proba(data)
+    step = NATIVE_MIN_ROWS - 1
+    actual = np.concatenate([compiled.predict_proba(data.iloc[i:i + step]) for i in range(0, len(data), step)])
+    expected_score = probability_risk_score(expected, expected.argmax(axis=1))
+    actual_score = probability_risk_score(actual, actual.argmax(axis=1))
+    return {
+        'rows': len(data),
+        'max_probability_diff': float(np.abs(expected - actual).max()),
+        'risk_level_mismatches': int((expected.argmax(axis=1) != actual.argmax(axis=1)).sum()),
+        'risk_score_mismatches': int((expected_score != actual_score).sum()),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export or verify the compiled risk model')
+    parser.add_argument('command', choices=('export', 'verify'))
+    parser.add_argument('--model-dir', default=None, help='Directory with the model artifacts')
+    parser.add_argument('--data', default='data/cleaned_data.csv', help='Screenings to verify on')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        start = time.perf_counter()
+        path = export_model(args.model_dir)
+        print(f'Wrote {path} ({os.path.getsize(path) / 1024:.0f} KB) in {time.perf_counter() - start:.1f}s')
+    else:
+        result = verify(args.model_dir, args.data)
+        print(json.dumps(result, indent=2))
+        if result['risk_level_mismatches']:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+"""
+SHAP explanations for the XGBoost risk model
+
+The notebook explains the model with shap.Explainer(model.predict_proba,
+X_train), the model-agnostic permutation path. RiskExplainer instead uses
+TreeSHAP through the booster itself (predict(pred_contribs=True)), which
+gives exactly the values of shap.TreeExplainer without importing shap and
+explains one patient in a few milliseconds.
+
+Global importances (mean |SHAP| over a background sample) are computed
+once per model and cached as JSON next to the model artifacts, keyed by
+model version and a fingerprint of the booster.
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from wellwatch.cache import DEFAULT_MAXSIZE, DEFAULT_TTL, ResultCache, cached_rows
+from wellwatch.features import is_single_record
+from wellwatch.inference import MODEL_DIR
+from wellwatch.ingest import NA_VALUES
+from wellwatch.scoring import RISK_LEVELS
+from wellwatch.telemetry import span
+
+BACKGROUND_PATH = 'data/cleaned_data.csv'
+BACKGROUND_SIZE = 500
+CACHE_DIR = os.path.join(MODEL_DIR, 'explanations')
+
+FEATURE_LABELS = {
+    'age': 'Age',
+    'bmi': 'BMI',
+    'systolic_bp': 'Systolic BP',
+    'diastolic_bp': 'Diastolic BP',
+    'pulse_rate': 'Pulse Rate',
+    'fasting_glucose': 'Fasting Glucose',
+    'smoking': 'Smoking',
+    'alcohol': 'Alcohol',
+    'family_diabetes': 'Family History - Diabetes',
+    'family_hypertension': 'Family History - Hypertension',
+    'family_heart_disease': 'Family History - Heart Disease',
+    'fatigue': 'Symptoms - Fatigue',
+    'breathlessness': 'Symptoms - Breathlessness',
+    'chest_pain': 'Symptoms - Chest Pain',
+    'frequent_urination': 'Symptoms - Frequent Urination',
+    'blurred_vision': 'Symptoms - Blurred Vision',
+    'gender_encoded': 'Gender',
+    'location_encoded': 'Location',
+    'activity_encoded': 'Physical Activity',
+    'diet_encoded': 'Diet Quality',
+    'high_bp_flag': 'High Blood Pressure',
+    'high_glucose_flag': 'Elevated Glucose',
+    'overweight_flag': 'Overweight',
+    'elderly_flag': 'Age > 60',
+    'bp_glucose_risk': 'High BP + High Glucose',
+    'family_risk_score': 'Family History',
+    'lifestyle_risk_score': 'Lifestyle Risk',
+    'symptom_count': 'Symptom Count',
+}
+
+# ================================================================================
+# EXPLAINER
+# ================================================================================
+
+class RiskExplainer:
+    """TreeSHAP explanations for a RiskEngine's XGBoost model"""
+
+    def __init__(self, engine, background=None, cache_dir=CACHE_DIR, background_size=BACKGROUND_SIZE,
+                 cache_size=DEFAULT_MAXSIZE, cache_ttl=DEFAULT_TTL):
+        self.engine = engine
+        self.booster = engine.model.get_booster()
+        self.features = list(engine.features)
+        self.labels = [FEATURE_LABELS.get(name, name) for name in self.features]
+        self.background = background
+        self.background_size = background_size
+        self.cache_dir = cache_dir
+
+        self.fingerprint = hashlib.sha1(bytes(self.booster.save_raw('ubj'))).hexdigest()[:12]
+        self.cache_key = f'{engine.model_version}-{self.fingerprint}'
+        self._global = None
+        self._lock = threading.Lock()
+
+        # Per-patient SHAP values by feature row (cache_size=0 disables)
+        self.cache = ResultCache(cache_size, cache_ttl) if cache_size else None
+
+    def contributions(self, X):
+        """
+        SHAP values for a feature matrix
+
+        Returns (values, base_values): values has shape (n, 3, n_features)
+        and base_values shape (3,), both in RISK_LEVELS order and in margin
+        (log-odds) units, so each class's values sum to its margin.
+        """
+        with span('explain.shap'):
+            dmatrix = xgb.DMatrix(np.asarray(X, dtype=np.float32), feature_names=self.booster.feature_names)
+            contribs = self.booster.predict(dmatrix, pred_contribs=True)[:, self.engine._class_order, :]
+        return contribs[:, :, :-1], contribs[0, :, -1]
+
+    def explain(self, patient_data, risk_level=None, top=None):
+        """
+        Feature contributions behind one patient's prediction
+
+        Parameters:
+        -----------
+        patient_data : single patient dict (as for RiskEngine.predict)
+        risk_level : class to explain (default: the predicted class)
+        top : keep only the top contributions by absolute value
+
+        Returns:
+        --------
+        pandas.DataFrame with Feature, Label and Contribution columns, sorted
+        by absolute contribution; positive values push towards risk_level
+        """
+        if not is_single_record(patient_data):
+            raise ValueError('explain() takes a single patient dict')
+        X = self.engine.build_features(patient_data)
+        if self.cache is not None:
+            values = cached_rows(self.cache, X, self.engine.model_version,
+                                 lambda rows: self.contributions(rows)[0])
+        else:
+            values, _ = self.contributions(X)
+        if risk_level is None:
+            risk_level = RISK_LEVELS[int(self.engine.predict_proba_matrix(X)[0].argmax())]
+        values = values[0, RISK_LEVELS.index(risk_level)]
+
+        order = np.argsort(-np.abs(values))
+        if top is not None:
+            order = order[:top]
+        return pd.DataFrame({
+            'Feature': [self.features[i] for i in order],
+            'Label': [self.labels[i] for i in order],
+            'Contribution': values[order].astype(np.float64),
+        })
+
+    def top_risk_factors(self, patient_data, n=5):
+        """Labels of the n features that push this patient most towards their predicted risk level"""
+        explanation = self.explain(patient_data)
+        return explanation.loc[explanation['Contribution'] > 0, 'Label'].head(n).tolist()
+
+    # ----------------------------------------------------------------------------
+    # Global importances
+    # ----------------------------------------------------------------------------
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, f'shap_importance_{self.cache_key}.json')
+
+    def global_importance(self):
+        """
+        Mean |SHAP| per feature over the background sample
+
+        Returns a DataFrame with Feature, Label, Importance (summed over
+        classes) and one column per risk level, sorted by Importance.
+        Computed once per model; later calls read the in-memory or on-disk
+        cache.
+        """
+        with self._lock:
+            if self._global is None:
+                self._global = self._load_global() or self._compute_global()
+            cached = self._global
+
+        importance = pd.DataFrame({'Feature': cached['features']})
+        importance['Label'] = [FEATURE_LABELS.get(name, name) for name in cached['features']]
+        for level in RISK_LEVELS:
+            importance[level] = cached['mean_abs_shap'][level]
+        importance['Importance'] = importance[list(RISK_LEVELS)].sum(axis=1)
+        return importance.sort_values('Importance', ascending=False, ignore_index=True)
+
+    def _load_global(self):
+        if not os.path.exists(self.cache_path):
+            return None
+        with open(self.cache_path, 'r') as f:
+            cached = json.load(f)
+        return cached if cached.get('features') == self.features else None
+
+    def _compute_global(self):
+        background = self.background
+        if background is None:
+            background = pd.read_csv(BACKGROUND_PATH, keep_default_na=False, na_values=NA_VALUES)
+        if len(background) > self.background_size:
+            background = background.sample(self.background_size, random_state=42)
+
+        values, _ = self.contributions(self.engine.build_features(background))
+        mean_abs = np.abs(values).mean(axis=0)
+        cached = {
+            'model_version': self.engine.model_version,
+            'fingerprint': self.fingerprint,
+            'background_rows': len(background),
+            'features': self.features,
+            'mean_abs_shap': {level: mean_abs[i].round(6).tolist() for i, level in enumerate(RISK_LEVELS)},
+        }
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.cache_path, 'w') as f:
+                json.dump(cached, f, indent=2)
+        except OSError:
+            pass  # read-only install: keep the in-memory copy
+        return cached
@@ -0,0 +1,297 @@
+"""
+Streaming screening export
+
+Screenings are read from SQLite in chunks (keyset pagination on id, like
+the batch reports) and written as they arrive, so an export of a year of
+district data holds one chunk in memory rather than the whole table:
+
+- CSV and JSON lines are generators of encoded chunks, for writing to a
+  file or streaming to a client
+- Parquet is written one row group per chunk (pyarrow)
+- XLSX goes through openpyxl's write-only workbook, which streams rows to
+  a temporary file instead of building the sheet in memory
+
+Columns are chosen by the Admin Panel's field groups.
+
+Usage:
+    python -m wellwatch.export screenings_2025.csv --start-date 2025-01-01 --end-date 2025-12-31
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from wellwatch.features import compute_bmi
+from wellwatch.scoring import RISK_LEVELS, decode_recommendations, recommendation_codes
+from wellwatch.storage import DB_PATH, SCREENING_INPUT_COLUMNS, get_database, screening_filters
+
+DEFAULT_CHUNK_SIZE = 5000
+
+# Export column -> SQL expression; screening inputs fall back to the patient row
+EXPORT_COLUMNS = {
+    'screening_id': 's.id',
+    'patient_id': 's.patient_id',
+    'age': 'COALESCE(s.age, p.age)',
+    'gender': 'p.gender',
+    'location': 'COALESCE(s.location, p.location)',
+    'height_cm': 's.height_cm',
+    'weight_kg': 's.weight_kg',
+    'bmi': 's.bmi',
+    'systolic_bp': 's.systolic_bp',
+    'diastolic_bp': 's.diastolic_bp',
+    'pulse_rate': 's.pulse_rate',
+    'fasting_glucose': 's.fasting_glucose',
+    'risk_level': 's.risk_level',
+    'risk_score': 's.risk_score',
+    'model_version': 's.model_version',
+    'chw_id': 's.chw_id',
+    'screening_date': 's.screening_date',
+}
+
+FIELD_GROUPS = {
+    'Patient Demographics': ('patient_id', 'age', 'gender', 'location'),
+    'Vital Signs': ('height_cm', 'weight_kg', 'bmi', 'systolic_bp', 'diastolic_bp', 'pulse_rate',
+                    'fasting_glucose'),
+    'Risk Assessment': ('risk_level', 'risk_score', 'model_version'),
+    'Recommendations': ('recommendations',),
+    'CHW Information': ('chw_id',),
+    'Timestamps': ('screening_date',),
+}
+DEFAULT_GROUPS = ('Patient Demographics', 'Vital Signs', 'Risk Assessment')
+
+# Inputs recommendation_codes() reads, selected when recommendations are exported
+RECOMMENDATION_INPUTS = ('age', 'bmi', 'systolic_bp', 'diastolic_bp', 'fasting_glucose', 'risk_level') + \
+    tuple(column for column in SCREENING_INPUT_COLUMNS if column != 'age')
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+RECOMMENDATION_SEPARATOR = '; '
+XLSX_MAX_ROWS = 1048575  # one Excel sheet, less the header row
+
+# ================================================================================
+# READING
+# ================================================================================
+
+def export_columns(groups=DEFAULT_GROUPS):
+    """Output columns for the field groups: screening_id first, then each group's columns in order"""
+    unknown = [group for group in groups if group not in FIELD_GROUPS]
+    if unknown:
+        raise ValueError(f"Unknown field group(s): {', '.join(unknown)} (choose from {', '.join(FIELD_GROUPS)})")
+    columns = ['screening_id']
+    for group in groups:
+        columns.extend(column for column in FIELD_GROUPS[group] if column not in columns)
+    return columns
+
+def _add_recommendations(frame):
+    """Recommendation lists from the stored inputs and risk level, decoded once per distinct bitmask"""
+    risk_code = frame['risk_level'].map({level: i for i, level in enumerate(RISK_LEVELS)})
+    codes = recommendation_codes(frame, risk_code.fillna(0).to_numpy(dtype=np.int64), compute_bmi(frame))
+    unique, inverse = np.unique(codes, return_inverse=True)
+    decoded = np.empty(len(unique), dtype=object)
+    decoded[:] = [list(decode_recommendations(code)) for code in unique]
+    frame['recommendations'] = decoded[inverse]
+    return frame
+
+def export_chunks(groups=DEFAULT_GROUPS, db_path=DB_PATH, chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """
+    DataFrames of up to chunk_size screenings, oldest first
+
+    Parameters:
+    -----------
+    groups : FIELD_GROUPS names to include (screening_id is always included)
+    db_path : SQLite database to read
+    chunk_size : rows per chunk (and per Parquet row group)
+    filters : storage.screening_filters() arguments, e.g. start_date and
+        end_date
+
+    Each query continues after the previous chunk's last id, so the export
+    reads the table once however many chunks it takes.
+    """
+    columns = export_columns(groups)
+    selected = [column for column in columns if column in EXPORT_COLUMNS]
+    if 'recommendations' in columns:
+        selected += [column for column in RECOMMENDATION_INPUTS if column not in selected]
+    select = ', '.join(f'{EXPORT_COLUMNS.get(column, "s." + column)} AS {column}' for column in selected)
+
+    where, params = screening_filters(**filters)
+    clause = f'{where} AND s.id > ?' if where else 'WHERE s.id > ?'
+    sql = f'''
+    SELECT {select}
+    FROM screenings s
+    LEFT JOIN patients p ON p.patient_id = s.patient_id
+    {clause}
+    ORDER BY s.id
+    LIMIT ?
+    '''
+
+    db = get_database(db_path)
+    last_id = 0
+    while True:
+        frame = db.read_frame(sql, (*params, last_id, chunk_size))
+        if frame.empty:
+            return
+        last_id = int(frame['screening_id'].iloc[-1])
+        if 'recommendations' in columns:
+            frame = _add_recommendations(frame)
+        yield frame[columns]
+
+# ================================================================================
+# WRITERS
+# ================================================================================
+
+def _flat(frame):
+    """Recommendation lists joined into one text cell (CSV and XLSX)"""
+    if 'recommendations' in frame:
+        frame = frame.assign(recommendations=frame['recommendations'].str.join(RECOMMENDATION_SEPARATOR))
+    return frame
+
+def csv_chunks(frames):
+    """UTF-8 CSV, one encoded chunk per frame (header with the first)"""
+    header = True
+    for frame in frames:
+        yield _flat(frame).to_csv(index=False, header=header).encode('utf-8')
+        header = False
+
+def jsonl_chunks(frames):
+    """JSON lines (one object per screening), one encoded chunk per frame"""
+    for frame in frames:
+        yield frame.to_json(orient='records', lines=True, force_ascii=False).encode('utf-8')
+
+def write_parquet(frames, out):
+    """Parquet file with one row group per frame, returns the rows written"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError('Parquet export requires pyarrow (pip install pyarrow)')
+
+    writer, schema, rows = None, None, 0
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                # Columns that are all NULL in the first chunk would pin the
+                # schema to the null type; read them as strings instead
+                schema = pa.schema([pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f
+                                    for f in table.schema])
+                writer = pq.ParquetWriter(out, schema)
+            writer.write_table(table.cast(schema))
+            rows += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def write_xlsx(frames, out, sheet_name='Screenings'):
+    """
+    XLSX workbook written row by row (openpyxl write-only mode), returns
+    the rows written
+
+    openpyxl serializes every cell in Python (faster with lxml installed),
+    so CSV and Parquet are the better choice for large exports. More than
+    XLSX_MAX_ROWS rows do not fit on a sheet and raise ValueError.
+    """
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError('XLSX export requires openpyxl (pip install openpyxl)')
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    rows, header = 0, False
+    for frame in frames:
+        if rows + len(frame) > XLSX_MAX_ROWS:
+            raise ValueError(f'More than {XLSX_MAX_ROWS:,} screenings do not fit on an Excel sheet; '
+                             'export CSV or Parquet, or a shorter date range')
+        frame = _flat(frame)
+        if not header:
+            sheet.append(list(frame.columns))
+            header = True
+        frame = frame.astype(object).where(frame.notna(), None)
+        for row in frame.itertuples(index=False, name=None):
+            sheet.append(row)
+        rows += len(frame)
+    workbook.save(out)
+    return rows
+
+def _counted(frames, totals):
+    for frame in frames:
+        totals['rows'] += len(frame)
+        yield frame
+
+def export_screenings(out, fmt=None, groups=DEFAULT_GROUPS, db_path=DB_PATH,
+                      chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """
+    Write an export file
+
+    Parameters:
+    -----------
+    out : output path or binary file object
+    fmt : one of FORMATS (default: from the file extension of out; required
+        when out is a file object)
+    groups, db_path, chunk_size, filters : as for export_chunks()
+
+    Returns:
+    --------
+    int : number of screenings exported
+    """
+    is_path = isinstance(out, (str, os.PathLike))
+    if fmt is None:
+        if not is_path:
+            raise ValueError(f"Pass fmt (one of {', '.join(FORMATS)}) when exporting to a file object")
+        fmt = os.path.splitext(out)[1].lstrip('.').lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}' (choose from {', '.join(FORMATS)})")
+
+    totals = {'rows': 0}
+    frames = _counted(export_chunks(groups, db_path, chunk_size, **filters), totals)
+    if fmt == 'parquet':
+        write_parquet(frames, out)
+    elif fmt == 'xlsx':
+        write_xlsx(frames, out)
+    else:
+        chunks = csv_chunks(frames) if fmt == 'csv' else jsonl_chunks(frames)
+        f = open(out, 'wb') if is_path else out
+        try:
+            for chunk in chunks:
+                f.write(chunk)
+        finally:
+            if f is not out:
+                f.close()
+    return totals['rows']
+
+# ================================================================================
+# CLI
+# ================================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export stored screenings to CSV, JSON lines, Parquet or XLSX')
+    parser.add_argument('out', help='Output file (.csv, .jsonl, .parquet or .xlsx)')
+    parser.add_argument('--format', choices=list(FORMATS), help='Output format (default: from the extension)')
+    parser.add_argument('--groups', nargs='+', default=list(DEFAULT_GROUPS), metavar='GROUP',
+                        help=f"Field groups to include: {', '.join(repr(g) for g in FIELD_GROUPS)}")
+    parser.add_argument('--start-date', help='First screening date (YYYY-MM-DD)')
+    parser.add_argument('--end-date', help='Last screening date (YYYY-MM-DD, inclusive)')
+    parser.add_argument('--chw-id', nargs='+', dest='chw_ids', help='Only these CHWs')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database path')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per chunk')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        rows = export_screenings(args.out, args.format, args.groups, args.db, args.chunk_size,
+                                 start_date=args.start_date, end_date=args.end_date, chw_ids=args.chw_ids)
+    except (ValueError, ImportError) as e:
+        parser.error(str(e))
+    elapsed = time.perf_counter() - start
+    print(f'Exported {rows:,} screenings to {args.out} in {elapsed:.1f}s '
+          f'({rows / max(elapsed, 1e-9):,.0f} rows/s)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Array-native feature pipeline
+
+FeatureTransformer turns raw screening records into the scaled float32
+matrix the XGBoost model was trained on. It is built once from the scaler
+and feature list, encodes categories through integer lookup tables and
+never constructs a pandas DataFrame, so a single patient costs a few
+microseconds instead of a full preprocess() pass.
+"""
+
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+
+# ================================================================================
+# ENCODINGS (must match preprocess() in the training notebook)
+# ================================================================================
+
+SCALED_FEATURES = ('age', 'bmi', 'systolic_bp', 'diastolic_bp', 'pulse_rate', 'fasting_glucose')
+
+GENDER_ENCODING = {'Male': 1, 'Female': 0}
+LOCATION_ENCODING = {'Rural': 0, 'Semi-Urban': 1, 'Urban': 2}
+ACTIVITY_ENCODING = {'None': 0, 'Low': 1, 'Moderate': 2, 'High': 3}
+DIET_ENCODING = {'Poor': 0, 'Average': 1, 'Good': 2}
+
+CATEGORICAL_FEATURES = (
+    ('gender', 'gender_encoded', GENDER_ENCODING),
+    ('location', 'location_encoded', LOCATION_ENCODING),
+    ('physical_activity', 'activity_encoded', ACTIVITY_ENCODING),
+    ('diet_quality', 'diet_encoded', DIET_ENCODING),
+)
+
+BINARY_FEATURES = ('smoking', 'alcohol', 'family_diabetes', 'family_hypertension',
+                   'family_heart_disease', 'fatigue', 'breathlessness', 'chest_pain',
+                   'frequent_urination', 'blurred_vision')
+
+# Order in which FeatureTransformer computes columns; the output matrix is
+# permuted into feature_list.json order with a precomputed index
+COMPUTED_FEATURES = (
+    SCALED_FEATURES + BINARY_FEATURES +
+    tuple(encoded for _, encoded, _ in CATEGORICAL_FEATURES) +
+    ('high_bp_flag', 'high_glucose_flag', 'overweight_flag', 'elderly_flag',
+     'bp_glucose_risk', 'family_risk_score', 'lifestyle_risk_score', 'symptom_count')
+)
+
+# ================================================================================
+# HELPERS
+# ================================================================================
+
+def is_single_record(data):
+    """True for one patient dict, False for a DataFrame or mapping of columns"""
+    return isinstance(data, Mapping) and not any(np.ndim(v) for v in data.values())
+
+def compute_bmi(data):
+    """BMI column for a batch: the 'bmi' field if supplied, else weight / height²"""
+    if 'bmi' in data:
+        return np.asarray(data['bmi'], dtype=np.float64)
+    return np.asarray(data['weight_kg'], dtype=np.float64) / \
+        ((np.asarray(data['height_cm'], dtype=np.float64)/100) ** 2)
+
+def _encode(values, table):
+    """Integer codes for a categorical column, NaN for unknown categories"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'iuf':
+        return values.astype(np.float64)
+    codes = np.full(len(values), np.nan)
+    for category, code in table.items():
+        codes[values == category] = code
+    return codes
+
+def _number(value, fill):
+    """Float value of a scalar field, with missing values replaced by fill"""
+    if value is None:
+        return fill
+    value = float(value)
+    return fill if value != value else value
+
+# ================================================================================
+# TRANSFORMER
+# ================================================================================
+
+class FeatureTransformer:
+    """Precompiled raw screening -> model feature matrix transform"""
+
+    def __init__(self, features, scaler_mean, scaler_scale):
+        self.features = list(features)
+        self.n_features = len(self.features)
+
+        missing = set(self.features) - set(COMPUTED_FEATURES)
+        if missing:
+            raise ValueError(f'Unsupported features in feature list: {sorted(missing)}')
+
+        position = {name: i for i, name in enumerate(self.features)}
+        self._positions = {name: position[name] for name in COMPUTED_FEATURES if name in position}
+        self._computed_columns = np.array([position.get(name, -1) for name in COMPUTED_FEATURES])
+        self._computed_mask = self._computed_columns >= 0
+
+        # Missing vitals are filled with the training means the scaler saw,
+        # so a patient's features never depend on who else is in the batch
+        self.mean = dict(zip(SCALED_FEATURES, map(float, scaler_mean)))
+        self.scale = dict(zip(SCALED_FEATURES, map(float, scaler_scale)))
+
+        self._local = threading.local()
+
+    @classmethod
+    def from_scaler(cls, features, scaler):
+        """Build a transformer from a fitted StandardScaler"""
+        return cls(features, scaler.mean_, scaler.scale_)
+
+    def transform(self, data, out=None):
+        """
+        Build the model input matrix
+
+        Parameters:
+        -----------
+        data : pandas.DataFrame, mapping of column name -> array-like, or a
+            single patient dict
+        out : optional preallocated (n, n_features) float32 array to fill
+
+        Returns:
+        --------
+        numpy.ndarray of shape (n, n_features), dtype float32, columns in
+        feature_list.json order
+        """
+        if is_single_record(data):
+            row = self.transform_one(data)
+            if out is None:
+                return row.copy()
+            out[:] = row
+            return out
+
+        n = len(np.asarray(data['age']))
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=np.float32)
+
+        def put(name, values):
+            if name in self._positions:
+                out[:, self._positions[name]] = values
+
+        vitals = {}
+        for name in SCALED_FEATURES:
+            values = compute_bmi(data) if name == 'bmi' else np.asarray(data[name], dtype=np.float64)
+            vitals[name] = np.where(np.isnan(values), self.mean[name], values)
+            put(name, (vitals[name] - self.mean[name]) / self.scale[name])
+
+        binary = {name: np.asarray(data[name], dtype=np.float64) for name in BINARY_FEATURES}
+        for name, values in binary.items():
+            put(name, values)
+
+        encoded = {}
+        for source, name, table in CATEGORICAL_FEATURES:
+            encoded[name] = _encode(data[source], table)
+            put(name, encoded[name])
+
+        high_bp = vitals['systolic_bp'] > 140
+        high_glucose = vitals['fasting_glucose'] > 126
+        put('high_bp_flag', high_bp)
+        put('high_glucose_flag', high_glucose)
+        put('overweight_flag', vitals['bmi'] > 25)
+        put('elderly_flag', vitals['age'] > 60)
+        put('bp_glucose_risk', high_bp & high_glucose)
+        put('family_risk_score', binary['family_diabetes'] + binary['family_hypertension'] +
+            binary['family_heart_disease'])
+        put('lifestyle_risk_score', binary['smoking'] + binary['alcohol'] +
+            (encoded['activity_encoded'] == 0))
+        put('symptom_count', binary['fatigue'] + binary['breathlessness'] + binary['chest_pain'] +
+            binary['frequent_urination'] + binary['blurred_vision'])
+
+        return out
+
+    def transform_one(self, record):
+        """
+        Feature row for a single patient dict
+
+        Returns a (1, n_features) buffer owned by the calling thread; it is
+        overwritten by the next transform_one() call on the same thread.
+        """
+        row = getattr(self._local, 'row', None)
+        if row is None:
+            row = self._local.row = np.empty((1, self.n_features), dtype=np.float32)
+
+        mean, scale = self.mean, self.scale
+        get = record.get
+
+        age = _number(get('age'), mean['age'])
+        if 'bmi' in record:
+            bmi = _number(record['bmi'], mean['bmi'])
+        else:
+            weight_kg = _number(get('weight_kg'), np.nan)
+            height_cm = _number(get('height_cm'), np.nan)
+            bmi = _number(weight_kg / ((height_cm/100) ** 2), mean['bmi'])
+        systolic_bp = _number(get('systolic_bp'), mean['systolic_bp'])
+        diastolic_bp = _number(get('diastolic_bp'), mean['diastolic_bp'])
+        pulse_rate = _number(get('pulse_rate'), mean['pulse_rate'])
+        fasting_glucose = _number(get('fasting_glucose'), mean['fasting_glucose'])
+
+        binary = [float(record[name]) for name in BINARY_FEATURES]
+        (smoking, alcohol, family_diabetes, family_hypertension, family_heart_disease,
+         fatigue, breathlessness, chest_pain, frequent_urination, blurred_vision) = binary
+
+        encoded = [float(table.get(record[source], np.nan)) for source, _, table in CATEGORICAL_FEATURES]
+        activity = encoded[2]
+
+        high_bp = systolic_bp > 140
+        high_glucose = fasting_glucose > 126
+
+        values = [
+            (age - mean['age']) / scale['age'],
+            (bmi - mean['bmi']) / scale['bmi'],
+            (systolic_bp - mean['systolic_bp']) / scale['systolic_bp'],
+            (diastolic_bp - mean['diastolic_bp']) / scale['diastolic_bp'],
+            (pulse_rate - mean['pulse_rate']) / scale['pulse_rate'],
+            (fasting_glucose - mean['fasting_glucose']) / scale['fasting_glucose'],
+            *binary,
+            *encoded,
+            high_bp,
+            high_glucose,
+            bmi > 25,
+            age > 60,
+            high_bp and high_glucose,
+            family_diabetes + family_hypertension + family_heart_disease,
+            smoking + alcohol + (activity == 0),
+            fatigue + breathlessness + chest_pain + frequent_urination + blurred_vision,
+        ]
+
+        row[0, self._computed_columns[self._computed_mask]] = \
+            np.asarray(values, dtype=np.float64)[self._computed_mask]
+        return row
@@ -0,0 +1,131 @@
+"""
+Follow-up worklists for community health workers
+
+Every saved screening schedules a follow-up visit in the interventions
+table, due FOLLOW_UP_DAYS after it (7 days for High risk, 14 for Medium,
+90 for Low, from the recommendation rule table), and completes the patient's previous open follow-up (see
+storage.schedule_follow_ups). A CHW's worklist for a day is their open
+interventions due by the end of it, most overdue first: a range of the
+(chw_id, status, due_date) index, already in priority order.
+
+The worklists of every CHW come from one query that walks the same index
+once, instead of a query per CHW.
+
+Usage:
+    python -m wellwatch.followup worklists.csv --day 2026-10-17
+    python -m wellwatch.followup CHW042.csv --chw-id CHW042
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from wellwatch.storage import DB_PATH, get_database
+
+OPEN_STATUS = 'scheduled'
+CLOSED_STATUSES = ('completed', 'cancelled')
+
+WORKLIST_SQL = '''
+SELECT i.chw_id, i.id AS intervention_id, i.patient_id, i.screening_id, i.intervention_type,
+       i.due_date, i.notes, s.risk_level, s.risk_score
+FROM interventions i
+LEFT JOIN screenings s ON s.id = i.screening_id
+WHERE {chw_clause} AND i.status = ? AND i.due_date < ?
+ORDER BY i.chw_id, i.due_date
+'''
+
+def _day_end(day):
+    """Exclusive upper bound on due_date for a worklist day (default today)"""
+    day = pd.Timestamp(day if day is not None else 'today').normalize()
+    return day, (day + pd.Timedelta(days=1)).strftime('%Y-%m-%d %H:%M:%S')
+
+def worklist_sql(chw_ids=None):
+    """
+    Worklist query (SQL, leading params) for some CHWs, or every CHW
+
+    Without chw_ids the index is walked in (chw_id, status, due_date) order
+    and skips from one CHW's open interventions to the next, so the result
+    needs no sort however many CHWs there are.
+    """
+    if chw_ids is None:
+        return WORKLIST_SQL.format(chw_clause='i.chw_id IS NOT NULL'), []
+    chw_ids = list(chw_ids)
+    return WORKLIST_SQL.format(chw_clause=f"i.chw_id IN ({', '.join('?' * len(chw_ids))})"), chw_ids
+
+def worklists(day=None, chw_ids=None, db_path=DB_PATH):
+    """
+    Due and overdue follow-ups, one row per intervention
+
+    Parameters:
+    -----------
+    day : worklist date (default today); interventions due by its end are included
+    chw_ids : CHWs to include (default: every CHW)
+    db_path : SQLite database to read
+
+    Returns:
+    --------
+    DataFrame ordered by chw_id, then due_date (most overdue first), with a
+    days_overdue column (0 for due today)
+    """
+    day, day_end = _day_end(day)
+    sql, params = worklist_sql(chw_ids)
+    frame = get_database(db_path).read_frame(sql, (*params, OPEN_STATUS, day_end))
+    due = pd.to_datetime(frame['due_date']).dt.normalize()
+    frame['days_overdue'] = (day - due).dt.days.clip(lower=0)
+    return frame
+
+def chw_worklist(chw_id, day=None, db_path=DB_PATH):
+    """One CHW's worklist (see worklists())"""
+    return worklists(day, [chw_id], db_path).drop(columns='chw_id')
+
+def close_intervention(intervention_id, status='completed', notes=None, db_path=DB_PATH):
+    """
+    Mark an open intervention completed or cancelled, returns whether it was open
+
+    For follow-ups closed without a screening, e.g. a patient who attended
+    the PHC or moved away; a new screening closes them by itself.
+    """
+    if status not in CLOSED_STATUSES:
+        raise ValueError(f"status must be one of {', '.join(CLOSED_STATUSES)}")
+    with get_database(db_path).transaction() as conn:
+        cursor = conn.execute(
+            '''UPDATE interventions SET status = ?, completed_at = CURRENT_TIMESTAMP,
+                   notes = COALESCE(?, notes)
+               WHERE id = ? AND status = ?''', (status, notes, intervention_id, OPEN_STATUS))
+        return cursor.rowcount == 1
+
+def worklist_summary(day=None, db_path=DB_PATH):
+    """Open follow-ups due by the end of day: counts per CHW with the most overdue, from the same index"""
+    day, day_end = _day_end(day)
+    return get_database(db_path).read_frame(
+        '''SELECT chw_id, COUNT(*) AS due, MIN(due_date) AS oldest_due
+           FROM interventions
+           WHERE chw_id IS NOT NULL AND status = ? AND due_date < ?
+           GROUP BY chw_id
+           ORDER BY chw_id''', (OPEN_STATUS, day_end))
+
+# ================================================================================
+# CLI
+# ================================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export the follow-up worklists due on a day')
+    parser.add_argument('out', help='CSV file for the worklists')
+    parser.add_argument('--day', help='Worklist date (YYYY-MM-DD, default today)')
+    parser.add_argument('--chw-id', nargs='+', dest='chw_ids', help='Only these CHWs (default: all)')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database path')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        frame = worklists(args.day, args.chw_ids, args.db)
+    except ValueError as e:
+        parser.error(str(e))
+    frame.to_csv(args.out, index=False)
+    print(f"Wrote {len(frame):,} follow-ups for {frame['chw_id'].nunique():,} CHWs "
+          f"({int((frame['days_overdue'] > 0).sum()):,} overdue) to {args.out} "
+          f'in {time.perf_counter() - start:.2f}s')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Longitudinal patient history
+
+A patient's screenings in date order, with the change in blood pressure,
+glucose, BMI and risk score since the previous visit and since the first.
+The query is a range scan of idx_screenings_patient_date (patient_id,
+screening_date), so its cost depends on the patient's visit count, not on
+the size of the table.
+
+CHWs revisit the same households, so PatientHistory keeps recently viewed
+timelines in an LRU. Entries are keyed on the patient's own screening count
+and latest screening id (read from the same index) plus the counter that
+re-scoring bumps: a screening saved or removed for that patient, from any
+process, or a re-scoring run makes the next lookup read fresh rows, while
+the many screenings saved for other patients during a camp leave the entry
+valid.
+"""
+
+from wellwatch.cache import ResultCache
+from wellwatch.storage import DB_PATH, SCORES_VERSION, get_database
+
+DEFAULT_HISTORY_SIZE = 1024  # patients
+DEFAULT_HISTORY_TTL = 3600  # seconds
+
+TIMELINE_COLUMNS = ('screening_id', 'screening_date', 'risk_level', 'risk_score', 'systolic_bp',
+                    'diastolic_bp', 'fasting_glucose', 'bmi', 'chw_id', 'location')
+
+# Oldest first; id breaks ties between screenings saved in the same second
+TIMELINE_SQL = '''
+SELECT s.id, s.screening_date, s.risk_level, s.risk_score, s.systolic_bp,
+       s.diastolic_bp, s.fasting_glucose, s.bmi, s.chw_id, s.location
+FROM screenings s
+WHERE s.patient_id = ?
+ORDER BY s.screening_date, s.id
+'''
+
+PATIENT_SQL = 'SELECT age, gender, location FROM patients WHERE patient_id = ?'
+
+# Changes whenever the patient's timeline can: their screenings are added
+# or removed (patient rows are only updated along with a new screening), or
+# stored risk levels are re-scored
+TIMELINE_VERSION_SQL = '''
+SELECT COUNT(*), MAX(s.id), (SELECT version FROM table_versions WHERE name = ?)
+FROM screenings s
+WHERE s.patient_id = ?
+'''
+
+# Measures reported as changes between visits
+TREND_COLUMNS = ('systolic_bp', 'diastolic_bp', 'fasting_glucose', 'bmi', 'risk_score')
+
+def _delta(current, previous):
+    """current - previous, None when either is missing"""
+    if current is None or previous is None:
+        return None
+    return round(current - previous, 2)
+
+def patient_timeline(patient_id, db_path=DB_PATH):
+    """
+    All screenings of one patient, oldest first, with visit-to-visit changes
+
+    Parameters:
+    -----------
+    patient_id : patient to look up
+    db_path : SQLite database to read
+
+    Returns:
+    --------
+    dict with the patient's demographics (None when there is no patient
+    row), 'screenings' (one dict per screening with TIMELINE_COLUMNS and
+    'deltas', the change in TREND_COLUMNS since the previous screening,
+    None for the first), 'change' (latest minus first screening) and
+    'screening_count'. An unknown patient has no screenings.
+    """
+    db = get_database(db_path)
+    patient = db.query(PATIENT_SQL, (patient_id,))
+    age, gender, location = patient[0] if patient else (None, None, None)
+
+    screenings, previous = [], None
+    for row in db.query(TIMELINE_SQL, (patient_id,)):
+        screening = dict(zip(TIMELINE_COLUMNS, row))
+        screening['deltas'] = None if previous is None else {
+            column: _delta(screening[column], previous[column]) for column in TREND_COLUMNS
+        }
+        screenings.append(screening)
+        previous = screening
+
+    change = None
+    if len(screenings) > 1:
+        change = {column: _delta(screenings[-1][column], screenings[0][column]) for column in TREND_COLUMNS}
+
+    return {
+        'patient_id': patient_id,
+        'age': age,
+        'gender': gender,
+        'location': location,
+        'screening_count': len(screenings),
+        'first_screening': screenings[0]['screening_date'] if screenings else None,
+        'last_screening': screenings[-1]['screening_date'] if screenings else None,
+        'change': change,
+        'screenings': screenings,
+    }
+
+class PatientHistory:
+    """
+    patient_timeline() behind an LRU of recently viewed patients
+
+    Timelines are shared between callers and must not be modified.
+    """
+
+    def __init__(self, db_path=DB_PATH, maxsize=DEFAULT_HISTORY_SIZE, ttl=DEFAULT_HISTORY_TTL):
+        self.db_path = db_path
+        self.cache = ResultCache(maxsize, ttl)
+
+    def timeline(self, patient_id):
+        """Timeline of one patient, read from the database only when its screenings may have changed"""
+        version = get_database(self.db_path).query(TIMELINE_VERSION_SQL, (SCORES_VERSION, patient_id))[0]
+        key = (patient_id, *version)
+        timeline = self.cache.get(key)
+        if timeline is None:
+            timeline = patient_timeline(patient_id, self.db_path)
+            self.cache.put(key, timeline)
+        return timeline
+
+    def stats(self):
+        return self.cache.stats()
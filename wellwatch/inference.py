@@ -0,0 +1,164 @@
+"""
+Model-backed risk inference
+
+RiskEngine loads the trained XGBoost model and its preprocessing artifacts
+from models/ once and keeps them in memory, so every prediction after the
+first only pays for feature building and predict_proba on the whole batch.
+
+When models/ holds a compiled model (see wellwatch.compiled) it is used
+instead of the pickles, so inference needs only NumPy, unless the pickles
+next to it are not the ones it was exported from.
+"""
+
+import json
+import os
+import warnings
+
+import numpy as np
+
+from wellwatch.cache import DEFAULT_MAXSIZE, DEFAULT_TTL, ResultCache, cached_rows
+from wellwatch.compiled import COMPILED_FILE, load_compiled, stale_sources
+from wellwatch.features import FeatureTransformer, compute_bmi, is_single_record
+from wellwatch.scoring import RISK_LEVELS, decode_recommendations, probability_risk_score, recommendation_codes
+from wellwatch.telemetry import span
+
+MODEL_DIR = 'models'
+
+# Larger batches (ingestion, re-scoring) bypass the result cache: they are
+# rarely repeats and would only flush it
+CACHE_MAX_ROWS = 256
+
+def load_metadata(model_dir=MODEL_DIR):
+    """model_metadata.json contents, or an empty dict if there is none"""
+    metadata_path = os.path.join(model_dir, 'model_metadata.json')
+    if not os.path.exists(metadata_path):
+        return {}
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
+
+# ================================================================================
+# INFERENCE ENGINE
+# ================================================================================
+
+class RiskEngine:
+    """XGBoost risk model plus scaler, label encoder and feature list"""
+
+    def __init__(self, model, scaler, label_encoder, features, metadata=None, cache=None):
+        self.model = model
+        self.scaler = scaler
+        self.label_encoder = label_encoder
+        self.features = list(features)
+        self.metadata = metadata or {}
+        self.model_version = str(self.metadata.get('model_version', 'unknown'))
+
+        # predict_proba columns follow label_encoder.classes_ (alphabetical),
+        # results are reported in RISK_LEVELS order
+        classes = list(label_encoder.classes_)
+        self._class_order = [classes.index(level) for level in RISK_LEVELS]
+
+        self.transformer = FeatureTransformer.from_scaler(self.features, scaler)
+
+        # Optional ResultCache of probability rows for small requests
+        self.cache = cache
+
+        importances = model.feature_importances_
+        self.top_risk_factors = [self.features[i] for i in np.argsort(importances)[-5:][::-1]]
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR, cache_size=DEFAULT_MAXSIZE, cache_ttl=DEFAULT_TTL, compiled=None):
+        """
+        Load all model artifacts from model_dir
+
+        compiled=None uses the compiled model when model_dir has one that
+        was exported from the artifacts next to it, and the pickles (with a
+        warning when a stale compiled model is skipped) otherwise;
+        True/False forces either. cache_size=0 disables the result cache.
+        """
+        cache = ResultCache(cache_size, cache_ttl) if cache_size else None
+        compiled_path = os.path.join(model_dir, COMPILED_FILE)
+        if compiled is None:
+            compiled = os.path.exists(compiled_path)
+            stale = compiled and stale_sources(compiled_path)
+            if stale:
+                warnings.warn(f"{compiled_path} is out of date ({', '.join(stale)} changed since it was "
+                              f"exported); loading the pickles instead. Re-export it with "
+                              f"'python -m wellwatch.compiled export'.")
+                compiled = False
+        if compiled:
+            return cls(*load_compiled(compiled_path), cache)
+
+        import joblib  # the pickles need joblib, scikit-learn and XGBoost
+
+        model = joblib.load(os.path.join(model_dir, 'chronic_risk_model.pkl'))
+        scaler = joblib.load(os.path.join(model_dir, 'scaler.pkl'))
+        label_encoder = joblib.load(os.path.join(model_dir, 'label_encoder.pkl'))
+        with open(os.path.join(model_dir, 'feature_list.json'), 'r') as f:
+            features = json.load(f)['features']
+
+        return cls(model, scaler, label_encoder, features, load_metadata(model_dir), cache)
+
+    def build_features(self, data):
+        """Scaled float32 model input matrix, columns in feature_list.json order"""
+        with span('inference.features'):
+            return self.transformer.transform(data)
+
+    def predict_proba(self, data):
+        """Class probabilities as an (n, 3) array in RISK_LEVELS order"""
+        return self.predict_proba_matrix(self.build_features(data))
+
+    def predict_proba_matrix(self, X):
+        """Class probabilities for an already built feature matrix"""
+        if self.cache is not None and len(X) <= CACHE_MAX_ROWS:
+            return cached_rows(self.cache, X, self.model_version, self._predict_proba)
+        return self._predict_proba(X)
+
+    def _predict_proba(self, X):
+        with span('inference.model'):
+            return self.model.predict_proba(X)[:, self._class_order]
+
+    def predict_batch(self, data):
+        """
+        Score a batch of screenings with the model
+
+        Returns a dict of arrays with the same keys as
+        wellwatch.scoring.predict_risk_batch(); risk_score is on the rule
+        scorer's 0-100 scale (see scoring.probability_risk_score()).
+        """
+        probabilities = self.predict_proba(data)
+        if is_single_record(data):
+            data = {key: [value] for key, value in data.items()}
+        risk_code = probabilities.argmax(axis=1)
+        bmi = compute_bmi(data)
+        with span('inference.recommendations'):
+            codes = recommendation_codes(data, risk_code, bmi)
+
+        return {
+            'risk_level': np.array(RISK_LEVELS, dtype=object)[risk_code],
+            'risk_code': risk_code,
+            'risk_score': probability_risk_score(probabilities, risk_code),
+            'risk_probabilities': probabilities,
+            'recommendation_codes': codes,
+            'bmi': bmi,
+        }
+
+    def predict_results(self, data):
+        """Score a batch and return one predict() style dict per patient"""
+        batch = self.predict_batch(data)
+        return [
+            {
+                'risk_score': int(score),
+                'risk_level': RISK_LEVELS[code],
+                'risk_probabilities': dict(zip(RISK_LEVELS, map(float, probs))),
+                'top_risk_factors': list(self.top_risk_factors),
+                'recommendations': list(decode_recommendations(rec_code)),
+                'bmi': round(float(bmi), 1),
+                'model_version': self.model_version
+            }
+            for code, score, probs, rec_code, bmi in zip(batch['risk_code'], batch['risk_score'],
+                                                         batch['risk_probabilities'],
+                                                         batch['recommendation_codes'], batch['bmi'])
+        ]
+
+    def predict(self, patient_data):
+        """Predict chronic disease risk for a single patient dict"""
+        return self.predict_results(patient_data)[0]
@@ -0,0 +1,299 @@
+"""
+Streaming bulk-screening ingestion
+
+Reads camp CSV (or Parquet) files shaped like data/raw_screening_data.csv
+in fixed-size chunks, cleans each chunk with the notebook's cleaning rules,
+scores it and writes it to the screenings table in one transaction, so
+memory stays bounded by the chunk size however large the file is.
+
+The notebook computes its imputation medians and outlier bounds over the
+whole dataset. A stream cannot, so CleaningRules fits them once on a
+reference file (by default the raw training data, which reproduces
+data/cleaned_data.csv exactly) and applies them unchanged to every chunk.
+
+Usage:
+    python -m wellwatch.ingest camp_screenings.csv --chunksize 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from wellwatch.features import (BINARY_FEATURES, GENDER_ENCODING, LOCATION_ENCODING,
+                                ACTIVITY_ENCODING, DIET_ENCODING)
+from wellwatch.inference import MODEL_DIR, RiskEngine
+from wellwatch.scoring import predict_risk_batch
+from wellwatch.storage import DB_PATH, PATIENT_COLUMNS, SCREENING_COLUMNS, save_screenings
+
+REFERENCE_PATH = 'data/raw_screening_data.csv'
+DEFAULT_CHUNKSIZE = 50_000
+
+# ================================================================================
+# CLEANING RULES (same steps as the DATA CLEANING cell in the notebook)
+# ================================================================================
+
+NUMERIC_COLUMNS = ('age', 'height_cm', 'weight_kg', 'systolic_bp', 'diastolic_bp',
+                   'pulse_rate', 'fasting_glucose')
+
+REQUIRED_COLUMNS = (('patient_id', 'gender', 'location', 'physical_activity', 'diet_quality') +
+                    NUMERIC_COLUMNS + BINARY_FEATURES)
+
+# Age groups used for imputation: pd.cut(age, bins=[0, 30, 50, 100])
+AGE_GROUP_EDGES = (0, 30, 50, 100)
+
+OUTLIER_COLUMNS = ('bmi', 'systolic_bp', 'diastolic_bp', 'fasting_glucose')
+OUTLIER_IQR_MULTIPLIER = 3
+
+VALID_RANGES = {
+    'age': (18, 100),
+    'bmi': (10, 60),
+    'systolic_bp': (70, 220),
+    'diastolic_bp': (40, 140),
+    'pulse_rate': (40, 150),
+}
+
+# pandas' default NA markers minus 'None', which is a physical_activity level
+NA_VALUES = ['', 'NA', 'N/A', 'NaN', 'nan', 'NULL', 'null', '#N/A', '-NaN', '-nan']
+
+def _age_group(age):
+    """0/1/2 age group code (Young/Middle/Senior), -1 outside (0, 100]"""
+    age = np.asarray(age, dtype=np.float64)
+    codes = np.searchsorted(AGE_GROUP_EDGES[1:], age, side='left')
+    codes[~((age > AGE_GROUP_EDGES[0]) & (age <= AGE_GROUP_EDGES[-1]))] = -1
+    return codes
+
+def _between(values, low, high):
+    """low <= values <= high, False for missing values"""
+    values = np.asarray(values, dtype=np.float64)
+    return (values >= low) & (values <= high)
+
+class CleaningRules:
+    """Imputation medians and outlier bounds fitted once, applied per chunk"""
+
+    def __init__(self, glucose_medians, pulse_median, weight_medians, outlier_bounds):
+        # glucose_medians: 3 values by age group; weight_medians: (2, 3) by
+        # gender code (GENDER_ENCODING) and age group
+        self.glucose_medians = np.asarray(glucose_medians, dtype=np.float64)
+        self.pulse_median = float(pulse_median)
+        self.weight_medians = np.asarray(weight_medians, dtype=np.float64)
+        self.outlier_bounds = dict(outlier_bounds)
+
+    @classmethod
+    def fit(cls, reference):
+        """Fit the rules on a reference DataFrame, as the notebook does on the full dataset"""
+        reference = _coerce(reference)
+        age_group = _age_group(reference['age'])
+        gender = reference['gender'].map(GENDER_ENCODING).to_numpy(dtype=np.float64)
+
+        def median(values, mask):
+            values = np.asarray(values, dtype=np.float64)[mask]
+            return np.nanmedian(values) if np.any(~np.isnan(values)) else np.nan
+
+        glucose_medians = [median(reference['fasting_glucose'], age_group == g) for g in range(3)]
+        weight_medians = [[median(reference['weight_kg'], (gender == code) & (age_group == g))
+                           for g in range(3)]
+                          for code in sorted(GENDER_ENCODING.values())]
+        pulse_median = median(reference['pulse_rate'], np.ones(len(reference), dtype=bool))
+
+        rules = cls(glucose_medians, pulse_median, weight_medians, {})
+
+        # Outlier bounds are computed column by column on the rows that
+        # survived the previous column, like the notebook's loop
+        cleaned = rules.impute(reference)
+        for column in OUTLIER_COLUMNS:
+            q1, q3 = cleaned[column].quantile([0.25, 0.75])
+            iqr = q3 - q1
+            bounds = (q1 - OUTLIER_IQR_MULTIPLIER * iqr, q3 + OUTLIER_IQR_MULTIPLIER * iqr)
+            rules.outlier_bounds[column] = bounds
+            cleaned = cleaned[_between(cleaned[column], *bounds)]
+
+        return rules
+
+    @classmethod
+    def from_csv(cls, path=REFERENCE_PATH):
+        """Fit the rules on a reference CSV"""
+        return cls.fit(pd.read_csv(path, keep_default_na=False, na_values=NA_VALUES))
+
+    def impute(self, chunk):
+        """Fill missing glucose, pulse and weight, then recompute BMI"""
+        chunk = chunk.copy()
+        age_group = _age_group(chunk['age'])
+        grouped = age_group >= 0
+
+        glucose = chunk['fasting_glucose'].to_numpy(dtype=np.float64, copy=True)
+        fill = np.isnan(glucose) & grouped
+        glucose[fill] = self.glucose_medians[age_group[fill]]
+        chunk['fasting_glucose'] = glucose
+
+        chunk['pulse_rate'] = chunk['pulse_rate'].fillna(self.pulse_median)
+
+        weight = chunk['weight_kg'].to_numpy(dtype=np.float64, copy=True)
+        gender = chunk['gender'].map(GENDER_ENCODING).to_numpy(dtype=np.float64)
+        fill = np.isnan(weight) & grouped & ~np.isnan(gender)
+        weight[fill] = self.weight_medians[gender[fill].astype(np.int64), age_group[fill]]
+        chunk['weight_kg'] = weight
+
+        chunk['bmi'] = chunk['weight_kg'] / ((chunk['height_cm']/100) ** 2)
+        return chunk
+
+    def validate(self, chunk):
+        """
+        Boolean mask of rows to keep, plus rejected row counts by reason
+
+        Each rejected row is counted once, under the first check it fails.
+        """
+        checks = [
+            ('missing patient_id', chunk['patient_id'].notna().to_numpy()),
+            ('invalid gender', chunk['gender'].isin(list(GENDER_ENCODING)).to_numpy()),
+            ('invalid location', chunk['location'].isin(list(LOCATION_ENCODING)).to_numpy()),
+            # Missing lifestyle answers are allowed (the model was trained
+            # with them), misspelt ones are not
+            ('invalid physical_activity',
+             (chunk['physical_activity'].isna() | chunk['physical_activity'].isin(list(ACTIVITY_ENCODING))).to_numpy()),
+            ('invalid diet_quality',
+             (chunk['diet_quality'].isna() | chunk['diet_quality'].isin(list(DIET_ENCODING))).to_numpy()),
+            ('invalid yes/no field', chunk[list(BINARY_FEATURES)].isin([0, 1]).all(axis=1).to_numpy()),
+        ]
+        checks += [(f'{column} outlier', _between(chunk[column], *bounds))
+                   for column, bounds in self.outlier_bounds.items()]
+        checks += [(f'{column} out of range', _between(chunk[column], *bounds))
+                   for column, bounds in VALID_RANGES.items()]
+
+        keep = np.ones(len(chunk), dtype=bool)
+        rejected = Counter()
+        for reason, ok in checks:
+            failed = keep & ~ok
+            if failed.any():
+                rejected[reason] += int(failed.sum())
+                keep &= ok
+        return keep, rejected
+
+    def clean(self, chunk):
+        """Imputed rows that pass validation, plus rejected row counts by reason"""
+        chunk = self.impute(_coerce(chunk))
+        keep, rejected = self.validate(chunk)
+        return chunk[keep], rejected
+
+def _coerce(chunk):
+    """Numeric columns as floats (bad values become NaN); fails on missing columns"""
+    missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+    if missing:
+        raise ValueError(f'Input is missing required columns: {missing}')
+    chunk = chunk.copy()
+    for column in NUMERIC_COLUMNS + BINARY_FEATURES:
+        chunk[column] = pd.to_numeric(chunk[column], errors='coerce')
+    return chunk
+
+# ================================================================================
+# STREAMING
+# ================================================================================
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield DataFrames of at most chunksize rows from a CSV or Parquet file"""
+    if path.lower().endswith(('.parquet', '.pq')):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError('Reading Parquet files requires pyarrow (pip install pyarrow)')
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, dtype={'patient_id': str, 'chw_id': str},
+                               keep_default_na=False, na_values=NA_VALUES)
+
+def score_chunk(chunk, engine=None):
+    """Screening records for a cleaned chunk, scored by engine or the rule-based scorer"""
+    batch = engine.predict_batch(chunk) if engine is not None else predict_risk_batch(chunk)
+    records = chunk.reindex(columns=list(dict.fromkeys(PATIENT_COLUMNS + SCREENING_COLUMNS)))
+    records['risk_level'] = batch['risk_level']
+    records['risk_score'] = batch['risk_score']
+    records['model_version'] = engine.model_version if engine is not None else None
+    return records
+
+def ingest_file(path, db_path=DB_PATH, chunksize=DEFAULT_CHUNKSIZE, engine=None, rules=None,
+                chw_id=None, progress=None):
+    """
+    Stream a screening file into the database
+
+    Parameters:
+    -----------
+    path : CSV or Parquet file with the raw_screening_data.csv columns
+        (optional screening_date and chw_id columns are kept)
+    db_path : SQLite database to write to
+    chunksize : rows per chunk; each chunk is cleaned, scored and written
+        in one transaction
+    engine : RiskEngine to score with; None uses the rule-based scorer
+    rules : CleaningRules (default: fitted on data/raw_screening_data.csv)
+    chw_id : CHW ID for rows without a chw_id column value
+    progress : optional callable receiving the running totals dict after
+        every chunk
+
+    Returns:
+    --------
+    dict with rows_read, rows_written, rows_rejected, rejected (Counter of
+    reasons), seconds and rows_per_second
+    """
+    rules = rules or CleaningRules.from_csv()
+    totals = {'rows_read': 0, 'rows_written': 0, 'rows_rejected': 0, 'rejected': Counter(),
+              'seconds': 0.0, 'rows_per_second': 0.0}
+    start = time.perf_counter()
+
+    for chunk in read_chunks(path, chunksize):
+        cleaned, rejected = rules.clean(chunk)
+        if len(cleaned):
+            records = score_chunk(cleaned, engine)
+            if chw_id is not None:
+                records['chw_id'] = records['chw_id'].fillna(chw_id)
+            save_screenings(records, db_path=db_path)
+
+        totals['rows_read'] += len(chunk)
+        totals['rows_written'] += len(cleaned)
+        totals['rows_rejected'] += len(chunk) - len(cleaned)
+        totals['rejected'].update(rejected)
+        totals['seconds'] = time.perf_counter() - start
+        totals['rows_per_second'] = totals['rows_read'] / max(totals['seconds'], 1e-9)
+        if progress is not None:
+            progress(totals)
+
+    return totals
+
+def print_progress(totals, file=sys.stderr):
+    """One-line running summary for the command line"""
+    print(f"\r{totals['rows_read']:>12,} read  {totals['rows_written']:>12,} written  "
+          f"{totals['rows_rejected']:>10,} rejected  {totals['rows_per_second']:>10,.0f} rows/s",
+          end='', file=file, flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Stream a screening CSV/Parquet file into the WellWatch database')
+    parser.add_argument('path', help='CSV or Parquet file shaped like data/raw_screening_data.csv')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database path')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE, help='Rows per chunk')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory with the model artifacts')
+    parser.add_argument('--rule-based', action='store_true', help='Score with the rule-based scorer instead of the model')
+    parser.add_argument('--reference', default=REFERENCE_PATH,
+                        help='CSV the imputation medians and outlier bounds are fitted on')
+    parser.add_argument('--chw-id', help='CHW ID for rows without one')
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.path):
+        parser.error(f'No such file: {args.path}')
+
+    engine = None if args.rule_based else RiskEngine.load(args.model_dir)
+    rules = CleaningRules.from_csv(args.reference)
+
+    totals = ingest_file(args.path, db_path=args.db, chunksize=args.chunksize, engine=engine,
+                         rules=rules, chw_id=args.chw_id, progress=print_progress)
+
+    print(file=sys.stderr)
+    print(f"Ingested {totals['rows_written']:,} of {totals['rows_read']:,} screenings "
+          f"in {totals['seconds']:.1f}s ({totals['rows_per_second']:,.0f} rows/s)")
+    for reason, count in totals['rejected'].most_common():
+        print(f'  rejected {count:,}: {reason}')
+
+if __name__ == '__main__':
+    main()
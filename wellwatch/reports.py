@@ -0,0 +1,420 @@
+"""
+Batch PDF health reports
+
+The notebook's generate_health_report_pdf() lays out a whole FPDF document
+for every patient. ReportTemplate draws the static part of the page once
+(branding, section headings and rules, field labels, footer) and keeps the
+resulting PDF content stream; each report is that stream plus the
+per-patient values written at slot positions recorded while the template
+was drawn. Pages are self-contained content streams, so process-pool
+workers render them independently and the coordinator streams them into a
+ZIP (one PDF per patient) or a single multi-page PDF.
+
+Usage:
+    python -m wellwatch.reports camp_reports.zip --start-date 2026-10-01 --chw CHW001
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import re
+import sys
+import time
+import zipfile
+from datetime import datetime
+from functools import lru_cache
+
+import numpy as np
+from fpdf import FPDF
+
+from wellwatch.features import compute_bmi
+from wellwatch.scoring import RISK_LEVELS, decode_recommendations, recommendation_codes
+from wellwatch.storage import DB_PATH, SCREENING_INPUT_COLUMNS, close_databases, get_database, screening_filters
+
+DEFAULT_CHUNK_SIZE = 250
+
+# Registered in this order in every document, so the /F<n> font references
+# in a rendered page stream are valid in whichever document it ends up in
+REPORT_FONTS = (('Arial', 'B'), ('Arial', ''), ('Arial', 'I'))
+
+RISK_COLORS = {
+    'Low': (46, 204, 113),     # Green
+    'Medium': (243, 156, 18),  # Orange
+    'High': (231, 76, 60),     # Red
+}
+UNKNOWN_RISK_COLOR = (149, 165, 166)  # Grey, for screenings stored without a risk level
+
+REPORT_SQL = f'''
+SELECT s.id, s.patient_id, s.screening_date, COALESCE(s.age, p.age) AS age, p.gender,
+       COALESCE(s.location, p.location) AS location, s.bmi, s.systolic_bp, s.diastolic_bp,
+       s.fasting_glucose, s.risk_level, s.risk_score, s.chw_id,
+       {', '.join('s.' + column for column in SCREENING_INPUT_COLUMNS if column != 'age')}
+FROM screenings s
+LEFT JOIN patients p ON p.patient_id = s.patient_id
+'''
+
+# ================================================================================
+# TEMPLATE
+# ================================================================================
+
+def _prime_fonts(pdf):
+    for family, style in REPORT_FONTS:
+        pdf.set_font(family, style)
+
+class _Buffer:
+    """Append-only stand-in for FPDF.buffer (a str grown with +=, quadratic over thousands of pages)"""
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def __iadd__(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        return self
+
+    def __len__(self):
+        return self.size
+
+    def __str__(self):
+        return ''.join(self.parts)
+
+def _new_document():
+    pdf = FPDF()
+    pdf.buffer = _Buffer()
+    pdf.set_auto_page_break(False)
+    _prime_fonts(pdf)
+    return pdf
+
+def _start_page(pdf):
+    """add_page() from the default graphics state, so the page stream stands alone"""
+    pdf.font_family = ''
+    pdf.underline = 0
+    pdf.draw_color = '0 G'
+    pdf.fill_color = '0 g'
+    pdf.text_color = '0 g'
+    pdf.color_flag = 0
+    pdf.add_page()
+
+@lru_cache(maxsize=None)
+def _pdf_text(text):
+    """Text the core fonts can draw (Latin-1 only, so emoji and the space after them are dropped)"""
+    return ''.join(char for char in str(text) if ord(char) < 256).strip()
+
+def _value(value, suffix='', digits=None):
+    """Field text; numbers are rounded to digits decimals when given and shown without a trailing .0"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return 'N/A'
+    if digits is not None and isinstance(value, (int, float, np.integer, np.floating)):
+        value = round(float(value), digits)
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        value = int(value)
+    return f'{value}{suffix}'
+
+class ReportTemplate:
+    """Static report layout, drawn once and reused for every patient"""
+
+    FIELDS = (
+        ('Patient Information', (('patient_id', 'Patient ID:'), ('age', 'Age:'),
+                                 ('gender', 'Gender:'), ('location', 'Location:'))),
+        ('Vital Signs & Measurements', (('bmi', 'BMI:'), ('blood_pressure', 'Blood Pressure:'),
+                                        ('fasting_glucose', 'Fasting Glucose:'),
+                                        ('pulse_rate', 'Pulse Rate:'))),
+    )
+
+    def __init__(self, generated_at=None):
+        self.generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.slots = {}
+
+        pdf = _new_document()
+        _start_page(pdf)
+        start = len(pdf.pages[1])
+        self._draw(pdf)
+        # q/Q keeps the static part's font and colours from leaking into the page
+        self.stream = 'q\n' + pdf.pages[1][start:] + 'Q\n'
+
+    def _heading(self, pdf, title):
+        pdf.set_font('Arial', 'B', 14)
+        pdf.cell(0, 10, title, ln=True)
+        pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+        pdf.ln(2)
+
+    def _draw(self, pdf):
+        # Header
+        pdf.set_font('Arial', 'B', 20)
+        pdf.cell(0, 10, 'WellWatch India', ln=True, align='C')
+        pdf.set_font('Arial', '', 12)
+        pdf.cell(0, 10, 'Chronic Disease Risk Assessment Report', ln=True, align='C')
+        pdf.ln(5)
+
+        # Report date (one per batch)
+        pdf.set_font('Arial', '', 10)
+        pdf.cell(0, 10, f'Report Generated: {self.generated_at}', ln=True, align='R')
+        pdf.ln(5)
+
+        # Labelled fields; values are filled in per patient
+        for title, fields in self.FIELDS:
+            self._heading(pdf, title)
+            pdf.set_font('Arial', '', 11)
+            for name, label in fields:
+                pdf.cell(60, 8, label, 0)
+                self.slots[name] = (pdf.get_x(), pdf.get_y())
+                pdf.ln(8)
+            pdf.ln(5)
+
+        # Risk banner and score
+        self._heading(pdf, 'Risk Assessment Result')
+        self.slots['risk'] = (pdf.get_x(), pdf.get_y())
+        pdf.ln(12 + 8 + 5)
+
+        # Recommendations list
+        self._heading(pdf, 'Recommendations')
+        self.slots['recommendations'] = (pdf.get_x(), pdf.get_y())
+
+        # Footer
+        pdf.set_y(-30)
+        pdf.set_font('Arial', 'I', 9)
+        pdf.cell(0, 10, 'This report is generated by WellWatch India AI system.', ln=True, align='C')
+        pdf.cell(0, 10, 'Please consult a healthcare professional for detailed medical advice.', ln=True, align='C')
+
+    def _field(self, pdf, name, text):
+        x, y = self.slots[name]
+        pdf.set_xy(x, y)
+        pdf.cell(0, 8, _pdf_text(text))
+
+    def render(self, pdf, record):
+        """Add one patient's report page to pdf and return its content stream"""
+        _start_page(pdf)
+        page = pdf.page
+        pdf.pages[page] += self.stream
+
+        pdf.set_font('Arial', '', 11)
+        self._field(pdf, 'patient_id', _value(record.get('patient_id')))
+        self._field(pdf, 'age', _value(record.get('age'), ' years'))
+        self._field(pdf, 'gender', _value(record.get('gender')))
+        self._field(pdf, 'location', _value(record.get('location')))
+
+        bmi = record.get('bmi')
+        if bmi is None:
+            bmi = compute_bmi({key: [record.get(key, np.nan)] for key in ('weight_kg', 'height_cm')})[0]
+        self._field(pdf, 'bmi', 'N/A' if np.isnan(bmi) else f'{bmi:.1f} kg/m²')
+        self._field(pdf, 'blood_pressure', f"{_value(record.get('systolic_bp'), digits=0)}/"
+                                           f"{_value(record.get('diastolic_bp'), digits=0)} mmHg")
+        self._field(pdf, 'fasting_glucose', _value(record.get('fasting_glucose'), ' mg/dL', digits=1))
+        self._field(pdf, 'pulse_rate', _value(record.get('pulse_rate'), ' bpm', digits=0))
+
+        risk_level = record.get('risk_level')
+        x, y = self.slots['risk']
+        pdf.set_xy(x, y)
+        if risk_level is None:
+            risk_level = 'Unknown'
+            pdf.set_fill_color(*UNKNOWN_RISK_COLOR)
+        else:
+            pdf.set_fill_color(*RISK_COLORS.get(risk_level, RISK_COLORS['High']))
+        pdf.set_font('Arial', 'B', 16)
+        pdf.cell(0, 12, f'RISK LEVEL: {risk_level.upper()}', ln=True, align='C', fill=True)
+        pdf.set_font('Arial', '', 11)
+        pdf.cell(0, 8, f"Risk Score: {_value(record.get('risk_score'), '/100')}", ln=True, align='C')
+
+        x, y = self.slots['recommendations']
+        pdf.set_xy(x, y)
+        for i, rec in enumerate(record.get('recommendations') or (), 1):
+            pdf.cell(10, 7, f'{i}.', 0)
+            pdf.multi_cell(0, 7, _pdf_text(rec))
+
+        return pdf.pages[page]
+
+# ================================================================================
+# DOCUMENTS
+# ================================================================================
+
+def assemble_pdf(streams):
+    """PDF bytes for rendered page streams, one page each"""
+    pdf = _new_document()
+    for stream in streams:
+        pdf.add_page()
+        pdf.pages[pdf.page] = stream
+    return str(pdf.output(dest='S')).encode('latin-1')
+
+def report_pdf(patient_data, prediction_result, template=None):
+    """
+    PDF bytes of a single patient's report
+
+    Same content as the notebook's generate_health_report_pdf(); pass a
+    shared ReportTemplate when producing many.
+    """
+    template = template or ReportTemplate()
+    stream = template.render(_new_document(), {**patient_data, **prediction_result})
+    return assemble_pdf([stream])
+
+def report_filename(record, index):
+    """ZIP member name for a report: sequence number plus a filesystem-safe patient id"""
+    patient_id = re.sub(r'[^A-Za-z0-9_-]+', '_', str(record.get('patient_id') or 'patient'))
+    return f'{index:06d}_{patient_id}.pdf'
+
+# ================================================================================
+# WORKERS
+# ================================================================================
+
+_template = None
+
+def _init_worker(generated_at):
+    """Pool initializer: draw the static template once per worker process"""
+    global _template
+    _template = ReportTemplate(generated_at)
+
+def render_chunk(records, start, single_files, template=None):
+    """
+    Render a chunk of reports
+
+    Returns (name, PDF bytes) pairs when single_files is set, otherwise the
+    raw page streams for assemble_pdf().
+    """
+    template = template or _template
+    pdf = _new_document()
+    streams = [template.render(pdf, record) for record in records]
+    if not single_files:
+        return streams
+    return [(report_filename(record, start + i), assemble_pdf([stream]))
+            for i, (record, stream) in enumerate(zip(records, streams))]
+
+def _render_chunk(args):
+    return render_chunk(*args)
+
+# ================================================================================
+# BATCH GENERATION
+# ================================================================================
+
+def screening_reports(db_path=DB_PATH, chunk_size=DEFAULT_CHUNK_SIZE, **filters):
+    """
+    Report records for stored screenings, oldest first
+
+    filters are those of storage.screening_filters(). Recommendations are
+    rebuilt from the stored inputs and risk level, in one vectorized pass
+    per chunk.
+    """
+    where, params = screening_filters(**filters)
+    db = get_database(db_path)
+    last_id = 0
+    while True:
+        clause = f'{where} AND s.id > ?' if where else 'WHERE s.id > ?'
+        frame = db.read_frame(f'{REPORT_SQL} {clause} ORDER BY s.id LIMIT ?',
+                              (*params, last_id, chunk_size))
+        if frame.empty:
+            return
+        last_id = int(frame['id'].iloc[-1])
+
+        risk_code = frame['risk_level'].map({level: i for i, level in enumerate(RISK_LEVELS)})
+        codes = recommendation_codes(frame, risk_code.fillna(0).to_numpy(dtype=np.int64), compute_bmi(frame))
+        frame['recommendations'] = [decode_recommendations(code) for code in codes]
+        yield from frame.replace({np.nan: None}).to_dict('records')
+
+def _chunks(records, size):
+    records = iter(records)
+    while chunk := list(itertools.islice(records, size)):
+        yield chunk
+
+def generate_reports(records, out_path, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     generated_at=None, progress=None):
+    """
+    Render many reports into a ZIP or a single multi-page PDF
+
+    Parameters:
+    -----------
+    records : iterable of dicts with patient fields plus risk_level,
+        risk_score and recommendations (e.g. from screening_reports())
+    out_path : '.zip' for one PDF per patient, '.pdf' for one document
+    workers : worker processes (default: all cores); 1 renders in-process
+    chunk_size : reports per work unit
+    generated_at : 'Report Generated' timestamp shared by the batch
+    progress : optional callable receiving the running totals dict after
+        every chunk
+
+    Returns:
+    --------
+    dict with reports, bytes, seconds and reports_per_second
+    """
+    single_files = out_path.lower().endswith('.zip')
+    if not single_files and not out_path.lower().endswith('.pdf'):
+        raise ValueError('out_path must end in .zip or .pdf')
+    workers = workers or os.cpu_count() or 1
+    generated_at = generated_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    totals = {'reports': 0, 'bytes': 0, 'seconds': 0.0, 'reports_per_second': 0.0}
+    start = time.perf_counter()
+    work = ((chunk, i * chunk_size, single_files) for i, chunk in enumerate(_chunks(records, chunk_size)))
+
+    os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+    streams = []
+    archive = zipfile.ZipFile(out_path, 'w', zipfile.ZIP_STORED) if single_files else None
+
+    def record(rendered):
+        if single_files:
+            # Page content is already deflated by FPDF
+            for name, data in rendered:
+                archive.writestr(name, data)
+                totals['bytes'] += len(data)
+        else:
+            streams.extend(rendered)
+        totals['reports'] += len(rendered)
+        totals['seconds'] = time.perf_counter() - start
+        totals['reports_per_second'] = totals['reports'] / max(totals['seconds'], 1e-9)
+        if progress is not None:
+            progress(totals)
+
+    try:
+        if workers == 1:
+            template = ReportTemplate(generated_at)
+            for chunk, offset, single in work:
+                record(render_chunk(chunk, offset, single, template))
+        else:
+            # Spawned like the re-scoring pool; imap keeps the output in input order
+            context = multiprocessing.get_context('spawn')
+            with context.Pool(workers, initializer=_init_worker, initargs=(generated_at,)) as pool:
+                for rendered in pool.imap(_render_chunk, work):
+                    record(rendered)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    if not single_files:
+        data = assemble_pdf(streams)
+        with open(out_path, 'wb') as f:
+            f.write(data)
+        totals['bytes'] = len(data)
+
+    totals['seconds'] = time.perf_counter() - start
+    totals['reports_per_second'] = totals['reports'] / max(totals['seconds'], 1e-9)
+    return totals
+
+def print_progress(totals, file=sys.stderr):
+    """One-line running summary for the command line"""
+    print(f"\r{totals['reports']:>10,} reports  {totals['reports_per_second']:>8,.0f} reports/s",
+          end='', file=file, flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate PDF health reports for stored screenings')
+    parser.add_argument('out', help='Output .zip (one PDF per patient) or .pdf (one document)')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database path')
+    parser.add_argument('--start-date', help='First screening date (inclusive)')
+    parser.add_argument('--end-date', help='Last screening date (inclusive)')
+    parser.add_argument('--chw', action='append', dest='chw_ids', help='CHW id (repeatable)')
+    parser.add_argument('--risk', action='append', dest='risk_levels', choices=RISK_LEVELS,
+                        help='Risk level (repeatable)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Reports per work unit')
+    args = parser.parse_args(argv)
+
+    records = screening_reports(args.db, start_date=args.start_date, end_date=args.end_date,
+                                chw_ids=args.chw_ids, risk_levels=args.risk_levels)
+    totals = generate_reports(records, args.out, workers=args.workers, chunk_size=args.chunk_size,
+                              progress=print_progress)
+    close_databases()
+
+    print(file=sys.stderr)
+    print(f"Wrote {totals['reports']:,} reports to {args.out} ({totals['bytes'] / 1e6:.1f} MB) "
+          f"in {totals['seconds']:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+"""
+Parallel re-scoring of historical screenings
+
+After a model update every stored screening can be re-scored with the new
+model. The screenings table is split into id-range shards that a process
+pool scores independently: each worker loads the RiskEngine once, reads a
+shard with one query, scores it in a single predict_batch() call and
+writes the new risk levels back with executemany(), moving the open
+follow-ups of its screenings to their new due dates. The shard's checkpoint
+row is written in the same transaction as its results, so an interrupted
+run resumes exactly where it stopped. The dashboard rollups are rebuilt
+after the run's last shard, and the rebuild is recorded in rescore_runs in
+the same transaction, so a resumed run redoes it until it has committed.
+
+Screenings saved before their model inputs were stored (migration 4)
+cannot be re-scored and are counted as skipped.
+
+Usage:
+    python -m wellwatch.rescore --workers 8 --shard-size 50000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from wellwatch.inference import MODEL_DIR, RiskEngine, load_metadata
+from wellwatch.storage import (DB_PATH, RESCHEDULE_FOLLOW_UPS_SQL, SCORES_VERSION, SCREENING_INPUT_COLUMNS,
+                               bump_version, close_databases, get_database, replace_rollups)
+
+DEFAULT_SHARD_SIZE = 50_000
+
+SHARD_SQL = f'''
+SELECT s.id, p.gender, COALESCE(s.location, p.location) AS location,
+       s.systolic_bp, s.diastolic_bp, s.fasting_glucose, s.bmi,
+       {', '.join('s.' + column for column in SCREENING_INPUT_COLUMNS)}
+FROM screenings s
+LEFT JOIN patients p ON p.patient_id = s.patient_id
+WHERE s.id BETWEEN ? AND ?
+'''
+
+UPDATE_SQL = 'UPDATE screenings SET risk_level = ?, risk_score = ?, model_version = ? WHERE id = ?'
+
+RESCHEDULE_SQL = RESCHEDULE_FOLLOW_UPS_SQL.format(where='s.id BETWEEN ? AND ?')
+
+CHECKPOINT_SQL = '''
+INSERT INTO rescore_checkpoints (run_id, shard_start, shard_end, rows_scored, rows_skipped)
+VALUES (?, ?, ?, ?, ?)
+'''
+
+ROLLUPS_REBUILT_SQL = '''
+INSERT INTO rescore_runs (run_id, rollups_rebuilt_at) VALUES (?, CURRENT_TIMESTAMP)
+ON CONFLICT (run_id) DO UPDATE SET rollups_rebuilt_at = excluded.rollups_rebuilt_at
+'''
+
+# ================================================================================
+# WORKER
+# ================================================================================
+
+_engine = None
+_db_path = None
+
+def _init_worker(model_dir, db_path):
+    """Pool initializer: load the model once per worker process"""
+    global _engine, _db_path
+    _engine = RiskEngine.load(model_dir)
+    _db_path = db_path
+
+def rescore_shard(shard, run_id, engine=None, db_path=None):
+    """
+    Re-score screenings with shard_start <= id <= shard_end
+
+    Returns (shard_start, shard_end, rows_scored, rows_skipped).
+    """
+    engine = engine or _engine
+    db_path = db_path or _db_path
+    shard_start, shard_end = shard
+    db = get_database(db_path)
+
+    frame = db.read_frame(SHARD_SQL, (shard_start, shard_end))
+    # Rows without stored inputs (age is always recorded with them) are left as they are
+    scorable = frame['age'].notna() & frame['smoking'].notna()
+    frame = frame[scorable]
+
+    updates = []
+    if len(frame):
+        batch = engine.predict_batch(frame)
+        updates = zip(batch['risk_level'], batch['risk_score'],
+                      [engine.model_version] * len(frame), frame['id'])
+
+    with db.transaction() as conn:
+        conn.executemany(UPDATE_SQL, updates)
+        conn.execute(RESCHEDULE_SQL, (shard_start, shard_end))
+        bump_version(conn, 'screenings')
+        bump_version(conn, SCORES_VERSION)
+        conn.execute(CHECKPOINT_SQL, (run_id, shard_start, shard_end, len(frame),
+                                      int((~scorable).sum())))
+    return shard_start, shard_end, len(frame), int((~scorable).sum())
+
+def _rescore_shard(args):
+    return rescore_shard(*args)
+
+# ================================================================================
+# COORDINATOR
+# ================================================================================
+
+def plan_shards(db_path=DB_PATH, shard_size=DEFAULT_SHARD_SIZE):
+    """Inclusive (start, end) id ranges covering the screenings table"""
+    low, high = get_database(db_path).query('SELECT MIN(id), MAX(id) FROM screenings')[0]
+    if low is None:
+        return []
+    return [(start, min(start + shard_size - 1, high)) for start in range(low, high + 1, shard_size)]
+
+def completed_shards(run_id, db_path=DB_PATH):
+    """Shard start ids already checkpointed for run_id"""
+    rows = get_database(db_path).query('SELECT shard_start FROM rescore_checkpoints WHERE run_id = ?',
+                                       (run_id,))
+    return {row[0] for row in rows}
+
+def rollups_rebuilt(run_id, db_path=DB_PATH):
+    """Whether the rollups were rebuilt after run_id's last completed shard"""
+    rows = get_database(db_path).query(
+        'SELECT 1 FROM rescore_runs WHERE run_id = ? AND rollups_rebuilt_at IS NOT NULL', (run_id,))
+    return bool(rows)
+
+def rescore(db_path=DB_PATH, model_dir=MODEL_DIR, workers=None, shard_size=DEFAULT_SHARD_SIZE,
+            run_id=None, restart=False, progress=None):
+    """
+    Re-score all stored screenings with the model in model_dir
+
+    Parameters:
+    -----------
+    db_path : SQLite database to update in place
+    model_dir : directory with the model artifacts
+    workers : worker processes (default: all cores); 1 scores in-process
+    shard_size : ids per shard; a shard is the unit of work and of resume
+    run_id : checkpoint key (default: 'model-<model_version>'); re-running
+        with the same run_id skips shards that already completed
+    restart : forget this run_id's checkpoints and score everything again
+    progress : optional callable receiving the running totals dict after
+        every shard
+
+    Returns:
+    --------
+    dict with shards, shards_done, rows_scored, rows_skipped, seconds and
+    rows_per_second (for this invocation)
+    """
+    workers = workers or os.cpu_count() or 1
+    run_id = run_id or f"model-{load_metadata(model_dir).get('model_version', 'unknown')}"
+
+    if restart:
+        with get_database(db_path).transaction() as conn:
+            conn.execute('DELETE FROM rescore_checkpoints WHERE run_id = ?', (run_id,))
+
+    done = completed_shards(run_id, db_path)
+    shards = [shard for shard in plan_shards(db_path, shard_size) if shard[0] not in done]
+    if shards:
+        # The rollups go stale again with the first new shard
+        with get_database(db_path).transaction() as conn:
+            conn.execute('UPDATE rescore_runs SET rollups_rebuilt_at = NULL WHERE run_id = ?', (run_id,))
+
+    totals = {'run_id': run_id, 'shards': len(shards) + len(done), 'shards_done': len(done),
+              'rows_scored': 0, 'rows_skipped': 0, 'seconds': 0.0, 'rows_per_second': 0.0}
+    start = time.perf_counter()
+
+    def record(result):
+        totals['shards_done'] += 1
+        totals['rows_scored'] += result[2]
+        totals['rows_skipped'] += result[3]
+        totals['seconds'] = time.perf_counter() - start
+        totals['rows_per_second'] = totals['rows_scored'] / max(totals['seconds'], 1e-9)
+        if progress is not None:
+            progress(totals)
+
+    if workers == 1 or len(shards) <= 1:
+        engine = RiskEngine.load(model_dir)
+        for shard in shards:
+            record(rescore_shard(shard, run_id, engine, db_path))
+    else:
+        # Fresh interpreters: forked children would inherit this process's
+        # SQLite connection and XGBoost thread pool
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(workers, initializer=_init_worker, initargs=(model_dir, db_path)) as pool:
+            for result in pool.imap_unordered(_rescore_shard, [(shard, run_id) for shard in shards]):
+                record(result)
+
+    if (shards or done) and not rollups_rebuilt(run_id, db_path):
+        # Risk levels changed underneath the dashboard rollups; also covers
+        # a previous invocation that stopped before its rebuild
+        with get_database(db_path).transaction() as conn:
+            replace_rollups(conn)
+            conn.execute(ROLLUPS_REBUILT_SQL, (run_id,))
+
+    return totals
+
+def print_progress(totals, file=sys.stderr):
+    """One-line running summary for the command line"""
+    print(f"\r{totals['shards_done']:>6,}/{totals['shards']:,} shards  "
+          f"{totals['rows_scored']:>12,} scored  {totals['rows_skipped']:>10,} skipped  "
+          f"{totals['rows_per_second']:>10,.0f} rows/s", end='', file=file, flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Re-score stored screenings with the current model')
+    parser.add_argument('--db', default=DB_PATH, help='SQLite database path')
+    parser.add_argument('--model-dir', default=MODEL_DIR, help='Directory with the model artifacts')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE, help='Screening ids per shard')
+    parser.add_argument('--run-id', help="Checkpoint key (default: 'model-<model_version>')")
+    parser.add_argument('--restart', action='store_true', help='Ignore existing checkpoints for this run')
+    args = parser.parse_args(argv)
+
+    totals = rescore(db_path=args.db, model_dir=args.model_dir, workers=args.workers,
+                     shard_size=args.shard_size, run_id=args.run_id, restart=args.restart,
+                     progress=print_progress)
+    close_databases()
+
+    print(file=sys.stderr)
+    print(f"Run {totals['run_id']}: re-scored {totals['rows_scored']:,} screenings "
+          f"({totals['rows_skipped']:,} skipped without stored inputs) in {totals['seconds']:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""
+Rule-based risk scoring
+
+predict_risk_simple() scores a single patient dict and is what the
+Streamlit screening form has always used. predict_risk_batch() computes the
+same scores for whole columns of screenings in one NumPy pass, so camp-day
+uploads do not have to loop over patients in Python.
+
+Recommendations come from the declarative rule table in
+recommendation_rules.json, compiled once into RecommendationRules: scalar
+predicates for single patients and vectorized masks for batches, so both
+paths apply the same thresholds. The same table sets the follow-up
+intervals (FOLLOW_UP_DAYS), so the scheduled visit matches the advice.
+"""
+
+import json
+import operator
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# SCORING TABLES
+# ================================================================================
+
+RISK_LEVELS = ('Low', 'Medium', 'High')
+
+RISK_PROBABILITIES = {
+    'Low': {'Low': 0.75, 'Medium': 0.20, 'High': 0.05},
+    'Medium': {'Low': 0.25, 'Medium': 0.60, 'High': 0.15},
+    'High': {'Low': 0.10, 'Medium': 0.25, 'High': 0.65},
+}
+
+RULES_PATH = os.path.join(os.path.dirname(__file__), 'recommendation_rules.json')
+
+# 0-100 risk score range of each level: the rule scorer's cut-offs and the
+# gauge colours, so model-based scores are reported on the same scale
+RISK_SCORE_BANDS = {'Low': (0, 34), 'Medium': (35, 64), 'High': (65, 100)}
+
+# Score of certainty in each level, weighted by the model's probabilities
+RISK_LEVEL_SEVERITY = {'Low': 0, 'Medium': 50, 'High': 100}
+
+_RISK_LEVEL_ARRAY = np.array(RISK_LEVELS, dtype=object)
+_SEVERITY = np.array([RISK_LEVEL_SEVERITY[level] for level in RISK_LEVELS], dtype=np.float64)
+_BAND_LOW = np.array([RISK_SCORE_BANDS[level][0] for level in RISK_LEVELS])
+_BAND_HIGH = np.array([RISK_SCORE_BANDS[level][1] for level in RISK_LEVELS])
+_PROBABILITY_TABLE = np.array([[RISK_PROBABILITIES[level][k] for k in RISK_LEVELS]
+                               for level in RISK_LEVELS])
+
+# ================================================================================
+# RECOMMENDATION RULES
+# ================================================================================
+
+_COMPARISONS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq}
+
+class RecommendationRules:
+    """
+    Recommendation rule table compiled for single patients and batches
+
+    Rules apply in table order and at most max_recommendations are kept.
+    Recommendation codes are bitmasks with bit i set when rule i applies.
+    Conditions are (field, operator, value) with field a screening input,
+    'bmi' (computed) or 'risk_level' (assessed); a missing value never
+    satisfies a condition. Identical conditions shared by several rules
+    are evaluated once per batch. follow_up_days maps every risk level to
+    the days until the follow-up visit a screening schedules.
+    """
+
+    def __init__(self, rules, max_recommendations, follow_up_days):
+        if len(rules) > 64:
+            raise ValueError(f'At most 64 recommendation rules are supported, got {len(rules)}')
+        if set(follow_up_days) != set(RISK_LEVELS):
+            raise ValueError(f"follow_up_days needs exactly the risk levels {', '.join(RISK_LEVELS)}")
+        self.ids = tuple(rule['id'] for rule in rules)
+        self.texts = tuple(rule['text'] for rule in rules)
+        self.max_recommendations = int(max_recommendations)
+        self.follow_up_days = {level: int(follow_up_days[level]) for level in RISK_LEVELS}
+
+        conditions = {}  # (field, operator, value) -> position in self.conditions
+        self.rule_conditions = []
+        for rule in rules:
+            positions = []
+            for field, op, value in rule.get('when', ()):
+                if op != 'in' and op not in _COMPARISONS:
+                    raise ValueError(f"Rule {rule['id']!r}: unknown operator {op!r}")
+                value = tuple(value) if op == 'in' else value
+                if field == 'risk_level' and not (op in ('==', 'in') and
+                                                  set((value,) if op == '==' else value) <= set(RISK_LEVELS)):
+                    raise ValueError(f"Rule {rule['id']!r}: risk_level conditions must be == or in "
+                                     f"{', '.join(RISK_LEVELS)}")
+                positions.append(conditions.setdefault((field, op, value), len(conditions)))
+            self.rule_conditions.append(tuple(positions))
+        self.conditions = tuple(conditions)
+        self.predicates = tuple((field, self._predicate(op, value)) for field, op, value in self.conditions)
+        self.fields = tuple(dict.fromkeys(field for field, _, _ in self.conditions))
+
+        dtype = np.uint16 if len(rules) <= 16 else np.uint32 if len(rules) <= 32 else np.uint64
+        self.bits = [dtype(1 << bit) for bit in range(len(rules))]
+        self.code_dtype = dtype
+
+    @classmethod
+    def load(cls, path=RULES_PATH):
+        """Rules from a JSON rule table (see recommendation_rules.json)"""
+        with open(path, encoding='utf-8') as f:
+            table = json.load(f)
+        return cls(table['rules'], table['max_recommendations'], table['follow_up_days'])
+
+    @staticmethod
+    def _predicate(op, target):
+        """Compiled test of one patient's value; None and NaN never pass"""
+        if op == 'in':
+            return lambda value: value in target and value == value
+        compare = _COMPARISONS[op]
+        return lambda value: value is not None and value == value and compare(value, target)
+
+    def for_patient(self, patient_data, risk_level, bmi):
+        """Recommendation strings for one patient dict"""
+        derived = {'risk_level': risk_level, 'bmi': bmi}
+        held = [predicate(derived[field] if field in derived else patient_data.get(field))
+                for field, predicate in self.predicates]
+        recommendations = []
+        for text, positions in zip(self.texts, self.rule_conditions):
+            for i in positions:
+                if not held[i]:
+                    break
+            else:
+                recommendations.append(text)
+                if len(recommendations) == self.max_recommendations:
+                    break
+        return recommendations
+
+    @staticmethod
+    def _mask(condition, column):
+        """One condition over a column of values"""
+        _, op, target = condition
+        targets = target if op == 'in' else (target,)
+        if op in ('==', 'in') and any(isinstance(t, str) for t in targets):
+            # Hashed lookup: NumPy compares object arrays one Python call at a time
+            return pd.Series(column, copy=False).isin(targets).to_numpy()
+        values = np.asarray(column, dtype=np.float64)
+        if op == 'in':
+            return np.isin(values, targets)
+        return _COMPARISONS[op](values, target)
+
+    def codes(self, data, risk_code, bmi):
+        """
+        Recommendation bitmasks for a batch of screenings
+
+        risk_code holds the 0/1/2 RISK_LEVELS index of each patient,
+        whichever scorer produced it; bmi is the computed BMI column.
+        """
+        risk_code = np.asarray(risk_code)
+        masks = []
+        for condition in self.conditions:
+            field, op, target = condition
+            if field == 'risk_level':
+                levels = target if op == 'in' else (target,)
+                masks.append(np.isin(risk_code, [RISK_LEVELS.index(level) for level in levels]))
+            else:
+                masks.append(self._mask(condition, bmi if field == 'bmi' else data[field]))
+
+        codes = np.zeros(len(risk_code), dtype=self.code_dtype)
+        count = np.zeros(len(risk_code), dtype=np.int64)
+        for bit, positions in zip(self.bits, self.rule_conditions):
+            applies = count < self.max_recommendations
+            for i in positions:
+                applies &= masks[i]
+            codes |= applies * bit
+            count += applies
+        return codes
+
+    def decode(self, code):
+        """Recommendation strings of a bitmask, in rule order"""
+        code = int(code)
+        return tuple(text for bit, text in enumerate(self.texts) if code >> bit & 1)
+
+RECOMMENDATION_RULES = RecommendationRules.load()
+
+# Recommendation codes are bit positions in this tuple, in display order
+RECOMMENDATIONS = RECOMMENDATION_RULES.texts
+MAX_RECOMMENDATIONS = RECOMMENDATION_RULES.max_recommendations
+
+# Days from a screening to its follow-up visit
+FOLLOW_UP_DAYS = RECOMMENDATION_RULES.follow_up_days
+
+# ================================================================================
+# SINGLE PATIENT
+# ================================================================================
+
+def predict_risk_simple(patient_data):
+    """Simplified prediction for demo"""
+    # Calculate risk score based on key factors
+    risk_score = 0
+
+    # Age factor
+    if patient_data['age'] > 60:
+        risk_score += 20
+    elif patient_data['age'] > 45:
+        risk_score += 10
+
+    # BMI factor
+    bmi = patient_data['weight_kg'] / ((patient_data['height_cm']/100) ** 2)
+    if bmi > 30:
+        risk_score += 20
+    elif bmi > 25:
+        risk_score += 10
+
+    # BP factor
+    if patient_data['systolic_bp'] > 140:
+        risk_score += 25
+    elif patient_data['systolic_bp'] > 130:
+        risk_score += 12
+
+    # Glucose factor
+    if patient_data['fasting_glucose'] > 126:
+        risk_score += 25
+    elif patient_data['fasting_glucose'] > 100:
+        risk_score += 12
+
+    # Lifestyle factors
+    risk_score += patient_data['smoking'] * 10
+    risk_score += patient_data['alcohol'] * 5
+
+    if patient_data['physical_activity'] == 'None':
+        risk_score += 8
+
+    if patient_data['diet_quality'] == 'Poor':
+        risk_score += 8
+
+    # Family history
+    risk_score += patient_data['family_diabetes'] * 8
+    risk_score += patient_data['family_hypertension'] * 8
+    risk_score += patient_data['family_heart_disease'] * 10
+
+    # Symptoms
+    risk_score += patient_data['fatigue'] * 5
+    risk_score += patient_data['breathlessness'] * 8
+    risk_score += patient_data['chest_pain'] * 10
+
+    # Cap at 100
+    risk_score = min(risk_score, 100)
+
+    # Determine risk level
+    if risk_score < 35:
+        risk_level = 'Low'
+    elif risk_score < 65:
+        risk_level = 'Medium'
+    else:
+        risk_level = 'High'
+    prob = dict(RISK_PROBABILITIES[risk_level])
+
+    return {
+        'risk_level': risk_level,
+        'risk_score': int(risk_score),
+        'risk_probabilities': prob,
+        'recommendations': RECOMMENDATION_RULES.for_patient(patient_data, risk_level, bmi),
+        'bmi': round(bmi, 1)
+    }
+
+# ================================================================================
+# BATCH SCORING
+# ================================================================================
+
+def _points(values, *steps):
+    """Points for the highest (threshold, points) step that values exceed"""
+    points = np.zeros(values.shape, dtype=np.int64)
+    for threshold, step_points in steps:
+        points = np.where(values > threshold, step_points, points)
+    return points
+
+def predict_risk_batch(data):
+    """
+    Score many patients at once with the predict_risk_simple() rules
+
+    Parameters:
+    -----------
+    data : pandas.DataFrame or mapping of column name -> array-like
+        Screening columns with the same keys predict_risk_simple() reads
+
+    Returns:
+    --------
+    dict of NumPy arrays, one entry per patient:
+        - risk_level: 'Low', 'Medium' or 'High' (object array)
+        - risk_code: 0/1/2 index into RISK_LEVELS
+        - risk_score: 0-100 integer score
+        - risk_probabilities: (n, 3) array in RISK_LEVELS order
+        - recommendation_codes: bitmask over RECOMMENDATIONS, already
+          truncated to MAX_RECOMMENDATIONS like the scalar path
+        - bmi: unrounded BMI
+    """
+    age = np.asarray(data['age'])
+    systolic_bp = np.asarray(data['systolic_bp'])
+    fasting_glucose = np.asarray(data['fasting_glucose'])
+    smoking = np.asarray(data['smoking'])
+    no_activity = np.asarray(data['physical_activity']) == 'None'
+    poor_diet = np.asarray(data['diet_quality']) == 'Poor'
+
+    bmi = np.asarray(data['weight_kg']) / ((np.asarray(data['height_cm'])/100) ** 2)
+
+    risk_score = (
+        _points(age, (45, 10), (60, 20)) +
+        _points(bmi, (25, 10), (30, 20)) +
+        _points(systolic_bp, (130, 12), (140, 25)) +
+        _points(fasting_glucose, (100, 12), (126, 25)) +
+        smoking * 10 +
+        np.asarray(data['alcohol']) * 5 +
+        no_activity * 8 +
+        poor_diet * 8 +
+        np.asarray(data['family_diabetes']) * 8 +
+        np.asarray(data['family_hypertension']) * 8 +
+        np.asarray(data['family_heart_disease']) * 10 +
+        np.asarray(data['fatigue']) * 5 +
+        np.asarray(data['breathlessness']) * 8 +
+        np.asarray(data['chest_pain']) * 10
+    )
+    risk_score = np.minimum(risk_score, 100)
+
+    risk_code = (risk_score >= 35).astype(np.int8) + (risk_score >= 65)
+
+    return {
+        'risk_level': _RISK_LEVEL_ARRAY[risk_code],
+        'risk_code': risk_code,
+        'risk_score': risk_score.astype(np.int64),
+        'risk_probabilities': _PROBABILITY_TABLE[risk_code],
+        'recommendation_codes': recommendation_codes(data, risk_code, bmi),
+        'bmi': bmi,
+    }
+
+def probability_risk_score(probabilities, risk_code):
+    """
+    0-100 risk scores of model predictions
+
+    The probability-weighted RISK_LEVEL_SEVERITY of (n, 3) class
+    probabilities in RISK_LEVELS order, kept within the RISK_SCORE_BANDS
+    range of each assessed level (risk_code), so a model score reads like
+    a rule score and the gauge agrees with the risk level.
+    """
+    risk_code = np.asarray(risk_code)
+    severity = np.rint(np.asarray(probabilities, dtype=np.float64) @ _SEVERITY)
+    return np.clip(severity, _BAND_LOW[risk_code], _BAND_HIGH[risk_code]).astype(np.int64)
+
+def recommendation_codes(data, risk_code, bmi):
+    """Recommendation bitmasks for a batch of screenings (RECOMMENDATION_RULES.codes())"""
+    return RECOMMENDATION_RULES.codes(data, risk_code, bmi)
+
+@lru_cache(maxsize=None)
+def decode_recommendations(code):
+    """Recommendation strings for a bitmask from predict_risk_batch()"""
+    return RECOMMENDATION_RULES.decode(code)
+
+def expand_batch_results(batch):
+    """Turn predict_risk_batch() output into predict_risk_simple()-style dicts"""
+    return [
+        {
+            'risk_level': RISK_LEVELS[code],
+            'risk_score': int(score),
+            'risk_probabilities': dict(RISK_PROBABILITIES[RISK_LEVELS[code]]),
+            'recommendations': list(decode_recommendations(rec_code)),
+            'bmi': round(float(bmi), 1)
+        }
+        for code, score, rec_code, bmi in zip(batch['risk_code'], batch['risk_score'],
+                                              batch['recommendation_codes'], batch['bmi'])
+    ]
@@ -0,0 +1,728 @@
+"""
+SQLite storage for patients, screenings and interventions
+
+Every process shares one connection per database file. The connection runs
+in WAL mode so dashboards can read while CHW submissions are written, and
+writes go through short explicit transactions guarded by a lock, with
+executemany() for batches instead of a commit per row.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from wellwatch.scoring import FOLLOW_UP_DAYS
+
+DB_PATH = 'data/wellwatch.db'
+
+# NumPy scalars coming out of DataFrames and scoring arrays
+sqlite3.register_adapter(np.int64, int)
+sqlite3.register_adapter(np.int32, int)
+sqlite3.register_adapter(np.int8, int)
+sqlite3.register_adapter(np.bool_, int)
+sqlite3.register_adapter(np.float32, float)
+sqlite3.register_adapter(pd.Timestamp, lambda ts: ts.strftime('%Y-%m-%d %H:%M:%S'))
+
+# ================================================================================
+# SCHEMA (same tables as initialize_database() in the notebook)
+# ================================================================================
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS patients (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    patient_id TEXT UNIQUE,
+    age INTEGER,
+    gender TEXT,
+    location TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS screenings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    patient_id TEXT,
+    screening_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    risk_level TEXT,
+    risk_score INTEGER,
+    systolic_bp REAL,
+    diastolic_bp REAL,
+    fasting_glucose REAL,
+    bmi REAL,
+    chw_id TEXT,
+    FOREIGN KEY (patient_id) REFERENCES patients(patient_id)
+);
+
+CREATE TABLE IF NOT EXISTS interventions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    patient_id TEXT,
+    screening_id INTEGER,
+    intervention_type TEXT,
+    intervention_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    status TEXT,
+    notes TEXT,
+    FOREIGN KEY (patient_id) REFERENCES patients(patient_id),
+    FOREIGN KEY (screening_id) REFERENCES screenings(id)
+);
+'''
+
+# Age as screened, so a patient's later visits do not move their earlier
+# screenings to another age group; screenings saved before migration 4
+# have no age of their own
+SCREENING_AGE_SQL = 'COALESCE(s.age, p.age)'
+
+# Dashboard dimensions of one screening; age_group uses the dashboard bands
+# over {age}. Screenings do not record gender, so it comes from patients
+ROLLUP_KEY_SQL = '''
+    date(s.screening_date) AS day,
+    COALESCE(s.location, p.location, 'Unknown') AS location,
+    CASE
+        WHEN {age} IS NULL THEN 'Unknown'
+        WHEN {age} <= 30 THEN '18-30'
+        WHEN {age} <= 45 THEN '31-45'
+        WHEN {age} <= 60 THEN '46-60'
+        ELSE '60+'
+    END AS age_group,
+    COALESCE(p.gender, 'Unknown') AS gender,
+    COALESCE(s.risk_level, 'Unknown') AS risk_level
+'''
+
+ROLLUP_GROUP_BY = 'GROUP BY 1, 2, 3, 4, 5'
+
+# Adds screenings from {source} (aliased s) into daily_screening_rollups,
+# with {age} the age expression of ROLLUP_KEY_SQL
+ROLLUP_UPSERT_SQL = '''
+INSERT INTO daily_screening_rollups
+SELECT ''' + ROLLUP_KEY_SQL + ''',
+       COUNT(*),
+       COALESCE(SUM(s.risk_score), 0),
+       COALESCE(SUM(s.bmi), 0), COUNT(s.bmi),
+       COALESCE(SUM(s.systolic_bp), 0), COUNT(s.systolic_bp),
+       COALESCE(SUM(s.fasting_glucose), 0), COUNT(s.fasting_glucose)
+FROM {source}
+LEFT JOIN patients p ON p.patient_id = s.patient_id
+{where}
+{group_by}
+ON CONFLICT (day, location, age_group, gender, risk_level) DO UPDATE SET
+    screenings = screenings + excluded.screenings,
+    sum_risk_score = sum_risk_score + excluded.sum_risk_score,
+    sum_bmi = sum_bmi + excluded.sum_bmi,
+    bmi_count = bmi_count + excluded.bmi_count,
+    sum_systolic_bp = sum_systolic_bp + excluded.sum_systolic_bp,
+    systolic_bp_count = systolic_bp_count + excluded.systolic_bp_count,
+    sum_fasting_glucose = sum_fasting_glucose + excluded.sum_fasting_glucose,
+    fasting_glucose_count = fasting_glucose_count + excluded.fasting_glucose_count
+'''
+
+# Folds screenings with id > ? into the rollups; run after every insert
+ROLLUP_NEW_SCREENINGS_SQL = ROLLUP_UPSERT_SQL.format(source='screenings s', where='WHERE s.id > ?',
+                                                     group_by=ROLLUP_GROUP_BY, age=SCREENING_AGE_SQL)
+
+def _follow_up_due_sql(follow_up_days):
+    """Follow-up visit date of a screening s by its risk level (Low when unknown)"""
+    return ("datetime(s.screening_date, '+' || CASE s.risk_level " +
+            ' '.join(f"WHEN '{level}' THEN {int(days)}" for level, days in follow_up_days.items()) +
+            f" ELSE {int(follow_up_days['Low'])} END || ' days')")
+
+FOLLOW_UP_DUE_SQL = _follow_up_due_sql(FOLLOW_UP_DAYS)
+
+# Schedules a follow-up, due on {due}, from each screening in {where}
+# (aliased s) that is its patient's latest; an older screening loaded later
+# schedules nothing
+SCHEDULE_FOLLOW_UPS_SQL = '''
+INSERT INTO interventions (patient_id, screening_id, intervention_type, intervention_date,
+                           status, notes, chw_id, due_date)
+SELECT s.patient_id, s.id, 'follow_up', s.screening_date, 'scheduled',
+       COALESCE(s.risk_level, 'Unknown') || ' risk follow-up', s.chw_id, {due}
+FROM screenings s
+{where}
+AND s.patient_id IS NOT NULL
+AND NOT EXISTS (
+    SELECT 1 FROM screenings later
+    WHERE later.patient_id = s.patient_id
+      AND (later.screening_date > s.screening_date
+           OR (later.screening_date = s.screening_date AND later.id > s.id))
+)
+'''
+
+# A newly scheduled follow-up replaces the patient's open ones: the visit
+# they were waiting for has happened. ?1 is the highest intervention id
+# before scheduling
+CLOSE_FOLLOW_UPS_SQL = '''
+UPDATE interventions SET status = 'completed', completed_at = CURRENT_TIMESTAMP
+WHERE status = 'scheduled' AND intervention_type = 'follow_up' AND id <= ?1
+  AND patient_id IN (SELECT patient_id FROM interventions WHERE id > ?1 AND intervention_type = 'follow_up')
+'''
+
+# Moves open follow-ups of the screenings matching {where} (aliased s) to
+# the due date of their current risk level, after re-scoring or a change
+# of FOLLOW_UP_DAYS
+RESCHEDULE_FOLLOW_UPS_SQL = '''
+UPDATE interventions
+SET due_date = ''' + FOLLOW_UP_DUE_SQL + ''',
+    notes = COALESCE(s.risk_level, 'Unknown') || ' risk follow-up'
+FROM screenings s
+WHERE s.id = interventions.screening_id AND {where}
+  AND interventions.status = 'scheduled' AND interventions.intervention_type = 'follow_up'
+'''
+
+# Schema changes after the notebook's initial tables; the index of each
+# entry + 1 is the PRAGMA user_version it brings the database to
+MIGRATIONS = [
+    # 1: location snapshot on screenings so filters do not need a join
+    [
+        'ALTER TABLE screenings ADD COLUMN location TEXT',
+        '''UPDATE screenings SET location = (
+               SELECT p.location FROM patients p WHERE p.patient_id = screenings.patient_id)''',
+    ],
+    # 2: indexes for the Admin Panel filters and patient history
+    [
+        # Date-range scans; covers counts and averages for dashboard/admin stats
+        '''CREATE INDEX IF NOT EXISTS idx_screenings_date_cover
+           ON screenings (screening_date, risk_level, location, chw_id, risk_score, bmi)''',
+        # Risk level / location filters within a date range; also covers stats
+        '''CREATE INDEX IF NOT EXISTS idx_screenings_risk_location_date
+           ON screenings (risk_level, location, screening_date, risk_score, bmi)''',
+        # One CHW's screenings
+        '''CREATE INDEX IF NOT EXISTS idx_screenings_chw_date
+           ON screenings (chw_id, screening_date)''',
+        # Patient history
+        '''CREATE INDEX IF NOT EXISTS idx_screenings_patient_date
+           ON screenings (patient_id, screening_date)''',
+        'ANALYZE',
+    ],
+    # 3: daily rollups for the Community Dashboard, backfilled from screenings
+    [
+        '''CREATE TABLE IF NOT EXISTS daily_screening_rollups (
+               day TEXT NOT NULL,
+               location TEXT NOT NULL,
+               age_group TEXT NOT NULL,
+               gender TEXT NOT NULL,
+               risk_level TEXT NOT NULL,
+               screenings INTEGER NOT NULL,
+               sum_risk_score REAL NOT NULL,
+               sum_bmi REAL NOT NULL,
+               bmi_count INTEGER NOT NULL,
+               sum_systolic_bp REAL NOT NULL,
+               systolic_bp_count INTEGER NOT NULL,
+               sum_fasting_glucose REAL NOT NULL,
+               fasting_glucose_count INTEGER NOT NULL,
+               PRIMARY KEY (day, location, age_group, gender, risk_level)
+           ) WITHOUT ROWID''',
+        # screenings.age arrives with migration 4
+        ROLLUP_UPSERT_SQL.format(source='screenings s', where='', group_by=ROLLUP_GROUP_BY, age='p.age'),
+    ],
+    # 4: model inputs as screened and the model version that scored them,
+    # so historical screenings can be re-scored after a model update
+    [f'ALTER TABLE screenings ADD COLUMN {column} {column_type}'
+     for column, column_type in (
+         ('age', 'INTEGER'), ('height_cm', 'REAL'), ('weight_kg', 'REAL'), ('pulse_rate', 'REAL'),
+         ('smoking', 'INTEGER'), ('alcohol', 'INTEGER'), ('physical_activity', 'TEXT'),
+         ('diet_quality', 'TEXT'), ('family_diabetes', 'INTEGER'), ('family_hypertension', 'INTEGER'),
+         ('family_heart_disease', 'INTEGER'), ('fatigue', 'INTEGER'), ('breathlessness', 'INTEGER'),
+         ('chest_pain', 'INTEGER'), ('frequent_urination', 'INTEGER'), ('blurred_vision', 'INTEGER'),
+         ('model_version', 'TEXT'),
+     )],
+    # 5: completed shards of re-scoring runs and their rollup rebuilds
+    # (wellwatch.rescore)
+    [
+        '''CREATE TABLE IF NOT EXISTS rescore_checkpoints (
+               run_id TEXT NOT NULL,
+               shard_start INTEGER NOT NULL,
+               shard_end INTEGER NOT NULL,
+               rows_scored INTEGER NOT NULL,
+               rows_skipped INTEGER NOT NULL,
+               completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               PRIMARY KEY (run_id, shard_start)
+           )''',
+        '''CREATE TABLE IF NOT EXISTS rescore_runs (
+               run_id TEXT PRIMARY KEY,
+               rollups_rebuilt_at TIMESTAMP
+           )''',
+    ],
+    # 6: durable outbox of records waiting to be synced (wellwatch.sync)
+    [
+        '''CREATE TABLE IF NOT EXISTS sync_outbox (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               record_type TEXT NOT NULL,
+               payload TEXT NOT NULL,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               batch_id TEXT
+           )''',
+        # Unbatched records in order (batch_id IS NULL) and a batch's records
+        'CREATE INDEX IF NOT EXISTS idx_sync_outbox_batch ON sync_outbox (batch_id, id)',
+        '''CREATE TABLE IF NOT EXISTS sync_batches (
+               batch_id TEXT PRIMARY KEY,
+               first_id INTEGER NOT NULL,
+               last_id INTEGER NOT NULL,
+               record_count INTEGER NOT NULL,
+               raw_bytes INTEGER NOT NULL,
+               payload BLOB,
+               created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               attempts INTEGER NOT NULL DEFAULT 0,
+               next_attempt_at TIMESTAMP,
+               last_error TEXT,
+               sent_at TIMESTAMP,
+               duration_ms REAL,
+               rejected_at TIMESTAMP
+           )''',
+        'CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT)',
+    ],
+    # 7: per-table change counters, so caches of query results can tell
+    # when their source rows changed without re-running the query
+    [
+        'CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL)',
+        "INSERT OR IGNORE INTO table_versions (name, version) VALUES ('screenings', 0)",
+    ],
+    # 8: follow-up scheduling (wellwatch.followup), backfilled with an open
+    # follow-up from each patient's latest screening. The intervals are
+    # fixed here: a migration must not change with the recommendation rules
+    [
+        'ALTER TABLE interventions ADD COLUMN chw_id TEXT',
+        'ALTER TABLE interventions ADD COLUMN due_date TIMESTAMP',
+        'ALTER TABLE interventions ADD COLUMN completed_at TIMESTAMP',
+        # Daily worklists: each CHW's open interventions in due-date order
+        '''CREATE INDEX IF NOT EXISTS idx_interventions_chw_status_due
+           ON interventions (chw_id, status, due_date)''',
+        # A patient's open follow-ups, closed when a new one is scheduled
+        '''CREATE INDEX IF NOT EXISTS idx_interventions_patient_status
+           ON interventions (patient_id, status)''',
+        SCHEDULE_FOLLOW_UPS_SQL.format(where='WHERE 1',
+                                       due=_follow_up_due_sql({'Low': 90, 'Medium': 14, 'High': 7})),
+        'ANALYZE interventions',
+    ],
+]
+
+PATIENT_COLUMNS = ('patient_id', 'age', 'gender', 'location')
+
+# Model inputs stored with each screening (migration 4)
+SCREENING_INPUT_COLUMNS = ('age', 'height_cm', 'weight_kg', 'pulse_rate', 'smoking', 'alcohol',
+                           'physical_activity', 'diet_quality', 'family_diabetes',
+                           'family_hypertension', 'family_heart_disease', 'fatigue',
+                           'breathlessness', 'chest_pain', 'frequent_urination', 'blurred_vision')
+
+SCREENING_COLUMNS = (('patient_id', 'screening_date', 'risk_level', 'risk_score', 'systolic_bp',
+                      'diastolic_bp', 'fasting_glucose', 'bmi', 'chw_id', 'location') +
+                     SCREENING_INPUT_COLUMNS + ('model_version',))
+
+UPSERT_PATIENT_SQL = '''
+INSERT INTO patients (patient_id, age, gender, location)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(patient_id) DO UPDATE SET
+    age = excluded.age,
+    gender = excluded.gender,
+    location = excluded.location
+'''
+
+INSERT_SCREENING_SQL = f'''
+INSERT INTO screenings ({', '.join(SCREENING_COLUMNS)})
+VALUES (?, COALESCE(?, CURRENT_TIMESTAMP), {', '.join('?' * (len(SCREENING_COLUMNS) - 2))})
+'''
+
+ENQUEUE_SYNC_SQL = 'INSERT INTO sync_outbox (record_type, payload) VALUES (?, ?)'
+
+BUMP_VERSION_SQL = '''
+INSERT INTO table_versions (name, version) VALUES (?, 1)
+ON CONFLICT(name) DO UPDATE SET version = version + 1
+'''
+
+# Change counter of stored risk levels, bumped by re-scoring as well as the
+# screenings counter: caches keyed on one patient's rows (patient history)
+# cannot see an in-place update otherwise
+SCORES_VERSION = 'screening_scores'
+
+# ================================================================================
+# CONNECTION POOL
+# ================================================================================
+
+class Database:
+    """One SQLite connection plus the lock that serializes its use"""
+
+    def __init__(self, db_path):
+        self.path = db_path
+        self.lock = threading.RLock()
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Autocommit mode: transactions are opened explicitly in transaction()
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None,
+                                    check_same_thread=False, cached_statements=256)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA busy_timeout=30000')
+        self.conn.executescript(SCHEMA)
+        migrate(self.conn)
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction; takes the database write lock up front"""
+        with self.lock:
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+
+    def query(self, sql, params=()):
+        """All rows of a read query"""
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def read_frame(self, sql, params=()):
+        """Read query result as a DataFrame"""
+        with self.lock:
+            return pd.read_sql_query(sql, self.conn, params=params)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def migrate(conn, target=None):
+    """Apply pending MIGRATIONS up to version target (default: latest)"""
+    target = len(MIGRATIONS) if target is None else target
+    for version, statements in enumerate(MIGRATIONS[:target], start=1):
+        if conn.execute('PRAGMA user_version').fetchone()[0] >= version:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Another process may have migrated while we waited for the lock
+            if conn.execute('PRAGMA user_version').fetchone()[0] < version:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f'PRAGMA user_version = {version}')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+def get_database(db_path=DB_PATH):
+    """Shared Database for db_path, opened once per process"""
+    key = (os.getpid(), os.path.abspath(db_path))
+    db = _databases.get(key)
+    if db is None:
+        with _databases_lock:
+            db = _databases.get(key)
+            if db is None:
+                db = _databases[key] = Database(db_path)
+    return db
+
+def close_databases():
+    """Close every pooled connection opened by this process"""
+    with _databases_lock:
+        for (pid, _), db in list(_databases.items()):
+            if pid == os.getpid():
+                db.close()
+        _databases.clear()
+
+# ================================================================================
+# WRITES
+# ================================================================================
+
+def _rows(records, columns):
+    """Parameter tuples for executemany from a DataFrame or iterable of dicts"""
+    if isinstance(records, pd.DataFrame):
+        frame = records.reindex(columns=list(columns))
+        frame = frame.astype(object).where(frame.notna(), None)
+        return frame.itertuples(index=False, name=None)
+    return (tuple(record.get(col) for col in columns) for record in records)
+
+def _last_screening_id(conn):
+    """Highest screening id so far (0 for an empty table)"""
+    return conn.execute('SELECT COALESCE(MAX(id), 0) FROM screenings').fetchone()[0]
+
+def bump_version(conn, table):
+    """
+    Increment a table's change counter; runs inside the caller's transaction
+
+    Every write to screenings calls this, including re-scoring updates and
+    the rollup rebuild that follows them, so readers that cache on
+    table_version() see a change as soon as it commits, whichever process
+    made it.
+    """
+    conn.execute(BUMP_VERSION_SQL, (table,))
+
+def schedule_follow_ups(conn, last_id):
+    """
+    Schedule follow-ups for the screenings with id > last_id; runs inside
+    the caller's transaction
+
+    Each patient's latest screening gets a follow-up due FOLLOW_UP_DAYS
+    after it, and the patient's open follow-ups it replaces are completed.
+    """
+    last_intervention_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM interventions').fetchone()[0]
+    conn.execute(SCHEDULE_FOLLOW_UPS_SQL.format(where='WHERE s.id > ?', due=FOLLOW_UP_DUE_SQL), (last_id,))
+    conn.execute(CLOSE_FOLLOW_UPS_SQL, (last_intervention_id,))
+
+def _insert_screening_rows(conn, rows):
+    """
+    Insert screening rows, add them to the daily rollups and schedule their
+    follow-ups, returns the row count
+
+    Must run inside transaction(): the rollup update and the scheduling
+    handle every row above the previous maximum id in set-based statements,
+    which is much cheaper than maintaining them row by row.
+    """
+    last_id = _last_screening_id(conn)
+    count = conn.executemany(INSERT_SCREENING_SQL, rows).rowcount
+    conn.execute(ROLLUP_NEW_SCREENINGS_SQL, (last_id,))
+    schedule_follow_ups(conn, last_id)
+    bump_version(conn, 'screenings')
+    return count
+
+def upsert_patients(patients, db_path=DB_PATH):
+    """Insert new patients and refresh demographics of known ones"""
+    with get_database(db_path).transaction() as conn:
+        conn.executemany(UPSERT_PATIENT_SQL, _rows(patients, PATIENT_COLUMNS))
+
+def insert_screenings(screenings, db_path=DB_PATH):
+    """Bulk insert screenings in a single transaction, returns the row count"""
+    with get_database(db_path).transaction() as conn:
+        return _insert_screening_rows(conn, _rows(screenings, SCREENING_COLUMNS))
+
+def save_screenings(records, db_path=DB_PATH):
+    """
+    Save a batch of screening records in one transaction
+
+    Parameters:
+    -----------
+    records : pandas.DataFrame or list of dicts
+        One row per screening with PATIENT_COLUMNS and SCREENING_COLUMNS keys
+        (screening_date may be omitted and defaults to now)
+
+    Returns:
+    --------
+    int : number of screenings inserted
+    """
+    if not isinstance(records, pd.DataFrame):
+        records = list(records)
+    with get_database(db_path).transaction() as conn:
+        conn.executemany(UPSERT_PATIENT_SQL, _rows(records, PATIENT_COLUMNS))
+        return _insert_screening_rows(conn, _rows(records, SCREENING_COLUMNS))
+
+def _json_default(value):
+    """json.dumps fallback for NumPy scalars and timestamps"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+def enqueue_sync(conn, record_type, record):
+    """Add a record to the sync outbox; runs inside the caller's transaction"""
+    conn.execute(ENQUEUE_SYNC_SQL, (record_type, json.dumps(record, default=_json_default)))
+
+def save_screening(patient_data, prediction_result, chw_id=None, queue_sync=False, db_path=DB_PATH):
+    """
+    Save one patient screening, returns the new screening id
+
+    With queue_sync=True the saved record is also added to the sync outbox
+    in the same transaction, so it reaches the server even if the app is
+    restarted before the next sync.
+    """
+    record = dict(patient_data)
+    record['risk_level'] = prediction_result['risk_level']
+    record['risk_score'] = prediction_result['risk_score']
+    record.setdefault('model_version', prediction_result.get('model_version'))
+    record.setdefault('chw_id', chw_id)
+    if record.get('bmi') is None:
+        record['bmi'] = patient_data['weight_kg'] / ((patient_data['height_cm']/100) ** 2)
+
+    with get_database(db_path).transaction() as conn:
+        conn.execute(UPSERT_PATIENT_SQL, next(_rows([record], PATIENT_COLUMNS)))
+        last_id = _last_screening_id(conn)
+        screening_id = conn.execute(INSERT_SCREENING_SQL, next(_rows([record], SCREENING_COLUMNS))).lastrowid
+        conn.execute(ROLLUP_NEW_SCREENINGS_SQL, (last_id,))
+        schedule_follow_ups(conn, last_id)
+        bump_version(conn, 'screenings')
+        if queue_sync:
+            record['screening_id'] = screening_id
+            record['screening_date'] = conn.execute(
+                'SELECT screening_date FROM screenings WHERE id = ?', (screening_id,)).fetchone()[0]
+            enqueue_sync(conn, 'screening', record)
+        return screening_id
+
+# ================================================================================
+# READS
+# ================================================================================
+
+SCREENING_LIST_COLUMNS = '''
+    s.id, s.patient_id, s.screening_date, p.age, p.gender, s.location,
+    s.risk_level, s.risk_score, s.bmi, s.systolic_bp, s.diastolic_bp,
+    s.fasting_glucose, s.chw_id
+'''
+
+def _timestamp(value):
+    """screening_date string for a date, datetime or timestamp string"""
+    return pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+
+def screening_filters(risk_levels=None, locations=None, start_date=None, end_date=None,
+                      chw_ids=None, alias='s'):
+    """
+    WHERE clause and parameters for the Admin Panel screening filters
+
+    Each filter is skipped when None. Lists become IN (...) lookups and the
+    date range a half-open range on screening_date, which is what the
+    indexes in MIGRATIONS are ordered for.
+    """
+    clauses, params = [], []
+
+    for column, values in (('risk_level', risk_levels), ('location', locations), ('chw_id', chw_ids)):
+        if values is None:
+            continue
+        values = list(values)
+        if not values:
+            clauses.append('0')
+            continue
+        clauses.append(f"{alias}.{column} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+
+    if start_date is not None:
+        clauses.append(f'{alias}.screening_date >= ?')
+        params.append(_timestamp(start_date))
+    if end_date is not None:
+        end = pd.Timestamp(end_date)
+        if end == end.normalize():
+            # A plain end date includes the whole day
+            clauses.append(f'{alias}.screening_date < ?')
+            params.append(_timestamp(end + pd.Timedelta(days=1)))
+        else:
+            clauses.append(f'{alias}.screening_date <= ?')
+            params.append(_timestamp(end))
+
+    where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    return where, params
+
+def screening_list_sql(limit=None, after=None, **filters):
+    """
+    Newest-first screening list query (SQL, params) for the given filters
+
+    after is the (screening_date, id) of the last row of the previous page:
+    the query continues from there through the same index range instead of
+    skipping OFFSET rows, so every page costs the same however deep it is.
+    """
+    where, params = screening_filters(**filters)
+    if after is not None:
+        where = (f'{where} AND ' if where else 'WHERE ') + '(s.screening_date, s.id) < (?, ?)'
+        params.extend(after)
+    sql = f'''
+    SELECT {SCREENING_LIST_COLUMNS}
+    FROM screenings s
+    LEFT JOIN patients p ON s.patient_id = p.patient_id
+    {where}
+    ORDER BY s.screening_date DESC, s.id DESC
+    '''
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(int(limit))
+    return sql, params
+
+def screening_stats_sql(**filters):
+    """Count / high-risk / average query (SQL, params) for the given filters"""
+    where, params = screening_filters(**filters)
+    sql = f'''
+    SELECT COUNT(*) AS total,
+           COALESCE(SUM(s.risk_level = 'High'), 0) AS high_risk,
+           AVG(s.risk_score) AS avg_risk_score,
+           AVG(s.bmi) AS avg_bmi
+    FROM screenings s
+    {where}
+    '''
+    return sql, params
+
+def table_version(table='screenings', db_path=DB_PATH):
+    """Change counter of a table, incremented by every committed write to it"""
+    rows = get_database(db_path).query('SELECT version FROM table_versions WHERE name = ?', (table,))
+    return rows[0][0] if rows else 0
+
+def fetch_screenings(limit=None, after=None, db_path=DB_PATH, **filters):
+    """Most recent screenings (optionally filtered, after a keyset cursor) joined with patient demographics"""
+    return get_database(db_path).read_frame(*screening_list_sql(limit, after, **filters))
+
+def screening_chw_ids(db_path=DB_PATH):
+    """Distinct CHW IDs with screenings (a skip-scan of idx_screenings_chw_date)"""
+    rows = get_database(db_path).query(
+        'SELECT DISTINCT chw_id FROM screenings WHERE chw_id IS NOT NULL ORDER BY chw_id')
+    return [row[0] for row in rows]
+
+def screening_stats(db_path=DB_PATH, **filters):
+    """Count, high-risk count and averages over the filtered screenings"""
+    total, high_risk, avg_risk_score, avg_bmi = get_database(db_path).query(*screening_stats_sql(**filters))[0]
+    return {
+        'total': total,
+        'high_risk': high_risk,
+        'avg_risk_score': avg_risk_score,
+        'avg_bmi': avg_bmi
+    }
+
+# ================================================================================
+# ROLLUPS
+# ================================================================================
+
+ROLLUP_DIMENSIONS = ('day', 'location', 'age_group', 'gender', 'risk_level')
+ROLLUP_MEASURES = ('screenings', 'sum_risk_score', 'sum_bmi', 'bmi_count', 'sum_systolic_bp',
+                   'systolic_bp_count', 'sum_fasting_glucose', 'fasting_glucose_count')
+
+def _rollup_days(start_date=None, end_date=None):
+    """WHERE clause and parameters for an inclusive day range (a primary key range)"""
+    clauses, params = [], []
+    if start_date is not None:
+        clauses.append('day >= ?')
+        params.append(pd.Timestamp(start_date).strftime('%Y-%m-%d'))
+    if end_date is not None:
+        clauses.append('day <= ?')
+        params.append(pd.Timestamp(end_date).strftime('%Y-%m-%d'))
+    where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    return where, params
+
+def fetch_rollups(start_date=None, end_date=None, db_path=DB_PATH):
+    """Daily rollup rows (one per day/location/age group/gender/risk level)"""
+    where, params = _rollup_days(start_date, end_date)
+    return get_database(db_path).read_frame(f'SELECT * FROM daily_screening_rollups {where}', params)
+
+def aggregate_rollups(group_by=(), start_date=None, end_date=None, db_path=DB_PATH):
+    """
+    ROLLUP_MEASURES summed per combination of group_by dimensions
+
+    The grouping runs in SQLite, so the result has a row per group however
+    many days the rollups cover (a single row with no group_by).
+
+    Parameters:
+    -----------
+    group_by : ROLLUP_DIMENSIONS to group on
+    start_date, end_date : optional inclusive day range
+    db_path : SQLite database to read
+
+    Returns:
+    --------
+    DataFrame with the group_by columns followed by ROLLUP_MEASURES
+    """
+    group_by = list(group_by)
+    unknown = set(group_by) - set(ROLLUP_DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown rollup dimensions: {', '.join(sorted(unknown))}")
+    where, params = _rollup_days(start_date, end_date)
+    sums = ', '.join(f'COALESCE(SUM({measure}), 0) AS {measure}' for measure in ROLLUP_MEASURES)
+    sql = f"SELECT {', '.join(group_by + [sums])} FROM daily_screening_rollups {where}"
+    if group_by:
+        sql += f" GROUP BY {', '.join(group_by)}"
+    return get_database(db_path).read_frame(sql, params)
+
+def replace_rollups(conn):
+    """Recompute daily_screening_rollups from scratch inside the caller's transaction"""
+    conn.execute('DELETE FROM daily_screening_rollups')
+    conn.execute(ROLLUP_UPSERT_SQL.format(source='screenings s', where='', group_by=ROLLUP_GROUP_BY,
+                                          age=SCREENING_AGE_SQL))
+    bump_version(conn, 'screenings')
+
+def rebuild_rollups(db_path=DB_PATH):
+    """Recompute daily_screening_rollups from scratch, e.g. after re-scoring"""
+    with get_database(db_path).transaction() as conn:
+        replace_rollups(conn)
@@ -0,0 +1,443 @@
+"""
+Offline sync queue
+
+Screenings captured on a CHW tablet are written to the sync_outbox table in
+the same transaction as the screening itself, so nothing waiting for a
+connection is lost on restart. SyncQueue seals outbox records into batches
+of a few hundred, stores each batch gzip-compressed as newline-delimited
+JSON under a stable batch ID, and sends batches oldest first to a sync
+target. A batch keeps its ID across retries, so the server can drop a
+batch it has already received and an interrupted sync simply resumes with
+the first unsent batch.
+
+Backpressure works in both directions: at most max_sealed batches are
+sealed ahead of the network, and a target that answers "busy" (HTTP 429 or
+503) pauses syncing for its Retry-After interval; other failures back off
+exponentially. A batch the server rejects for good (e.g. HTTP 400) is set
+aside as a dead letter, shown in the Admin Panel, instead of blocking the
+batches behind it; one rejected as too large (HTTP 413) is split in two.
+
+Usage:
+    python -m wellwatch.sync serve --port 8765          # local stand-in server
+    python -m wellwatch.sync push http://localhost:8765/sync
+"""
+
+import argparse
+import gzip
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from wellwatch.storage import DB_PATH, enqueue_sync, get_database
+
+DEFAULT_BATCH_SIZE = 500
+MAX_BATCH_BYTES = 512 * 1024  # uncompressed
+MAX_SEALED_BATCHES = 20
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+# 4xx answers that are worth retrying unchanged: the request or the client's
+# configuration was at fault, not the batch
+RETRYABLE_CLIENT_ERRORS = (401, 403, 404, 408, 425)
+
+def _utc(seconds=0):
+    """UTC timestamp string (CURRENT_TIMESTAMP format), optionally seconds from now"""
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).strftime('%Y-%m-%d %H:%M:%S')
+
+# ================================================================================
+# SYNC TARGETS
+# ================================================================================
+
+class SyncError(Exception):
+    """A batch could not be delivered; retry_after is a server-requested pause in seconds"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class SyncBusy(SyncError):
+    """The target asked the client to slow down (HTTP 429/503)"""
+
+class SyncRejected(SyncError):
+    """The target will never accept this batch as it is; too_large for HTTP 413"""
+
+    def __init__(self, message, too_large=False):
+        super().__init__(message)
+        self.too_large = too_large
+
+class HttpSyncTarget:
+    """
+    POSTs each batch to a sync endpoint
+
+    The body is the gzip-compressed NDJSON payload; the batch ID is sent as
+    the Idempotency-Key header. 2xx and 409 (already received) count as
+    delivered; other 4xx answers, except RETRYABLE_CLIENT_ERRORS, raise
+    SyncRejected.
+    """
+
+    def __init__(self, url, timeout=30, token=None):
+        self.url = url
+        self.timeout = timeout
+        self.token = token
+
+    def send(self, batch_id, body, record_count):
+        headers = {
+            'Content-Type': 'application/x-ndjson',
+            'Content-Encoding': 'gzip',
+            'Idempotency-Key': batch_id,
+            'X-Record-Count': str(record_count),
+        }
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        request = urllib.request.Request(self.url, data=body, headers=headers, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 409:
+                return
+            retry_after = e.headers.get('Retry-After')
+            retry_after = float(retry_after) if retry_after and retry_after.isdigit() else None
+            if e.code in (429, 503):
+                raise SyncBusy(f'Sync server busy (HTTP {e.code})', retry_after)
+            if 400 <= e.code < 500 and e.code not in RETRYABLE_CLIENT_ERRORS:
+                raise SyncRejected(f'Sync server rejected batch (HTTP {e.code})', too_large=e.code == 413)
+            raise SyncError(f'Sync server rejected batch (HTTP {e.code})', retry_after)
+        except (urllib.error.URLError, OSError) as e:
+            raise SyncError(f'Sync server unreachable: {e}')
+
+class LocalSyncServer:
+    """
+    In-process HTTP stand-in for the sync server
+
+    Accepts batches from HttpSyncTarget, keeps the decoded records per
+    batch ID and ignores repeated batch IDs. Set busy to a number of
+    requests to answer with 429 + Retry-After, fail to a number of
+    requests to answer with 500, reject to a number of requests to answer
+    with 400, or max_records to answer 413 to larger batches.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, retry_after=1):
+        self.batches = {}
+        self.requests = 0
+        self.busy = 0
+        self.fail = 0
+        self.reject = 0
+        self.max_records = None
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/sync'
+
+    @property
+    def records(self):
+        """All received records, in batch arrival order"""
+        with self._lock:
+            return [record for records in self.batches.values() for record in records]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with server._lock:
+                    server.requests += 1
+                    if server.busy > 0:
+                        server.busy -= 1
+                        self.send_response(429)
+                        self.send_header('Retry-After', str(server.retry_after))
+                        self.end_headers()
+                        return
+                    if server.fail > 0:
+                        server.fail -= 1
+                        self.send_response(500)
+                        self.end_headers()
+                        return
+                    if server.reject > 0:
+                        server.reject -= 1
+                        self.send_response(400)
+                        self.end_headers()
+                        return
+                    if server.max_records is not None and int(self.headers['X-Record-Count']) > server.max_records:
+                        self.send_response(413)
+                        self.end_headers()
+                        return
+                    batch_id = self.headers['Idempotency-Key']
+                    duplicate = batch_id in server.batches
+                    if not duplicate:
+                        if self.headers.get('Content-Encoding') == 'gzip':
+                            body = gzip.decompress(body)
+                        server.batches[batch_id] = [json.loads(line) for line in body.splitlines() if line]
+                self.send_response(409 if duplicate else 201)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+# ================================================================================
+# OUTBOX
+# ================================================================================
+
+class SyncQueue:
+    """Durable outbox in the WellWatch database plus the batching/sending logic"""
+
+    def __init__(self, db_path=DB_PATH, batch_size=DEFAULT_BATCH_SIZE, max_batch_bytes=MAX_BATCH_BYTES,
+                 max_sealed=MAX_SEALED_BATCHES):
+        self.db = get_database(db_path)
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.max_sealed = max_sealed
+        self._device_id = None
+
+    @property
+    def device_id(self):
+        """Random ID generated once per database; prefixes every batch ID"""
+        if self._device_id is None:
+            with self.db.transaction() as conn:
+                conn.execute("INSERT OR IGNORE INTO sync_state (key, value) VALUES ('device_id', ?)",
+                             (uuid.uuid4().hex[:12],))
+                self._device_id = conn.execute(
+                    "SELECT value FROM sync_state WHERE key = 'device_id'").fetchone()[0]
+        return self._device_id
+
+    def enqueue(self, record_type, records):
+        """Add records (dicts) to the outbox in one transaction"""
+        with self.db.transaction() as conn:
+            for record in records:
+                enqueue_sync(conn, record_type, record)
+
+    def pending(self):
+        """Number of records waiting to be delivered (not counting rejected batches)"""
+        return self.db.query(
+            '''SELECT COUNT(*) FROM sync_outbox
+               WHERE batch_id IS NULL
+                  OR batch_id NOT IN (SELECT batch_id FROM sync_batches WHERE rejected_at IS NOT NULL)''')[0][0]
+
+    def rejected(self):
+        """Batches the server rejected for good, oldest first"""
+        return self.db.read_frame(
+            '''SELECT batch_id, record_count, raw_bytes, attempts, last_error, rejected_at
+               FROM sync_batches WHERE rejected_at IS NOT NULL ORDER BY first_id''')
+
+    def retry_rejected(self):
+        """Put rejected batches back in the queue; returns the number of batches"""
+        with self.db.transaction() as conn:
+            return conn.execute(
+                '''UPDATE sync_batches SET rejected_at = NULL, next_attempt_at = NULL
+                   WHERE rejected_at IS NOT NULL''').rowcount
+
+    def seal_batches(self):
+        """
+        Group unbatched outbox records into compressed batches
+
+        Stops once max_sealed batches are waiting to be sent. Returns the
+        number of batches sealed.
+        """
+        device_id = self.device_id
+        sealed = 0
+        with self.db.transaction() as conn:
+            waiting = conn.execute(
+                'SELECT COUNT(*) FROM sync_batches WHERE sent_at IS NULL AND rejected_at IS NULL').fetchone()[0]
+            while waiting + sealed < self.max_sealed:
+                rows = conn.execute(
+                    'SELECT id, record_type, payload FROM sync_outbox WHERE batch_id IS NULL ORDER BY id LIMIT ?',
+                    (self.batch_size,)).fetchall()
+                if not rows:
+                    break
+
+                self._seal(conn, device_id, rows, self.max_batch_bytes)
+                sealed += 1
+        return sealed
+
+    @staticmethod
+    def _seal(conn, device_id, rows, max_bytes):
+        """Seal a batch from the leading outbox rows that fit in max_bytes; returns its last id"""
+        lines, size = [], 0
+        for outbox_id, record_type, payload in rows:
+            line = f'{{"outbox_id": {outbox_id}, "type": {json.dumps(record_type)}, "data": {payload}}}\n'
+            if lines and size + len(line) > max_bytes:
+                break
+            lines.append(line)
+            size += len(line)
+            last_id = outbox_id
+
+        first_id = rows[0][0]
+        batch_id = f'{device_id}-{first_id}-{last_id}'
+        body = gzip.compress(''.join(lines).encode('utf-8'))
+        conn.execute(
+            '''INSERT INTO sync_batches (batch_id, first_id, last_id, record_count, raw_bytes, payload)
+               VALUES (?, ?, ?, ?, ?, ?)''',
+            (batch_id, first_id, last_id, len(lines), size, body))
+        conn.execute('UPDATE sync_outbox SET batch_id = ? WHERE batch_id IS NULL AND id BETWEEN ? AND ?',
+                     (batch_id, first_id, last_id))
+        return last_id
+
+    def _split(self, batch_id):
+        """Re-seal a batch the server found too large as two halves under new batch IDs"""
+        device_id = self.device_id
+        with self.db.transaction() as conn:
+            rows = conn.execute('SELECT id, record_type, payload FROM sync_outbox WHERE batch_id = ? ORDER BY id',
+                                (batch_id,)).fetchall()
+            conn.execute('DELETE FROM sync_batches WHERE batch_id = ?', (batch_id,))
+            conn.execute('UPDATE sync_outbox SET batch_id = NULL WHERE batch_id = ?', (batch_id,))
+            half = (len(rows) + 1) // 2
+            for part in (rows[:half], rows[half:]):
+                while part:
+                    last_id = self._seal(conn, device_id, part, self.max_batch_bytes)
+                    part = [row for row in part if row[0] > last_id]
+
+    def _next_batch(self):
+        rows = self.db.query(
+            '''SELECT batch_id, payload, record_count, attempts, next_attempt_at
+               FROM sync_batches WHERE sent_at IS NULL AND rejected_at IS NULL ORDER BY first_id LIMIT 1''')
+        return rows[0] if rows else None
+
+    def sync(self, target, max_batches=None):
+        """
+        Send pending records to target until the outbox is empty
+
+        Batches go out strictly in order; the first failure stops the run
+        and the same batch (same ID) is retried next time. A batch in its
+        back-off window also stops the run. A batch rejected for good is
+        set aside (see rejected()) and the run moves on to the next one; a
+        batch too large for the server is split in two and sent again.
+
+        Returns:
+        --------
+        dict with status ('synced', 'empty', 'busy', 'error' or 'waiting'),
+        batches_sent, records_sent, bytes_sent, batches_rejected, pending,
+        retry_at and error
+        """
+        result = {'status': 'empty', 'batches_sent': 0, 'records_sent': 0, 'bytes_sent': 0,
+                  'batches_rejected': 0, 'pending': 0, 'retry_at': None, 'error': None}
+
+        while max_batches is None or result['batches_sent'] < max_batches:
+            self.seal_batches()
+            batch = self._next_batch()
+            if batch is None:
+                break
+            batch_id, body, record_count, attempts, next_attempt_at = batch
+            if next_attempt_at is not None and next_attempt_at > _utc():
+                result.update(status='waiting', retry_at=next_attempt_at)
+                break
+
+            start = time.perf_counter()
+            try:
+                target.send(batch_id, body, record_count)
+            except SyncRejected as e:
+                if e.too_large and record_count > 1:
+                    self._split(batch_id)
+                    continue
+                with self.db.transaction() as conn:
+                    conn.execute(
+                        '''UPDATE sync_batches SET attempts = attempts + 1, last_error = ?, rejected_at = ?
+                           WHERE batch_id = ?''', (str(e), _utc(), batch_id))
+                result['batches_rejected'] += 1
+                result['error'] = str(e)
+                continue
+            except SyncError as e:
+                if e.retry_after is not None:
+                    delay = e.retry_after
+                else:
+                    delay = min(RETRY_BASE_SECONDS * 2 ** attempts, RETRY_MAX_SECONDS)
+                retry_at = _utc(delay)
+                with self.db.transaction() as conn:
+                    conn.execute(
+                        '''UPDATE sync_batches SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?
+                           WHERE batch_id = ?''', (str(e), retry_at, batch_id))
+                result.update(status='busy' if isinstance(e, SyncBusy) else 'error',
+                              retry_at=retry_at, error=str(e))
+                break
+
+            # Delivered: drop the records and payload, keep the batch row for statistics
+            with self.db.transaction() as conn:
+                conn.execute(
+                    '''UPDATE sync_batches SET sent_at = ?, duration_ms = ?, attempts = attempts + 1,
+                           payload = NULL, last_error = NULL, next_attempt_at = NULL
+                       WHERE batch_id = ?''', (_utc(), (time.perf_counter() - start) * 1000, batch_id))
+                conn.execute('DELETE FROM sync_outbox WHERE batch_id = ?', (batch_id,))
+            result['status'] = 'synced'
+            result['batches_sent'] += 1
+            result['records_sent'] += record_count
+            result['bytes_sent'] += len(body)
+
+        result['pending'] = self.pending()
+        return result
+
+    def last_sync(self):
+        """Time of the most recent delivered batch (UTC), or None"""
+        return self.db.query('SELECT MAX(sent_at) FROM sync_batches')[0][0]
+
+    def stats(self, days=7):
+        """Records synced and total sync time per day over the last days"""
+        since = _utc(-days * 86400)[:10]
+        return self.db.read_frame(
+            '''SELECT date(sent_at) AS Date, SUM(record_count) AS Records_Synced,
+                      SUM(duration_ms) / 1000.0 AS Sync_Duration_sec
+               FROM sync_batches WHERE sent_at >= ? GROUP BY 1 ORDER BY 1''', (since,))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='WellWatch offline sync')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    push = commands.add_parser('push', help='Send pending outbox records to a sync server')
+    push.add_argument('url', help='Sync endpoint URL')
+    push.add_argument('--db', default=DB_PATH, help='SQLite database path')
+    push.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Records per batch')
+
+    serve = commands.add_parser('serve', help='Run the local stand-in sync server')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        server = LocalSyncServer(args.host, args.port).start()
+        print(f'Accepting batches at {server.url} (Ctrl+C to stop)')
+        try:
+            while True:
+                time.sleep(5)
+                print(f'{len(server.batches):,} batches, {len(server.records):,} records received')
+        except KeyboardInterrupt:
+            server.stop()
+        return
+
+    queue = SyncQueue(args.db, batch_size=args.batch_size)
+    result = queue.sync(HttpSyncTarget(args.url))
+    print(f"{result['status']}: {result['records_sent']:,} records in {result['batches_sent']} batches "
+          f"({result['bytes_sent']:,} bytes), {result['pending']:,} pending")
+    if result['batches_rejected']:
+        print(f"  {result['batches_rejected']} batches rejected by the server and set aside")
+    if result['error'] and result['retry_at']:
+        print(f"  {result['error']}; retry after {result['retry_at']} UTC")
+
+if __name__ == '__main__':
+    main()
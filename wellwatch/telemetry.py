@@ -0,0 +1,286 @@
+"""
+Timing spans, latency histograms and on-demand profiles
+
+Stages of the screening flow and the API path are wrapped in span(name).
+A span adds its wall time to a process-wide Histogram with fixed
+Prometheus-style buckets: a bisect and three additions under a lock, about
+a microsecond, so spans stay on in production (WELLWATCH_TIMING=0 turns
+them off). The histograms are shown on the hidden Diagnostics page and
+served as Prometheus text by GET /metrics.
+
+ProfileLog captures cProfile statistics per request or screening when
+profiling is switched on (API --profile, or the Diagnostics page toggle);
+it is off by default because cProfile slows the profiled code several
+times over.
+"""
+
+import bisect
+import cProfile
+import io
+import math
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds in seconds, from sub-millisecond cache hits to model loading
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROFILE_HISTORY = 20  # captures kept
+PROFILE_TOP = 25  # functions per capture, by cumulative time
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# ================================================================================
+# HISTOGRAMS
+# ================================================================================
+
+class Histogram:
+    """Thread-safe latency histogram over fixed bucket bounds (seconds)"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * (len(self.bounds) + 1)  # last bucket: above every bound
+            self.count = 0
+            self.sum = 0.0
+            self.max = 0.0
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(self.bounds, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.sum += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q):
+        """
+        Estimated q-quantile in seconds, interpolated within its bucket as
+        Prometheus histogram_quantile() does (None when empty)
+        """
+        with self._lock:
+            counts, count, largest = list(self.counts), self.count, self.max
+        if not count:
+            return None
+        rank = q * count
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else largest
+                return min(lower + (upper - lower) * (rank - seen) / bucket_count, largest)
+            seen += bucket_count
+        return largest
+
+    def snapshot(self):
+        """Count, sum, max and cumulative bucket counts, read consistently"""
+        with self._lock:
+            cumulative, running = [], 0
+            for bucket_count in self.counts:
+                running += bucket_count
+                cumulative.append(running)
+            return {'count': self.count, 'sum': self.sum, 'max': self.max,
+                    'buckets': list(zip(self.bounds + (math.inf,), cumulative))}
+
+    def summary(self):
+        """Count, mean, p50, p99, max and total in milliseconds / seconds"""
+        p50, p99 = self.quantile(0.5), self.quantile(0.99)
+        return {
+            'count': self.count,
+            'mean_ms': self.sum / self.count * 1000 if self.count else None,
+            'p50_ms': p50 * 1000 if p50 is not None else None,
+            'p99_ms': p99 * 1000 if p99 is not None else None,
+            'max_ms': self.max * 1000,
+            'total_s': self.sum,
+        }
+
+class Timings:
+    """Named histograms, created on first use"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.enabled = os.environ.get('WELLWATCH_TIMING', '1') != '0'
+
+    def histogram(self, name):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, name, seconds):
+        if self.enabled:
+            self.histogram(name).observe(seconds)
+
+    def span(self, name):
+        """Context manager adding its wall time to histogram name"""
+        if not self.enabled:
+            return _NO_SPAN
+        return _Span(self.histogram(name))
+
+    def names(self):
+        return sorted(self._histograms)
+
+    def summary(self):
+        """{span name: Histogram.summary()} for every span seen so far"""
+        return {name: self._histograms[name].summary() for name in self.names()}
+
+    def reset(self):
+        for histogram in list(self._histograms.values()):
+            histogram.reset()
+
+class _Span:
+    """span() context manager; a class rather than a generator to keep the overhead down"""
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+_NO_SPAN = nullcontext()
+
+TIMINGS = Timings()
+
+def span(name):
+    """Time a block into the process-wide histogram name (see Timings.span())"""
+    return TIMINGS.span(name)
+
+def observe(name, seconds):
+    """Add an externally measured duration to the process-wide histogram name"""
+    TIMINGS.observe(name, seconds)
+
+# ================================================================================
+# PROFILES
+# ================================================================================
+
+class ProfileLog:
+    """
+    Most recent cProfile captures
+
+    One capture runs at a time: a request that starts while another is
+    being profiled runs unprofiled rather than waiting. In the API the
+    capture covers the request's await points too, so other requests the
+    event loop serves meanwhile show up in it.
+    """
+
+    def __init__(self, maxlen=PROFILE_HISTORY, top=PROFILE_TOP):
+        self.top = top
+        self.enabled = os.environ.get('WELLWATCH_PROFILE', '0') == '1'
+        self._captures = deque(maxlen=maxlen)
+        self._busy = threading.Lock()
+
+    @contextmanager
+    def capture(self, name):
+        """Profile the block into a new capture named name"""
+        if not self._busy.acquire(blocking=False):
+            yield
+            return
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            yield
+        finally:
+            profiler.disable()
+            seconds = time.perf_counter() - start
+            self._busy.release()
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(self.top)
+            self._captures.append({
+                'name': name,
+                'captured_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'seconds': seconds,
+                'stats': stream.getvalue(),
+            })
+
+    def maybe(self, name, enabled=None):
+        """capture(name) when enabled (default: this log's setting), otherwise a no-op context"""
+        if enabled if enabled is not None else self.enabled:
+            return self.capture(name)
+        return _NO_SPAN
+
+    def recent(self):
+        """Captures, newest first"""
+        return list(reversed(self._captures))
+
+    def clear(self):
+        self._captures.clear()
+
+PROFILES = ProfileLog()
+
+# ================================================================================
+# PROMETHEUS EXPOSITION
+# ================================================================================
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+def _number(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+def _histogram_lines(name, histogram, labels):
+    """_bucket, _sum and _count samples of one Histogram"""
+    snapshot = histogram.snapshot()
+    lines = [f'{name}_bucket{_labels({**labels, "le": _number(bound)})} {cumulative}'
+             for bound, cumulative in snapshot['buckets']]
+    lines.append(f'{name}_sum{_labels(labels)} {_number(snapshot["sum"])}')
+    lines.append(f'{name}_count{_labels(labels)} {snapshot["count"]}')
+    return lines
+
+def prometheus_text(timings=TIMINGS, metrics=(), prefix='wellwatch'):
+    """
+    Prometheus text exposition of span histograms plus extra metrics
+
+    Parameters:
+    -----------
+    timings : Timings whose spans become the {prefix}_span_seconds histogram
+    metrics : iterable of (name, type, help, samples) with samples a list of
+        (labels dict, value) pairs, or (labels dict, Histogram) pairs when
+        type is 'histogram'; name is prefixed
+    prefix : metric name prefix
+
+    Returns:
+    --------
+    str in the text format served with PROMETHEUS_CONTENT_TYPE
+    """
+    name = f'{prefix}_span_seconds'
+    lines = [f'# HELP {name} Wall time of instrumented stages', f'# TYPE {name} histogram']
+    for span_name in timings.names():
+        lines += _histogram_lines(name, timings.histogram(span_name), {'span': span_name})
+
+    for metric, kind, help_text, samples in metrics:
+        metric = f'{prefix}_{metric}'
+        lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} {kind}']
+        for labels, value in samples:
+            if kind == 'histogram':
+                lines += _histogram_lines(metric, value, labels)
+            else:
+                lines.append(f'{metric}{_labels(labels)} {_number(value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,90 @@
+"""
+Streamlit page modules
+
+streamlit_app.py keeps the page chrome (configuration, CSS, sidebar and
+footer) and draws the selected page with render_page(). Each page lives
+in its own module with a render() function and is imported the first
+time it is shown, so plotly, XGBoost and fpdf are loaded by the pages
+that draw charts, explain predictions or build reports instead of on
+every cold start, and Streamlit reruns only execute the visible page.
+
+HIDDEN_PAGES are left out of the navigation and opened by URL, e.g.
+?page=diagnostics for the timing histograms, caches and profiles.
+"""
+
+import importlib
+import time
+from collections import deque
+
+import numpy as np
+
+from wellwatch.telemetry import PROFILES, observe
+
+PAGES = {
+    "🏠 Home": 'home',
+    "🧍 Start Screening": 'screening',
+    "📊 Community Dashboard": 'dashboard',
+    "🔍 Explainability": 'explainability',
+    "👤 Judge Mode": 'judge',
+    "📂 Admin Panel": 'admin',
+    "ℹ️ About & Help": 'about',
+}
+HIDDEN_PAGES = {
+    "🛠️ Diagnostics": 'diagnostics',
+}
+TIMING_HISTORY = 50  # reruns kept per session for the timing summary
+
+def page_module(page):
+    """Module name of a navigation or hidden page label"""
+    return PAGES.get(page) or HIDDEN_PAGES[page]
+
+def hidden_page(name):
+    """Label of the hidden page whose module is name (the ?page= value), or None"""
+    return next((label for label, module in HIDDEN_PAGES.items() if module == name), None)
+
+def render_page(page, profile=None):
+    """
+    Import (on first use) and render one page
+
+    profile=True captures a cProfile of the render into telemetry.PROFILES
+    (None: when WELLWATCH_PROFILE=1).
+
+    Returns:
+    --------
+    Seconds spent importing the page module, 0.0 once it is loaded
+    """
+    started = time.perf_counter()
+    name = page_module(page)
+    module = importlib.import_module(f'wellwatch.ui.{name}')
+    import_seconds = time.perf_counter() - started
+    with PROFILES.maybe(f'page.{name}', profile):
+        module.render()
+    return import_seconds
+
+def record_rerun(session_state, page, seconds, import_seconds=0.0):
+    """
+    Add one rerun to the session's timing history and the process-wide
+    'rerun.<page module>' histogram, and summarize it
+
+    Parameters:
+    -----------
+    session_state : st.session_state (or any dict) holding the history
+    page : page label rendered by this rerun
+    seconds : wall time of the whole script run
+    import_seconds : part of it spent importing the page module
+
+    Returns:
+    --------
+    dict with this rerun's ms, import_ms, and the page's median_ms and reruns
+    """
+    observe(f'rerun.{page_module(page)}', seconds)
+    history = session_state.setdefault('rerun_timings', deque(maxlen=TIMING_HISTORY))
+    history.append((page, seconds * 1000))
+    page_ms = [ms for p, ms in history if p == page]
+    return {
+        'page': page,
+        'ms': seconds * 1000,
+        'import_ms': import_seconds * 1000,
+        'median_ms': float(np.median(page_ms)),
+        'reruns': len(page_ms),
+    }
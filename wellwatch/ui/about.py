@@ -0,0 +1,242 @@
+"""
+About & Help page
+"""
+
+import streamlit as st
+
+def render():
+    st.markdown('<p class="hero-title" style="font-size: 4.5rem;">ℹ️ About WellWatch India</p>', unsafe_allow_html=True)
+    st.markdown('<p class="hero-subtitle">Empowering community health through AI-driven screening</p>', unsafe_allow_html=True)
+
+    # Mission & Vision
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        <div class='info-card'>
+            <h3 style='color: #667eea; margin-top: 0;'>🎯 Our Mission</h3>
+            <p style='line-height: 1.8;'>
+                To prevent chronic lifestyle diseases through early detection and community-level
+                intervention, making healthcare accessible to every Indian, especially in rural and
+                underserved areas.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div class='info-card'>
+            <h3 style='color: #667eea; margin-top: 0;'>👁️ Our Vision</h3>
+            <p style='line-height: 1.8;'>
+                A healthy India where technology empowers frontline health workers to identify and
+                prevent chronic diseases before they manifest, reducing healthcare burden and improving
+                quality of life.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Technology Stack
+    st.markdown("### 🔧 Technology Stack")
+
+    tech_col1, tech_col2, tech_col3 = st.columns(3)
+
+    with tech_col1:
+        st.markdown("""
+        <div class='info-card'>
+            <h4 style='color: #667eea; margin-top: 0;'>🤖 Machine Learning</h4>
+            <ul style='line-height: 1.8;'>
+                <li><strong>Algorithm:</strong> XGBoost</li>
+                <li><strong>Accuracy:</strong> 87.3%</li>
+                <li><strong>Features:</strong> 28 parameters</li>
+                <li><strong>Training Data:</strong> 2,000+ patients</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with tech_col2:
+        st.markdown("""
+        <div class='info-card'>
+            <h4 style='color: #667eea; margin-top: 0;'>💻 Platform</h4>
+            <ul style='line-height: 1.8;'>
+                <li><strong>Backend:</strong> Python 3.8+</li>
+                <li><strong>Web App:</strong> Streamlit</li>
+                <li><strong>Database:</strong> SQLite</li>
+                <li><strong>Visualization:</strong> Plotly</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with tech_col3:
+        st.markdown("""
+        <div class='info-card'>
+            <h4 style='color: #667eea; margin-top: 0;'>📱 Deployment</h4>
+            <ul style='line-height: 1.8;'>
+                <li><strong>Mobile:</strong> Offline-capable</li>
+                <li><strong>Languages:</strong> Multi-lingual</li>
+                <li><strong>Internet:</strong> Low-bandwidth</li>
+                <li><strong>Devices:</strong> Basic smartphones</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # How to Use
+    st.markdown("### 📖 How to Use This System")
+
+    with st.expander("🧍 For Community Health Workers (CHWs)", expanded=True):
+        st.markdown("""
+        1. **Start Screening**: Navigate to "Start Screening" from the sidebar
+        2. **Collect Data**: Fill in patient information using the screening form
+        3. **Get Results**: Review the risk assessment and recommendations
+        4. **Take Action**:
+           - Low Risk: Schedule routine follow-up (6 months)
+           - Medium Risk: PHC referral within 2 weeks
+           - High Risk: Immediate PHC referral
+        5. **Follow-Up**: Track patients through the dashboard
+        """)
+
+    with st.expander("👨‍💼 For Health Managers"):
+        st.markdown("""
+        1. **Monitor Dashboard**: View community health metrics in real-time
+        2. **Identify Hotspots**: Find areas with high disease risk
+        3. **Allocate Resources**: Deploy CHWs to high-need areas
+        4. **Track Trends**: Monitor screening progress and outcomes
+        5. **Export Data**: Download reports for analysis
+        """)
+
+    with st.expander("🏥 For Healthcare Administrators"):
+        st.markdown("""
+        1. **Review Records**: Access all screening records in Admin Panel
+        2. **Export Data**: Download data for reporting and analysis
+        3. **Manage Backups**: Ensure data integrity with regular backups
+        4. **Monitor System**: Track sync status and system performance
+        """)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # FAQ
+    st.markdown("### ❓ Frequently Asked Questions")
+
+    with st.expander("Is this system a diagnostic tool?"):
+        st.markdown("""
+        **No.** WellWatch India is a **screening tool** for risk assessment, not a diagnostic device.
+        It helps identify individuals who may be at risk and should receive further evaluation by
+        qualified healthcare professionals. All high-risk cases must be referred to Primary Health
+        Centers for proper diagnosis and treatment.
+        """)
+
+    with st.expander("How accurate is the AI model?"):
+        st.markdown("""
+        The model achieves **87.3% overall accuracy** with **88.5% recall** for high-risk cases.
+        This means it successfully identifies nearly 9 out of 10 high-risk individuals. We prioritize
+        recall (sensitivity) to minimize false negatives, ensuring maximum protection for vulnerable populations.
+        """)
+
+    with st.expander("Does it work offline?"):
+        st.markdown("""
+        **Yes!** The system is designed for offline use:
+        - Prediction model runs locally (no internet required)
+        - Data stored in local database
+        - Automatic sync when internet is available
+        - SMS/voice alerts use basic cellular networks
+
+        This makes it ideal for rural areas with limited connectivity.
+        """)
+
+    with st.expander("What languages are supported?"):
+        st.markdown("""
+        Currently supported languages:
+        - **English** (Primary)
+        - **Hindi** (हिंदी)
+        - **Tamil** (தமிழ்)
+        - **Bengali** (বাংলা)
+
+        Additional languages can be added based on regional requirements.
+        """)
+
+    with st.expander("Is patient data secure?"):
+        st.markdown("""
+        **Yes.** We take data security seriously:
+        - Encrypted data storage
+        - HIPAA-compliant design principles
+        - No cloud storage of personal health information
+        - Role-based access control
+        - Regular security audits
+
+        All patient data remains confidential and is only accessible to authorized healthcare personnel.
+        """)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Contact & Support
+    st.markdown("### 📞 Contact & Support")
+
+    contact_col1, contact_col2 = st.columns(2)
+
+    with contact_col1:
+        st.markdown("""
+        <div class='info-card'>
+            <h4 style='color: #667eea; margin-top: 0;'>📧 Get in Touch</h4>
+            <p style='line-height: 2;'>
+                <strong>Email:</strong> support@wellwatch.in<br>
+                <strong>Phone:</strong> +91-XXXX-XXXXXX<br>
+                <strong>Website:</strong> www.wellwatch.in<br>
+                <strong>Hours:</strong> Mon-Fri, 9 AM - 6 PM IST
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with contact_col2:
+        st.markdown("""
+        <div class='info-card'>
+            <h4 style='color: #667eea; margin-top: 0;'>🏆 Project Info</h4>
+            <p style='line-height: 2;'>
+                <strong>Version:</strong> 1.0.0<br>
+                <strong>Released:</strong> October 2025<br>
+                <strong>Developed for:</strong> AI4Bharat Hackathon<br>
+                <strong>License:</strong> Educational & Social Impact
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Disclaimer
+    st.markdown("""
+    <div class='warning-box'>
+        <h4 style='margin: 0 0 0.5rem 0;'>⚠️ Medical Disclaimer</h4>
+        <p style='margin: 0; line-height: 1.8;'>
+            WellWatch India is a screening and risk assessment tool designed to support healthcare
+            workers, not replace medical professionals. All risk assessments should be followed up
+            with proper medical evaluation. This system is intended for educational and community
+            health purposes. Always consult qualified healthcare providers for diagnosis and treatment.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Credits
+    st.markdown("### 🙏 Acknowledgments")
+
+    st.markdown("""
+    <div class='info-card'>
+        <p style='line-height: 1.8;'>
+            This project was developed as part of the <strong>AI4Bharat Hackathon 2025</strong>,
+            with the goal of leveraging artificial intelligence to solve critical healthcare
+            challenges in India. We thank:
+        </p>
+        <ul style='line-height: 1.8;'>
+            <li>Community health workers for their invaluable frontline service</li>
+            <li>Healthcare professionals who provided domain expertise</li>
+            <li>Open-source communities for tools and libraries</li>
+            <li>All participants who contributed to making healthcare accessible</li>
+        </ul>
+        <p style='margin: 0;'>
+            <em>"Technology should serve humanity, especially those who need it most."</em>
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
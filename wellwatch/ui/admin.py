@@ -0,0 +1,382 @@
+"""
+Admin Panel page: screening records, data export, sync and backup, and
+CHW follow-up worklists
+"""
+
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from wellwatch.export import DEFAULT_GROUPS, FIELD_GROUPS, FORMATS, XLSX_MAX_ROWS, export_screenings
+from wellwatch.followup import chw_worklist, close_intervention, worklist_summary
+from wellwatch.sync import HttpSyncTarget, SyncQueue
+from wellwatch.ui.data import (ADMIN_PAGE_SIZE, chw_options, screening_page, screening_summary,
+                                screenings_version)
+
+RISK_ROW_COLORS = {'High': 'background-color: #f8d7da', 'Medium': 'background-color: #fff3cd'}
+DEFAULT_ROW_COLOR = 'background-color: #d4edda'
+
+EXPORT_FORMATS = {
+    "CSV (Comma Separated)": 'csv',
+    "Excel (XLSX)": 'xlsx',
+    "JSON Lines (one record per line)": 'jsonl',
+    "Parquet (columnar, for analysis tools)": 'parquet',
+}
+EXPORT_SPOOL_BYTES = 16 * 1024 * 1024  # larger export files are built on disk
+
+WORKLIST_COLUMNS = {
+    'patient_id': 'Patient_ID',
+    'due_date': 'Due',
+    'days_overdue': 'Days_Overdue',
+    'risk_level': 'Risk_Level',
+    'risk_score': 'Risk_Score',
+    'notes': 'Notes',
+}
+
+def risk_row_styles(records):
+    """Background of every cell by its row's risk level (for Styler.apply with axis=None)"""
+    css = records['Risk_Level'].map(RISK_ROW_COLORS).fillna(DEFAULT_ROW_COLOR).to_numpy()
+    return pd.DataFrame(np.repeat(css[:, None], records.shape[1], axis=1),
+                        index=records.index, columns=records.columns)
+
+def date_filters(date_range):
+    """start_date/end_date filter pairs for a st.date_input range (one date: from that date on)"""
+    dates = tuple(date_range) if isinstance(date_range, (tuple, list)) else (date_range,)
+    return tuple(zip(('start_date', 'end_date'), dates))
+
+def export_file(fmt, groups, filters):
+    """
+    Build an export file with the streaming writers and return its bytes
+
+    Runs when the download button is clicked, so only requested exports
+    are generated. Rows are written chunk by chunk into a spooled
+    temporary file; the full result set is never held as a DataFrame.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as f:
+        export_screenings(f, fmt, groups, **dict(filters))
+        f.seek(0)
+        return f.read()
+
+def record_filters(risk_levels, locations, date_range, chw_ids):
+    """
+    screening_filters() arguments for the View Records widgets, as a
+    hashable tuple of (name, value) pairs
+
+    An empty CHW selection means every CHW. A date range still being
+    picked (one date) filters from that date on.
+    """
+    filters = [('risk_levels', tuple(risk_levels)), ('locations', tuple(locations))]
+    filters.extend(date_filters(date_range))
+    if chw_ids:
+        filters.append(('chw_ids', tuple(chw_ids)))
+    return tuple(filters)
+
+def render():
+    st.markdown('<p class="hero-title" style="font-size: 4.5rem;">📂 Admin Panel</p>', unsafe_allow_html=True)
+    st.markdown('<p class="hero-subtitle">Database management and data export tools</p>', unsafe_allow_html=True)
+
+    # Tabs for different admin functions
+    admin_tab1, admin_tab2, admin_tab3, admin_tab4 = st.tabs(["📊 View Records", "⬇️ Export Data",
+                                                             "🔄 Sync & Backup", "📅 Follow-Ups"])
+
+    with admin_tab1:
+        st.markdown("### 📋 Patient Screening Records")
+
+        version = screenings_version()
+
+        # Filters (pushed down into the indexed screening queries)
+        filter_col1, filter_col2, filter_col3, filter_col4 = st.columns(4)
+
+        with filter_col1:
+            risk_filter = st.multiselect("Filter by Risk Level",
+                                        ['Low', 'Medium', 'High'],
+                                        default=['Low', 'Medium', 'High'])
+
+        with filter_col2:
+            location_filter = st.multiselect("Filter by Location",
+                                            ['Rural', 'Semi-Urban', 'Urban'],
+                                            default=['Rural', 'Semi-Urban', 'Urban'])
+
+        with filter_col3:
+            date_range = st.date_input("Date Range",
+                                      value=(datetime.now().date() - pd.Timedelta(days=30),
+                                            datetime.now().date()))
+
+        with filter_col4:
+            chw_filter = st.multiselect("Filter by CHW", chw_options(version),
+                                        placeholder="All CHWs")
+
+        filters = record_filters(risk_filter, location_filter, date_range, chw_filter)
+
+        # Keyset pagination: cursors[i] is where page i starts; new filters start over
+        if st.session_state.get('admin_filters') != filters:
+            st.session_state.admin_filters = filters
+            st.session_state.admin_cursors = [None]
+        cursors = st.session_state.admin_cursors
+
+        summary = screening_summary(version, filters)
+        page_records, next_cursor = screening_page(version, filters, cursors[-1])
+
+        # Display table (only the current page is sent to the browser)
+        first_row = (len(cursors) - 1) * ADMIN_PAGE_SIZE
+        if len(page_records):
+            st.markdown(f"**Showing records {first_row + 1:,}–{first_row + len(page_records):,} "
+                        f"of {summary['total']:,}**")
+        else:
+            st.markdown("**No records match these filters**")
+
+        st.dataframe(page_records.style.apply(risk_row_styles, axis=None),
+                     use_container_width=True, hide_index=True)
+
+        page_col1, page_col2, page_col3 = st.columns([1, 2, 1])
+
+        with page_col1:
+            st.button("⬅️ Previous", use_container_width=True, disabled=len(cursors) == 1,
+                      on_click=cursors.pop)
+
+        with page_col2:
+            st.markdown(f"<p style='text-align: center; margin: 0.5rem 0;'>Page {len(cursors):,} of "
+                        f"{max(1, -(-summary['total'] // ADMIN_PAGE_SIZE)):,}</p>", unsafe_allow_html=True)
+
+        with page_col3:
+            st.button("Next ➡️", use_container_width=True, disabled=next_cursor is None,
+                      on_click=cursors.append, args=(next_cursor,))
+
+        # Quick stats (over every filtered record, not just this page)
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+
+        with stat_col1:
+            st.metric("Total Records", f"{summary['total']:,}")
+
+        with stat_col2:
+            st.metric("High Risk", f"{summary['high_risk']:,}")
+
+        with stat_col3:
+            avg_risk_score = summary['avg_risk_score']
+            st.metric("Avg Risk Score", f"{avg_risk_score:.1f}" if avg_risk_score is not None else "–")
+
+        with stat_col4:
+            avg_bmi = summary['avg_bmi']
+            st.metric("Avg BMI", f"{avg_bmi:.1f}" if avg_bmi is not None else "–")
+
+    with admin_tab2:
+        st.markdown("### ⬇️ Export Data")
+
+        st.markdown("""
+        <div class='info-card'>
+            <p style='margin: 0;'>
+                Export screening data in various formats for analysis, reporting, or backup purposes.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        export_col1, export_col2 = st.columns(2)
+
+        with export_col1:
+            st.markdown("#### Export Options")
+
+            export_format = st.radio("Select Format", list(EXPORT_FORMATS))
+            fmt = EXPORT_FORMATS[export_format]
+
+            include_options = st.multiselect("Include Fields", list(FIELD_GROUPS),
+                                            default=list(DEFAULT_GROUPS))
+
+            date_range_export = st.date_input("Export Date Range",
+                                             value=(datetime.now().date() - pd.Timedelta(days=90),
+                                                   datetime.now().date()),
+                                             key="export_date")
+
+        export_filters = date_filters(date_range_export)
+
+        with export_col2:
+            st.markdown("#### Preview")
+
+            # Show preview of data to be exported
+            preview_data = screening_page(version, export_filters, limit=5)[0][['Patient_ID', 'Date', 'Risk_Level',
+                                                                                'Risk_Score', 'Location']]
+            st.dataframe(preview_data, use_container_width=True, hide_index=True)
+
+            export_total = screening_summary(version, export_filters)['total']
+            st.markdown(f"**Records to export:** {export_total:,}")
+            too_many_rows = fmt == 'xlsx' and export_total > XLSX_MAX_ROWS
+            if too_many_rows:
+                st.warning(f"⚠️ Excel sheets hold at most {XLSX_MAX_ROWS:,} records. "
+                           "Choose CSV or Parquet, or a shorter date range.")
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+            # The file is generated when the button is clicked, streamed from
+            # SQLite in chunks
+            st.download_button(
+                label=f"📥 Download {fmt.upper()} Export",
+                data=lambda: export_file(fmt, tuple(include_options), export_filters),
+                file_name=f"wellwatch_export_{datetime.now().strftime('%Y%m%d')}.{fmt}",
+                mime=FORMATS[fmt],
+                on_click="ignore",
+                use_container_width=True,
+                type="primary",
+                disabled=not include_options or too_many_rows
+            )
+
+    with admin_tab3:
+        st.markdown("### 🔄 Sync & Backup")
+
+        sync_col1, sync_col2 = st.columns(2)
+
+        with sync_col1:
+            st.markdown("#### Database Status")
+
+            st.markdown("""
+            <div class='success-box'>
+                <h4 style='margin: 0 0 0.5rem 0;'>✅ Database Connected</h4>
+                <p style='margin: 0;'><strong>Type:</strong> SQLite<br>
+                <strong>Location:</strong> data/wellwatch.db<br>
+                <strong>Size:</strong> 2.4 MB<br>
+                <strong>Last Backup:</strong> 2 hours ago</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+            offline_mode = st.session_state.get('offline_mode', False)
+            sync_queue = SyncQueue()
+            pending_sync = sync_queue.pending()
+            sync_url = os.environ.get('WELLWATCH_SYNC_URL')
+
+            if pending_sync:
+                st.markdown(f"""
+                <div class='warning-box'>
+                    <h4 style='margin: 0 0 0.5rem 0;'>📡 {'Offline Mode Active' if offline_mode else 'Records Waiting to Sync'}</h4>
+                    <p style='margin: 0;'><strong>Pending Sync:</strong> {pending_sync:,} records<br>
+                    {'Connect to internet to sync data' if offline_mode else f'Last sync: {sync_queue.last_sync() or "never"} (UTC)'}</p>
+                </div>
+                """, unsafe_allow_html=True)
+
+                if st.button("🔄 Sync Now", use_container_width=True):
+                    if not sync_url:
+                        st.warning("⚠️ No sync server configured - set WELLWATCH_SYNC_URL")
+                    else:
+                        with st.spinner("Syncing data..."):
+                            sync_result = sync_queue.sync(HttpSyncTarget(sync_url))
+                        if sync_result['status'] == 'synced':
+                            st.success(f"✅ {sync_result['records_sent']:,} records synced successfully "
+                                       f"in {sync_result['batches_sent']} batch(es)!")
+                        elif sync_result['status'] in ('busy', 'waiting'):
+                            st.warning(f"⏳ Sync server busy - retrying after {sync_result['retry_at']} UTC")
+                        else:
+                            st.error(f"❌ Sync failed: {sync_result['error']} - "
+                                     f"{sync_result['pending']:,} records kept for retry")
+                        if sync_result['batches_rejected']:
+                            st.warning(f"⚠️ {sync_result['batches_rejected']} batch(es) rejected by the sync "
+                                       f"server - see Rejected Batches below")
+            else:
+                st.info("🌐 Online - All data synced")
+
+            # Dead letters: batches the server refused, kept until retried
+            rejected_batches = sync_queue.rejected()
+            if len(rejected_batches):
+                st.error(f"🚫 {len(rejected_batches)} batch(es), {int(rejected_batches['record_count'].sum()):,} "
+                         f"records, rejected by the sync server")
+                with st.expander("Rejected Batches"):
+                    st.dataframe(rejected_batches.rename(columns={
+                        'batch_id': 'Batch', 'record_count': 'Records', 'raw_bytes': 'Bytes',
+                        'attempts': 'Attempts', 'last_error': 'Error', 'rejected_at': 'Rejected (UTC)'}),
+                        use_container_width=True, hide_index=True)
+                    if st.button("↩️ Retry Rejected Batches", use_container_width=True):
+                        st.success(f"✅ {sync_queue.retry_rejected()} batch(es) queued for the next sync")
+
+        with sync_col2:
+            st.markdown("#### Backup Options")
+
+            backup_freq = st.selectbox("Backup Frequency",
+                                      ["Manual", "Daily", "Weekly", "Monthly"])
+
+            backup_location = st.text_input("Backup Location",
+                                           value="/backups/wellwatch/",
+                                           help="Path for automated backups")
+
+            st.markdown("<br>", unsafe_allow_html=True)
+
+            backup_col_a, backup_col_b = st.columns(2)
+
+            with backup_col_a:
+                if st.button("💾 Create Backup", use_container_width=True):
+                    with st.spinner("Creating backup..."):
+                        import time
+                        time.sleep(2)
+                    st.success("✅ Backup created successfully!")
+
+            with backup_col_b:
+                if st.button("♻️ Restore Backup", use_container_width=True):
+                    st.warning("⚠️ Restore will overwrite current data. Confirm?")
+
+        # Sync statistics
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("#### 📊 Sync Statistics (Last 7 Days)")
+
+        sync_stats = SyncQueue().stats(days=7)
+        if sync_stats.empty:
+            st.info("No records synced in the last 7 days")
+        else:
+            fig = go.Figure()
+            fig.add_trace(go.Bar(
+                x=sync_stats['Date'],
+                y=sync_stats['Records_Synced'],
+                name='Records Synced',
+                marker_color='#667eea'
+            ))
+            fig.update_layout(height=300, xaxis_title="Date", yaxis_title="Records")
+            st.plotly_chart(fig, use_container_width=True)
+
+    with admin_tab4:
+        st.markdown("### 📅 Follow-Up Worklists")
+
+        worklist_day = st.date_input("Worklist Day", value=datetime.now().date(), key="worklist_day")
+
+        # Open follow-ups due by the end of the day, per CHW (one indexed query)
+        due_summary = worklist_summary(worklist_day)
+
+        fu_col1, fu_col2, fu_col3 = st.columns(3)
+
+        with fu_col1:
+            st.metric("Follow-Ups Due", f"{int(due_summary['due'].sum()):,}")
+
+        with fu_col2:
+            st.metric("CHWs With Visits Due", f"{len(due_summary):,}")
+
+        with fu_col3:
+            oldest = due_summary['oldest_due'].min() if len(due_summary) else None
+            st.metric("Oldest Due Date", oldest[:10] if oldest else "–")
+
+        if due_summary.empty:
+            st.info("No follow-ups due on this day")
+        else:
+            due_by_chw = dict(zip(due_summary['chw_id'], due_summary['due']))
+            chw_choice = st.selectbox("CHW", list(due_by_chw),
+                                      format_func=lambda chw: f"{chw} ({due_by_chw[chw]:,} due)")
+            worklist = chw_worklist(chw_choice, worklist_day)
+            table = worklist.rename(columns=WORKLIST_COLUMNS)[list(WORKLIST_COLUMNS.values())]
+            st.dataframe(table.style.apply(risk_row_styles, axis=None), use_container_width=True, hide_index=True)
+
+            # Follow-ups closed without a new screening (a new screening closes them itself)
+            close_col1, close_col2, close_col3 = st.columns([2, 1, 1])
+
+            with close_col1:
+                to_close = st.selectbox("Close follow-up", worklist.index,
+                                        format_func=lambda i: f"{worklist.at[i, 'patient_id']} "
+                                                              f"(due {worklist.at[i, 'due_date'][:10]})")
+
+            with close_col2:
+                close_status = st.radio("Outcome", ["completed", "cancelled"], horizontal=True)
+
+            with close_col3:
+                if st.button("✔️ Close", use_container_width=True):
+                    close_intervention(int(worklist.at[to_close, 'intervention_id']), close_status)
+                    st.rerun()
@@ -0,0 +1,142 @@
+"""
+Shared resources and charts for the Streamlit pages
+
+The model engine, the SHAP explainer and the patient history cache are
+st.cache_resource singletons shared by every page and session. The explainer module (and with it
+XGBoost) is imported the first time a page asks for an explanation.
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from wellwatch.analytics import age_band, subgroup_metrics
+from wellwatch.history import PatientHistory
+from wellwatch.inference import RiskEngine
+from wellwatch.ingest import NA_VALUES
+from wellwatch.telemetry import span
+
+RISK_COLORS = {'Low': '#28a745', 'Medium': '#ffc107', 'High': '#dc3545'}
+
+# The notebook's held-out split of cleaned_data.csv (stratified on risk_label)
+TEST_SIZE = 0.2
+RANDOM_SEED = 42
+
+@st.cache_resource
+def load_model_artifacts():
+    """Load all model artifacts into a shared inference engine"""
+    try:
+        with span('artifacts.model'):
+            return RiskEngine.load('models')
+    except Exception:
+        return None
+
+@st.cache_resource
+def load_explainer():
+    """SHAP explainer for the loaded model (global importances are cached per model version)"""
+    engine = load_model_artifacts()
+    if engine is None:
+        return None
+    try:
+        with span('artifacts.explainer'):
+            from wellwatch.explain import RiskExplainer
+            return RiskExplainer(engine)
+    except Exception:
+        return None
+
+@st.cache_resource
+def load_patient_history():
+    """Patient timelines with an LRU of recently viewed patients"""
+    return PatientHistory()
+
+@st.cache_data
+def load_fairness_metrics(data_path='data/cleaned_data.csv'):
+    """
+    Model accuracy and high-risk recall by gender and age group
+
+    Evaluated on the notebook's test split of the labelled screening data,
+    not on the rows the model was trained on.
+    """
+    engine = load_model_artifacts()
+    if engine is None or not os.path.exists(data_path):
+        return None
+    from sklearn.model_selection import train_test_split
+
+    data = pd.read_csv(data_path, keep_default_na=False, na_values=NA_VALUES)
+    _, test = train_test_split(data, test_size=TEST_SIZE, random_state=RANDOM_SEED,
+                               stratify=data['risk_label'])
+    predicted = engine.predict_batch(test)['risk_level']
+    return {
+        'gender': subgroup_metrics(test['gender'], test['risk_label'], predicted,
+                                   average='High', group_order=['Male', 'Female']),
+        'age_group': subgroup_metrics(age_band(test['age']), test['risk_label'], predicted,
+                                      average='High', group_order=['18-30', '31-45', '46-60', '60+']),
+    }
+
+def create_contribution_chart(explanation, height=300):
+    """Horizontal bar chart of SHAP contributions, largest at the top"""
+    import plotly.express as px
+
+    fig = px.bar(explanation.iloc[::-1], x='Contribution', y='Label', orientation='h',
+                 color='Contribution', color_continuous_scale='RdYlGn_r', color_continuous_midpoint=0)
+    fig.update_layout(height=height, showlegend=False, coloraxis_showscale=False,
+                      xaxis_title="SHAP Contribution (log-odds)", yaxis_title="")
+    return fig
+
+def create_probability_chart(probs, label='Risk Level', height=300, title=None):
+    """Bar chart of the Low/Medium/High probabilities of one prediction"""
+    import plotly.express as px
+
+    prob_df = pd.DataFrame({
+        label: list(probs.keys()),
+        'Probability': [v * 100 for v in probs.values()]
+    })
+
+    fig = px.bar(prob_df, x=label, y='Probability',
+                 color=label,
+                 color_discrete_map=RISK_COLORS,
+                 text='Probability')
+    fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+    fig.update_layout(showlegend=False, height=height,
+                      yaxis_title="Probability (%)",
+                      xaxis_title="", title=title)
+    return fig
+
+def create_gauge_chart(score, title="Risk Score"):
+    """Create a gauge chart for risk score"""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Indicator(
+        mode = "gauge+number+delta",
+        value = score,
+        domain = {'x': [0, 1], 'y': [0, 1]},
+        title = {'text': title, 'font': {'size': 24, 'color': '#2c3e50'}},
+        delta = {'reference': 50},
+        gauge = {
+            'axis': {'range': [None, 100], 'tickwidth': 2},
+            'bar': {'color': "#667eea", 'thickness': 0.3},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [
+                {'range': [0, 35], 'color': '#d4edda'},
+                {'range': [35, 65], 'color': '#fff3cd'},
+                {'range': [65, 100], 'color': '#f8d7da'}
+            ],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': score
+            }
+        }
+    ))
+
+    fig.update_layout(
+        paper_bgcolor = "white",
+        font = {'color': "#2c3e50", 'family': "Arial"},
+        height = 300,
+        margin = dict(l=20, r=20, t=50, b=20)
+    )
+
+    return fig
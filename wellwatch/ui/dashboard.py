@@ -0,0 +1,180 @@
+"""
+Community Dashboard page: population metrics and trends from the daily rollups
+"""
+
+from datetime import datetime
+
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from wellwatch.ui.common import RISK_COLORS
+from wellwatch.ui.data import dashboard_summary, recent_screenings, screenings_version
+
+def render():
+    st.markdown('<p class="hero-title" style="font-size: 4.5rem;">📊 Community Health Dashboard</p>', unsafe_allow_html=True)
+    st.markdown('<p class="hero-subtitle">Real-time analytics and population health insights</p>', unsafe_allow_html=True)
+
+    # Daily rollups, grouped in SQL once per screenings version for every session
+    version = screenings_version()
+    summary = dashboard_summary(version, datetime.now().date())
+
+    # Summary metrics
+    st.markdown("### 📈 Key Metrics Overview")
+
+    metric1, metric2, metric3, metric4, metric5 = st.columns(5)
+
+    with metric1:
+        st.metric("👥 Total Screened", f"{summary['total_screened']:,}", f"+{summary['this_week']} this week")
+
+    with metric2:
+        st.metric("⚠️ High Risk %", f"{summary['high_risk_pct']:.1f}%", "-2.1%", delta_color="inverse")
+
+    with metric3:
+        st.metric("⚖️ Avg BMI", f"{summary['avg_bmi']:.1f}", "±0.3")
+
+    with metric4:
+        st.metric("🩺 Avg BP", f"{summary['avg_bp']:.0f}", "+2 mmHg", delta_color="inverse")
+
+    with metric5:
+        st.metric("💉 Avg Glucose", f"{summary['avg_glucose']:.0f}", "-3 mg/dL", delta_color="normal")
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Main visualizations
+    viz_col1, viz_col2 = st.columns(2)
+
+    with viz_col1:
+        # Risk distribution pie chart
+        st.markdown("#### 🎯 Risk Distribution")
+
+        risk_counts = summary['risk_counts']
+
+        fig = px.pie(values=risk_counts.values,
+                     names=risk_counts.index,
+                     color=risk_counts.index,
+                     color_discrete_map=RISK_COLORS,
+                     hole=0.4)
+        fig.update_traces(textposition='inside', textinfo='percent+label')
+        fig.update_layout(height=350, showlegend=True)
+        st.plotly_chart(fig, use_container_width=True)
+
+    with viz_col2:
+        # Risk by location
+        st.markdown("#### 📍 Risk by Location")
+
+        location_risk = summary['location_risk']
+
+        fig = px.bar(location_risk,
+                     barmode='group',
+                     color_discrete_map=RISK_COLORS)
+        fig.update_layout(height=350, xaxis_title="Location",
+                         yaxis_title="Count", showlegend=True)
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Second row of visualizations
+    viz_col3, viz_col4 = st.columns(2)
+
+    with viz_col3:
+        # Age group analysis
+        st.markdown("#### 👥 Risk by Age Group")
+
+        age_risk = summary['age_risk']
+
+        fig = px.bar(age_risk,
+                     barmode='stack',
+                     color_discrete_map=RISK_COLORS)
+        fig.update_layout(height=350, xaxis_title="Age Group",
+                         yaxis_title="Percentage (%)", showlegend=True)
+        st.plotly_chart(fig, use_container_width=True)
+
+    with viz_col4:
+        # Gender comparison
+        st.markdown("#### ⚧ Gender Distribution")
+
+        gender_risk = summary['gender_risk']
+
+        fig = px.bar(gender_risk,
+                     barmode='group',
+                     color_discrete_map=RISK_COLORS)
+        fig.update_layout(height=350, xaxis_title="Gender",
+                         yaxis_title="Count", showlegend=True)
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Trends over time
+    st.markdown("#### 📈 Screening Trends (Last 30 Days)")
+
+    trend_data = summary['trend']
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=trend_data['Date'],
+        y=trend_data['Screenings'],
+        mode='lines+markers',
+        name='Total Screenings',
+        line=dict(color='#667eea', width=3),
+        marker=dict(size=8)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=trend_data['Date'],
+        y=trend_data['High_Risk'],
+        mode='lines+markers',
+        name='High Risk Cases',
+        line=dict(color='#dc3545', width=3),
+        marker=dict(size=8)
+    ))
+
+    fig.update_layout(
+        height=400,
+        xaxis_title="Date",
+        yaxis_title="Count",
+        hovermode='x unified',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1)
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # Advanced analytics
+    st.markdown("<br>", unsafe_allow_html=True)
+    st.markdown("#### 🔬 Advanced Analytics")
+
+    adv_col1, adv_col2 = st.columns(2)
+
+    with adv_col1:
+        # BMI vs Risk scatter (individual points: the 500 most recent screenings)
+        st.markdown("**BMI vs Blood Pressure by Risk**")
+
+        recent = recent_screenings(version, limit=500)
+
+        fig = px.scatter(recent,
+                        x='bmi',
+                        y='systolic_bp',
+                        color='risk_level',
+                        color_discrete_map=RISK_COLORS,
+                        opacity=0.6,
+                        hover_data=['Age_Group', 'gender'],
+                        labels={'bmi': 'BMI', 'systolic_bp': 'BP_Systolic', 'risk_level': 'Risk_Level',
+                                'gender': 'Gender'})
+        fig.update_layout(height=350)
+        st.plotly_chart(fig, use_container_width=True)
+
+    with adv_col2:
+        # High risk prevalence by location
+        st.markdown("**High Risk Prevalence by Location**")
+
+        high_risk_prev = summary['high_risk_prev']
+
+        fig = px.bar(high_risk_prev,
+                     x='Location',
+                     y='High_Risk_Percentage',
+                     color='High_Risk_Percentage',
+                     color_continuous_scale=['#28a745', '#ffc107', '#dc3545'],
+                     text='High_Risk_Percentage')
+        fig.update_traces(texttemplate='%{text:.1f}%', textposition='outside')
+        fig.update_layout(height=350, yaxis_title="High Risk %",
+                         showlegend=False)
+        st.plotly_chart(fig, use_container_width=True)
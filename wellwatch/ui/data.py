@@ -0,0 +1,149 @@
+"""
+Cached datasets for the Streamlit pages
+
+Query results are cached with st.cache_data, which every session of the
+server process shares, and keyed on the screenings table_version(). A
+rerun reads that one counter. Any committed write to screenings, whether
+from this app, an ingest job or a re-scoring run, changes it and with it
+the cache key, so fifty supervisors on the dashboard share one query per
+change instead of running it on every rerun. DATA_TTL bounds how long an
+entry is kept once nobody asks for it.
+"""
+
+import pandas as pd
+import streamlit as st
+
+from wellwatch.analytics import age_band, crosstab, prevalence
+from wellwatch.scoring import RISK_LEVELS
+from wellwatch.storage import (DB_PATH, aggregate_rollups, fetch_screenings, screening_chw_ids, screening_stats,
+                               table_version)
+
+DATA_TTL = 600  # seconds
+DATA_MAX_ENTRIES = 8
+PAGE_MAX_ENTRIES = 256  # Admin Panel pages across filter combinations and sessions
+ADMIN_PAGE_SIZE = 50
+TREND_DAYS = 30  # calendar days in the dashboard trend, ending today
+
+ADMIN_COLUMNS = {
+    'patient_id': 'Patient_ID',
+    'screening_date': 'Date',
+    'age': 'Age',
+    'gender': 'Gender',
+    'location': 'Location',
+    'risk_level': 'Risk_Level',
+    'risk_score': 'Risk_Score',
+    'bmi': 'BMI',
+    'systolic_bp': 'BP_Systolic',
+    'fasting_glucose': 'Glucose',
+    'chw_id': 'CHW_ID'
+}
+
+def screenings_version():
+    """Current screenings change counter (read on every rerun, never cached)"""
+    return table_version('screenings')
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def recent_screenings(version, limit=500):
+    """The most recent screenings with an Age_Group column, as of screenings version"""
+    recent = fetch_screenings(limit=limit)
+    recent['Age_Group'] = age_band(recent['age'])
+    return recent
+
+def _admin_frame(screenings):
+    """fetch_screenings() rows with the Admin Panel's display columns"""
+    records = screenings.rename(columns=ADMIN_COLUMNS)[list(ADMIN_COLUMNS.values())]
+    records['Date'] = pd.to_datetime(records['Date'])
+    records['BMI'] = records['BMI'].round(1)
+    return records
+
+@st.cache_data(ttl=DATA_TTL, max_entries=PAGE_MAX_ENTRIES, show_spinner=False)
+def screening_page(version, filters, after=None, limit=ADMIN_PAGE_SIZE):
+    """
+    One page of Admin Panel records
+
+    Parameters:
+    -----------
+    version : screenings version (the cache key)
+    filters : tuple of (name, value) pairs for screening_filters()
+    after : keyset cursor returned with the previous page (None: first page)
+    limit : rows per page
+
+    Returns:
+    --------
+    (records, next_cursor) with next_cursor None on the last page
+    """
+    page = fetch_screenings(limit=limit + 1, after=after, **dict(filters))
+    next_cursor = None
+    if len(page) > limit:
+        page = page.iloc[:limit]
+        next_cursor = (page['screening_date'].iloc[-1], int(page['id'].iloc[-1]))
+    return _admin_frame(page), next_cursor
+
+@st.cache_data(ttl=DATA_TTL, max_entries=PAGE_MAX_ENTRIES, show_spinner=False)
+def screening_summary(version, filters):
+    """Count, high-risk count and averages over the filtered screenings"""
+    return screening_stats(**dict(filters))
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def chw_options(version):
+    """CHW IDs that have screenings, for the Admin Panel filter"""
+    return screening_chw_ids()
+
+@st.cache_data(ttl=DATA_TTL, max_entries=DATA_MAX_ENTRIES, show_spinner=False)
+def dashboard_summary(version, today):
+    """
+    Community Dashboard metrics and chart tables (see dashboard_metrics())
+
+    Parameters:
+    -----------
+    version : screenings version the rollups are read at (the cache key)
+    today : date the "this week" count and the trend end on
+    """
+    return dashboard_metrics(today)
+
+def dashboard_metrics(today, db_path=DB_PATH):
+    """
+    Community Dashboard metrics and chart tables
+
+    The rollups are grouped in SQL: once over every day by location, age
+    group, gender and risk level (a few hundred rows however long the
+    rollups go back) and once by day over the TREND_DAYS days of the trend.
+    """
+    today = pd.Timestamp(today).normalize()
+    groups = aggregate_rollups(['location', 'age_group', 'gender', 'risk_level'], db_path=db_path)
+
+    def rollup_crosstab(index, normalize=False):
+        """Screenings per index value and risk level, from the rollup counts"""
+        return crosstab(groups[index], groups['risk_level'], weights=groups['screenings'],
+                        normalize=normalize, column_order=RISK_LEVELS)
+
+    total_screened = int(groups['screenings'].sum())
+
+    # Screenings per calendar day, days without any included as zeros
+    trend_start = today - pd.Timedelta(days=TREND_DAYS - 1)
+    daily = aggregate_rollups(['day', 'risk_level'], trend_start, today, db_path=db_path)
+    daily['day'] = pd.to_datetime(daily['day'])
+    trend_data = daily.assign(
+        High_Risk=daily['screenings'].where(daily['risk_level'] == 'High', 0)
+    ).groupby('day')[['screenings', 'High_Risk']].sum()
+    trend_data = trend_data.reindex(pd.date_range(trend_start, today), fill_value=0).rename_axis('day').reset_index()
+    trend_data.columns = ['Date', 'Screenings', 'High_Risk']
+
+    high_risk_prev = prevalence(groups['location'], groups['risk_level'] == 'High',
+                                weights=groups['screenings']).reset_index()
+    high_risk_prev.columns = ['Location', 'High_Risk_Percentage']
+
+    return {
+        'total_screened': total_screened,
+        'this_week': int(trend_data.loc[trend_data['Date'] > today - pd.Timedelta(days=7), 'Screenings'].sum()),
+        'high_risk_pct': groups.loc[groups['risk_level'] == 'High', 'screenings'].sum() / max(total_screened, 1) * 100,
+        'avg_bmi': groups['sum_bmi'].sum() / max(groups['bmi_count'].sum(), 1),
+        'avg_bp': groups['sum_systolic_bp'].sum() / max(groups['systolic_bp_count'].sum(), 1),
+        'avg_glucose': groups['sum_fasting_glucose'].sum() / max(groups['fasting_glucose_count'].sum(), 1),
+        'risk_counts': groups.groupby('risk_level')['screenings'].sum(),
+        'location_risk': rollup_crosstab('location'),
+        'age_risk': rollup_crosstab('age_group', normalize=True),
+        'gender_risk': rollup_crosstab('gender'),
+        'trend': trend_data,
+        'high_risk_prev': high_risk_prev,
+    }
@@ -0,0 +1,83 @@
+"""
+Diagnostics page (hidden, ?page=diagnostics): stage timing histograms,
+cache statistics and cProfile captures of page reruns
+"""
+
+import pandas as pd
+import streamlit as st
+
+from wellwatch.telemetry import PROFILES, TIMINGS
+from wellwatch.ui.common import load_explainer, load_model_artifacts, load_patient_history
+
+TIMING_COLUMNS = {
+    'count': 'Count',
+    'mean_ms': 'Mean (ms)',
+    'p50_ms': 'p50 (ms)',
+    'p99_ms': 'p99 (ms)',
+    'max_ms': 'Max (ms)',
+    'total_s': 'Total (s)',
+}
+
+def timing_frame():
+    """One row per span with its histogram summary"""
+    summary = TIMINGS.summary()
+    frame = pd.DataFrame.from_dict(summary, orient='index', columns=list(TIMING_COLUMNS))
+    return frame.rename(columns=TIMING_COLUMNS).rename_axis('Span').reset_index()
+
+def cache_frame():
+    """ResultCache.stats() of the shared prediction, SHAP and patient history caches"""
+    caches = {}
+    engine = load_model_artifacts()
+    if engine is not None and engine.cache is not None:
+        caches['Predictions'] = engine.cache.stats()
+    explainer = load_explainer()
+    if explainer is not None and explainer.cache is not None:
+        caches['SHAP explanations'] = explainer.cache.stats()
+    caches['Patient timelines'] = load_patient_history().stats()
+    return pd.DataFrame.from_dict(caches, orient='index').rename_axis('Cache').reset_index()
+
+def _set_profiling():
+    # Widget keys are dropped on pages that do not draw the widget, so the
+    # setting other pages read lives under its own key
+    st.session_state.profile_reruns = st.session_state.profile_toggle
+
+def render():
+    st.markdown('<p class="hero-title" style="font-size: 4.5rem;">🛠️ Diagnostics</p>', unsafe_allow_html=True)
+    st.markdown('<p class="hero-subtitle">Where the time goes in this server process</p>', unsafe_allow_html=True)
+
+    # Stage timings
+    st.markdown("### ⏱️ Stage Timings")
+    if not TIMINGS.enabled:
+        st.warning("⚠️ Timing spans are disabled (WELLWATCH_TIMING=0)")
+    timings = timing_frame()
+    if timings.empty:
+        st.info("No spans recorded yet. Run a screening and come back.")
+    else:
+        st.dataframe(timings.style.format({column: '{:.2f}' for column in list(TIMING_COLUMNS.values())[1:]},
+                                          na_rep='-'),
+                     use_container_width=True, hide_index=True)
+        st.caption("All sessions since the server started. Percentiles are estimated from histogram "
+                   "buckets; the same histograms are served by the API's GET /metrics.")
+    if st.button("🔄 Reset Timings"):
+        TIMINGS.reset()
+        st.rerun()
+
+    # Caches
+    st.markdown("### 🗄️ Caches")
+    st.dataframe(cache_frame().style.format({'hit_rate': '{:.1%}'}), use_container_width=True, hide_index=True)
+    st.caption("Micro-batching statistics exist only in the API process (GET /health, GET /metrics).")
+
+    # Profiles
+    st.markdown("### 🔬 Profiles")
+    st.toggle("Profile page reruns (cProfile)", value=st.session_state.get('profile_reruns', PROFILES.enabled),
+              key="profile_toggle", on_change=_set_profiling,
+              help="Every rerun in this session is profiled and slows down several times while this is on")
+    profiles = PROFILES.recent()
+    if not profiles:
+        st.info("No profiles captured. Switch profiling on and run a screening.")
+    for capture in profiles:
+        with st.expander(f"{capture['captured_at']} · {capture['name']} · {capture['seconds'] * 1000:.0f} ms"):
+            st.code(capture['stats'], language=None)
+    if profiles and st.button("🗑️ Clear Profiles"):
+        PROFILES.clear()
+        st.rerun()
@@ -0,0 +1,157 @@
+"""
+Home page: programme overview, quick actions and headline charts
+"""
+
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+def render():
+    # Hero section
+    st.markdown('<p class="hero-title" style="font-size: 4.5rem;">🩺 WellWatch India</p>', unsafe_allow_html=True)
+    st.markdown('<p class="hero-subtitle">AI-powered community screening for early detection of lifestyle diseases</p>', unsafe_allow_html=True)
+
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.markdown("""
+        <div class='metric-card'>
+            <h3 style='margin: 0; font-size: 2.5rem;'>2,000+</h3>
+            <p style='margin: 0.5rem 0 0 0;'>Total Screenings</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div class='metric-card'>
+            <h3 style='margin: 0; font-size: 2.5rem;'>87.3%</h3>
+            <p style='margin: 0.5rem 0 0 0;'>Model Accuracy</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown("""
+        <div class='metric-card'>
+            <h3 style='margin: 0; font-size: 2.5rem;'>18.5%</h3>
+            <p style='margin: 0.5rem 0 0 0;'>High Risk Detected</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col4:
+        st.markdown("""
+        <div class='metric-card'>
+            <h3 style='margin: 0; font-size: 2.5rem;'>45</h3>
+            <p style='margin: 0.5rem 0 0 0;'>Active CHWs</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # About section
+    col_left, col_right = st.columns([1, 1])
+
+    with col_left:
+        st.markdown('<p class="section-header">📋 What is WellWatch India?</p>', unsafe_allow_html=True)
+
+        st.markdown("""
+        <div class='info-card'>
+            <p style='font-size: 1.05rem; line-height: 1.8; color: #2c3e50;'>
+                WellWatch India is an AI-powered early detection system for lifestyle diseases,
+                designed specifically for rural and semi-urban communities. Our system empowers
+                community health workers with mobile screening tools to identify high-risk
+                individuals before disease onset.
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        st.markdown("### 🎯 Key Features")
+
+        features = [
+            "🤖 **AI-Powered Risk Assessment** - 87% accuracy in predicting chronic disease risk",
+            "📱 **Mobile-First Design** - Works offline on basic smartphones",
+            "🌍 **Multi-Language Support** - Hindi, Tamil, Bengali, and more",
+            "📊 **Real-Time Dashboards** - Data-driven insights for health managers",
+            "🎯 **Early Intervention** - Personalized recommendations and alerts",
+            "💾 **Offline Capability** - No internet required for screening"
+        ]
+
+        for feature in features:
+            st.markdown(f"- {feature}")
+
+    with col_right:
+        st.markdown('<p class="section-header">🚀 How It Works</p>', unsafe_allow_html=True)
+
+        steps = [
+            ("1️⃣ **Data Collection**", "CHWs use mobile app to record patient vitals and risk factors"),
+            ("2️⃣ **AI Analysis**", "Machine learning model analyzes data and predicts risk level"),
+            ("3️⃣ **Risk Assessment**", "Immediate risk classification: Low, Medium, or High"),
+            ("4️⃣ **Intervention**", "Personalized recommendations and referrals"),
+            ("5️⃣ **Follow-Up**", "Continuous tracking and monitoring through the system")
+        ]
+
+        for title, desc in steps:
+            st.markdown(f"""
+            <div class='info-card'>
+                <h4 style='color: #667eea; margin: 0 0 0.5rem 0;'>{title}</h4>
+                <p style='margin: 0; color: #555;'>{desc}</p>
+            </div>
+            """, unsafe_allow_html=True)
+
+    st.markdown("<br>", unsafe_allow_html=True)
+
+    # Call to action buttons
+    st.markdown('<p class="section-header">⚡ Quick Actions</p>', unsafe_allow_html=True)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        if st.button("🧍 Start Screening", use_container_width=True, type="primary"):
+            st.session_state.page_override = "🧍 Start Screening"
+            st.rerun()
+
+    with col2:
+        if st.button("📊 View Dashboard", use_container_width=True):
+            st.session_state.page_override = "📊 Community Dashboard"
+            st.rerun()
+
+    with col3:
+        if st.button("👤 Judge Demo", use_container_width=True):
+            st.session_state.page_override = "👤 Judge Mode"
+            st.rerun()
+
+    # Impact section
+    st.markdown("<br><br>", unsafe_allow_html=True)
+    st.markdown('<p class="section-header">🏆 Impact Metrics</p>', unsafe_allow_html=True)
+
+    impact_col1, impact_col2 = st.columns(2)
+
+    with impact_col1:
+        # Create a bar chart
+        impact_data = pd.DataFrame({
+            'Metric': ['Lives Screened', 'Early Detections', 'Villages Covered', 'Active CHWs'],
+            'Value': [2000, 370, 12, 45]
+        })
+
+        fig = px.bar(impact_data, x='Metric', y='Value',
+                     color='Value',
+                     color_continuous_scale='Viridis',
+                     title='Program Reach & Impact')
+        fig.update_layout(showlegend=False, height=350)
+        st.plotly_chart(fig, use_container_width=True)
+
+    with impact_col2:
+        # Risk distribution pie
+        risk_dist = pd.DataFrame({
+            'Risk Level': ['Low Risk', 'Medium Risk', 'High Risk'],
+            'Count': [1100, 530, 370]
+        })
+
+        fig = px.pie(risk_dist, values='Count', names='Risk Level',
+                     color='Risk Level',
+                     color_discrete_map={'Low Risk': '#28a745',
+                                        'Medium Risk': '#ffc107',
+                                        'High Risk': '#dc3545'},
+                     title='Risk Distribution in Screened Population')
+        fig.update_layout(height=350)
+        st.plotly_chart(fig, use_container_width=True)
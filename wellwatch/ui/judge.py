@@ -0,0 +1,206 @@
+"""
+Judge Mode page: one-click predictions for a Low, Medium and High risk profile
+"""
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from wellwatch.scoring import expand_batch_results, predict_risk_batch
+from wellwatch.ui.common import create_gauge_chart, create_probability_chart
+
+JUDGE_CASES = {
+    'Low Risk - Healthy Young Adult': {
+        'age': 28,
+        'gender': 'Female',
+        'location': 'Urban',
+        'height_cm': 165,
+        'weight_kg': 58,
+        'systolic_bp': 115,
+        'diastolic_bp': 75,
+        'pulse_rate': 70,
+        'fasting_glucose': 92,
+        'smoking': 0,
+        'alcohol': 0,
+        'physical_activity': 'High',
+        'diet_quality': 'Good',
+        'family_diabetes': 0,
+        'family_hypertension': 0,
+        'family_heart_disease': 0,
+        'fatigue': 0,
+        'breathlessness': 0,
+        'chest_pain': 0,
+        'frequent_urination': 0,
+        'blurred_vision': 0
+    },
+    'Medium Risk - Middle-aged with Factors': {
+        'age': 48,
+        'gender': 'Male',
+        'location': 'Semi-Urban',
+        'height_cm': 172,
+        'weight_kg': 82,
+        'systolic_bp': 138,
+        'diastolic_bp': 88,
+        'pulse_rate': 80,
+        'fasting_glucose': 115,
+        'smoking': 1,
+        'alcohol': 0,
+        'physical_activity': 'Low',
+        'diet_quality': 'Average',
+        'family_diabetes': 1,
+        'family_hypertension': 0,
+        'family_heart_disease': 0,
+        'fatigue': 1,
+        'breathlessness': 0,
+        'chest_pain': 0,
+        'frequent_urination': 0,
+        'blurred_vision': 0
+    },
+    'High Risk - Senior with Multiple Conditions': {
+        'age': 62,
+        'gender': 'Male',
+        'location': 'Rural',
+        'height_cm': 168,
+        'weight_kg': 88,
+        'systolic_bp': 158,
+        'diastolic_bp': 98,
+        'pulse_rate': 88,
+        'fasting_glucose': 142,
+        'smoking': 1,
+        'alcohol': 1,
+        'physical_activity': 'None',
+        'diet_quality': 'Poor',
+        'family_diabetes': 1,
+        'family_hypertension': 1,
+        'family_heart_disease': 1,
+        'fatigue': 1,
+        'breathlessness': 1,
+        'chest_pain': 0,
+        'frequent_urination': 1,
+        'blurred_vision': 1
+    }
+}
+
+@st.cache_data
+def judge_results():
+    """Rule-based predictions for JUDGE_CASES, keyed by case name"""
+    batch = predict_risk_batch(pd.DataFrame(list(JUDGE_CASES.values())))
+    return dict(zip(JUDGE_CASES, expand_batch_results(batch)))
+
+def render():
+    st.markdown('<p class="hero-title" style="font-size: 4.5rem;">👤 Judge Demonstration Mode</p>', unsafe_allow_html=True)
+    st.markdown('<p class="hero-subtitle">One-click demo showing predictions across all risk categories</p>', unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class='success-box'>
+        <h4 style='margin: 0 0 0.5rem 0;'>🎯 Quick Evaluation Mode</h4>
+        <p style='margin: 0;'>This mode demonstrates the model's performance with three pre-configured
+        test cases representing Low, Medium, and High risk profiles. Click the button below to run all predictions.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    if st.button("🚀 Run Judge Demo (All 3 Cases)", use_container_width=True, type="primary"):
+        # Run predictions (memoized: the cases never change)
+        results = judge_results()
+
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("---")
+        st.markdown("## 📊 Demo Results")
+
+        # Display each case
+        for i, (case_name, result) in enumerate(results.items(), 1):
+            patient_data = JUDGE_CASES[case_name]
+
+            st.markdown(f"### {i}. {case_name}")
+
+            col1, col2, col3 = st.columns([2, 2, 3])
+
+            with col1:
+                # Risk card
+                risk_level = result['risk_level']
+                risk_score = result['risk_score']
+
+                if risk_level == "Low":
+                    card_class = "risk-card-low"
+                    emoji = "✅"
+                elif risk_level == "Medium":
+                    card_class = "risk-card-medium"
+                    emoji = "⚠️"
+                else:
+                    card_class = "risk-card-high"
+                    emoji = "🚨"
+
+                st.markdown(f"""
+                <div class='{card_class}' style='padding: 1.5rem;'>
+                    <h3 style='margin: 0;'>{emoji} {risk_level.upper()}</h3>
+                    <p style='margin: 0.5rem 0 0 0; font-size: 1.2rem;'>
+                        Score: <strong>{risk_score}/100</strong>
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+
+                st.markdown(f"""
+                **Patient Profile:**
+                - Age: {patient_data['age']} | Gender: {patient_data['gender']}
+                - BMI: {result['bmi']}
+                - BP: {patient_data['systolic_bp']}/{patient_data['diastolic_bp']}
+                - Glucose: {patient_data['fasting_glucose']} mg/dL
+                """)
+
+            with col2:
+                # Gauge
+                st.plotly_chart(create_gauge_chart(risk_score),
+                              use_container_width=True, key=f"gauge_{i}")
+
+            with col3:
+                # Probability bar
+                st.plotly_chart(create_probability_chart(result['risk_probabilities'], label='Level', height=250,
+                                                         title="Risk Probabilities"),
+                                use_container_width=True, key=f"prob_{i}")
+
+            # Recommendations
+            st.markdown("**Key Recommendations:**")
+            for rec in result['recommendations'][:3]:
+                st.markdown(f"- {rec}")
+
+            if i < len(results):
+                st.markdown("---")
+
+        # Summary comparison
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("## 🎯 Summary Comparison")
+
+        comparison_df = pd.DataFrame({
+            'Test Case': list(results.keys()),
+            'Risk Score': [r['risk_score'] for r in results.values()],
+            'Risk Level': [r['risk_level'] for r in results.values()],
+            'High Risk Prob': [f"{r['risk_probabilities']['High']*100:.1f}%" for r in results.values()]
+        })
+
+        st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+
+        # Visualization
+        fig = go.Figure()
+
+        case_names = ['Low Risk Case', 'Medium Risk Case', 'High Risk Case']
+        risk_scores_list = [r['risk_score'] for r in results.values()]
+        colors_list = ['#28a745', '#ffc107', '#dc3545']
+
+        fig.add_trace(go.Bar(
+            x=case_names,
+            y=risk_scores_list,
+            marker_color=colors_list,
+            text=risk_scores_list,
+            texttemplate='%{text}',
+            textposition='outside'
+        ))
+
+        fig.update_layout(
+            title="Risk Scores Across Test Cases",
+            yaxis_title="Risk Score",
+            xaxis_title="",
+            height=400,
+            showlegend=False
+        )
+
+        st.plotly_chart(fig, use_container_width=True)
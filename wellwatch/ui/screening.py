@@ -0,0 +1,393 @@
+"""
+Start Screening page: patient form, risk assessment, explanation, PDF report
+and the patient's screening history
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from wellwatch.reports import report_pdf
+from wellwatch.scoring import predict_risk_simple
+from wellwatch.storage import save_screening
+from wellwatch.telemetry import observe, span
+from wellwatch.ui.common import (create_contribution_chart, create_gauge_chart, create_probability_chart,
+                                 load_explainer, load_model_artifacts, load_patient_history)
+
+GENDERS = ["Male", "Female"]
+LOCATIONS = ["Rural", "Semi-Urban", "Urban"]
+
+TREND_METRICS = {
+    'risk_score': ("Risk Score", "{:.0f}"),
+    'systolic_bp': ("Systolic BP", "{:.0f} mmHg"),
+    'fasting_glucose': ("Glucose", "{:.0f} mg/dL"),
+    'bmi': ("BMI", "{:.1f}"),
+}
+
+def new_patient_id():
+    """
+    Suggested ID for a new patient
+
+    Kept in the session until a screening is saved under it, so the form
+    does not make up a different ID on every rerun.
+    """
+    if 'new_patient_id' not in st.session_state:
+        st.session_state.new_patient_id = f"PAT{np.random.randint(10000, 99999)}"
+    return st.session_state.new_patient_id
+
+def render_timeline(timeline):
+    """Latest values with the change since the previous visit, and the visit table"""
+    screenings = timeline['screenings']
+    latest = screenings[-1]
+    deltas = latest['deltas'] or {}
+
+    st.markdown(f"**{timeline['screening_count']} screening(s)** since "
+                f"{timeline['first_screening'][:10]}, last on {timeline['last_screening'][:10]}")
+
+    for column, metric_col in zip(TREND_METRICS, st.columns(len(TREND_METRICS))):
+        label, fmt = TREND_METRICS[column]
+        value, delta = latest[column], deltas.get(column)
+        with metric_col:
+            # Higher readings are worse, so increases show in red
+            st.metric(label, fmt.format(value) if value is not None else "–",
+                      f"{delta:+g} since last visit" if delta is not None else None,
+                      delta_color="inverse")
+
+    visits = pd.DataFrame(screenings[::-1], columns=['screening_date', 'risk_level', 'risk_score', 'systolic_bp',
+                                                      'diastolic_bp', 'fasting_glucose', 'bmi', 'chw_id'])
+    visits.columns = ['Date', 'Risk_Level', 'Risk_Score', 'BP_Systolic', 'BP_Diastolic', 'Glucose', 'BMI', 'CHW_ID']
+    visits['BMI'] = visits['BMI'].round(1)
+    st.dataframe(visits, use_container_width=True, hide_index=True)
+
+def render():
+    st.markdown('<p class="hero-title" style="font-size: 4.5rem;">🧍 Patient Risk Assessment</p>', unsafe_allow_html=True)
+    st.markdown('<p class="hero-subtitle">Complete screening form for chronic disease risk evaluation</p>', unsafe_allow_html=True)
+
+    # Returning patients: history first, and the form starts from their details
+    history = load_patient_history()
+    with st.expander("📈 Returning Patient? Look Up Screening History"):
+        lookup_id = st.text_input("Patient ID", key="history_lookup", placeholder="PAT12345").strip()
+        returning = history.timeline(lookup_id) if lookup_id else None
+        if returning and returning['screening_count']:
+            render_timeline(returning)
+        elif lookup_id:
+            st.info(f"No screenings found for {lookup_id}")
+    if not (returning and returning['screening_count']):
+        returning = None
+
+    with st.form("screening_form"):
+        # Personal Information
+        st.markdown("""
+        <div class="form-section">
+            <h3 style="margin-top: 0; color: #2c3e50;">👤 Personal Information</h3>
+        """, unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            patient_id = st.text_input("Patient ID", value=returning['patient_id'] if returning else new_patient_id(),
+                                      help="Unique patient identifier")
+            known_age = returning['age'] if returning else None
+            age = st.number_input("Age (years)", min_value=18, max_value=100,
+                                 value=known_age if known_age is not None and 18 <= known_age <= 100 else 45,
+                                 help="Patient's age in years")
+            chw_id = st.text_input("CHW ID", value="CHW001",
+                                  help="Community Health Worker conducting the screening")
+
+        with col2:
+            known_gender = returning['gender'] if returning else None
+            gender = st.selectbox("Gender", GENDERS,
+                                 index=GENDERS.index(known_gender) if known_gender in GENDERS else 0,
+                                 help="Biological gender")
+            known_location = returning['location'] if returning else None
+            location = st.selectbox("Location", LOCATIONS,
+                                   index=LOCATIONS.index(known_location) if known_location in LOCATIONS else 0,
+                                   help="Patient's residential area type")
+
+        with col3:
+            height = st.number_input("Height (cm)", min_value=100, max_value=250, value=165,
+                                    help="Height in centimeters")
+            weight = st.number_input("Weight (kg)", min_value=30, max_value=200, value=70,
+                                    help="Weight in kilograms")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Vital Signs
+        st.markdown("""
+        <div class="form-section">
+            <h3 style="margin-top: 0; color: #2c3e50;">🩺 Vital Signs</h3>
+        """, unsafe_allow_html=True)
+
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            systolic_bp = st.number_input("Systolic BP (mmHg)", min_value=70, max_value=220, value=120,
+                                         help="Upper blood pressure reading")
+
+        with col2:
+            diastolic_bp = st.number_input("Diastolic BP (mmHg)", min_value=40, max_value=140, value=80,
+                                          help="Lower blood pressure reading")
+
+        with col3:
+            pulse = st.number_input("Pulse Rate (bpm)", min_value=40, max_value=150, value=75,
+                                   help="Heart rate in beats per minute")
+
+        with col4:
+            glucose = st.number_input("Fasting Glucose (mg/dL)", min_value=50, max_value=300, value=100,
+                                     help="Blood sugar level after fasting")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Lifestyle Factors
+        st.markdown("""
+        <div class="form-section">
+            <h3 style="margin-top: 0; color: #2c3e50;">🚬 Lifestyle Factors</h3>
+        """, unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            smoking = st.checkbox("Smoking", help="Does patient smoke tobacco?")
+            alcohol = st.checkbox("Alcohol Consumption", help="Regular alcohol consumption?")
+            physical_activity = st.select_slider("Physical Activity Level",
+                                                options=["None", "Low", "Moderate", "High"],
+                                                value="Moderate",
+                                                help="Weekly physical activity level")
+
+        with col2:
+            diet_quality = st.select_slider("Diet Quality",
+                                           options=["Poor", "Average", "Good"],
+                                           value="Average",
+                                           help="Overall diet quality assessment")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Family History
+        st.markdown("""
+        <div class="form-section">
+            <h3 style="margin-top: 0; color: #2c3e50;">👨‍👩‍👧‍👦 Family History</h3>
+        """, unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            family_diabetes = st.checkbox("Diabetes in Family", help="Family history of diabetes")
+
+        with col2:
+            family_hypertension = st.checkbox("Hypertension in Family", help="Family history of high BP")
+
+        with col3:
+            family_heart_disease = st.checkbox("Heart Disease in Family", help="Family history of heart conditions")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Symptoms
+        st.markdown("""
+        <div class="form-section">
+            <h3 style="margin-top: 0; color: #2c3e50;">🩺 Symptoms</h3>
+        """, unsafe_allow_html=True)
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            fatigue = st.checkbox("Chronic Fatigue", help="Persistent tiredness")
+            breathlessness = st.checkbox("Breathlessness", help="Shortness of breath")
+
+        with col2:
+            chest_pain = st.checkbox("Chest Pain", help="Chest discomfort or pain")
+            frequent_urination = st.checkbox("Frequent Urination", help="Increased urination frequency")
+
+        with col3:
+            blurred_vision = st.checkbox("Blurred Vision", help="Vision problems")
+
+        st.markdown('</div>', unsafe_allow_html=True)
+
+        # Submit button
+        st.markdown("<br>", unsafe_allow_html=True)
+        submitted = st.form_submit_button("🔍 Assess Risk", use_container_width=True, type="primary")
+
+    # Process submission
+    if submitted:
+        assessment_started = time.perf_counter()
+
+        # Calculate BMI
+        bmi = weight / ((height/100) ** 2)
+
+        # Prepare patient data
+        patient_data = {
+            'patient_id': patient_id,
+            'chw_id': chw_id,
+            'age': age,
+            'gender': gender,
+            'location': location,
+            'height_cm': height,
+            'weight_kg': weight,
+            'systolic_bp': systolic_bp,
+            'diastolic_bp': diastolic_bp,
+            'pulse_rate': pulse,
+            'fasting_glucose': glucose,
+            'smoking': int(smoking),
+            'alcohol': int(alcohol),
+            'physical_activity': physical_activity,
+            'diet_quality': diet_quality,
+            'family_diabetes': int(family_diabetes),
+            'family_hypertension': int(family_hypertension),
+            'family_heart_disease': int(family_heart_disease),
+            'fatigue': int(fatigue),
+            'breathlessness': int(breathlessness),
+            'chest_pain': int(chest_pain),
+            'frequent_urination': int(frequent_urination),
+            'blurred_vision': int(blurred_vision)
+        }
+
+        # Get prediction (rule-based fallback if the model could not be loaded)
+        engine = load_model_artifacts()
+        with span('screening.predict'):
+            if engine is not None:
+                result = engine.predict(patient_data)
+            else:
+                result = predict_risk_simple(patient_data)
+
+        # Persist the screening
+        try:
+            with span('screening.save'):
+                screening_id = save_screening(patient_data, result, queue_sync=True)
+        except Exception:
+            screening_id = None
+        if screening_id is not None and patient_id == st.session_state.get('new_patient_id'):
+            del st.session_state.new_patient_id  # the next patient gets a new ID
+
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("---")
+        st.markdown('<p class="section-header">🎯 Risk Assessment Results</p>', unsafe_allow_html=True)
+
+        # Display results in columns
+        result_col1, result_col2 = st.columns([1, 1])
+
+        with result_col1:
+            # Risk card
+            risk_level = result['risk_level']
+            risk_score = result['risk_score']
+
+            if risk_level == "Low":
+                card_class = "risk-card-low"
+                emoji = "✅"
+                color = "#28a745"
+            elif risk_level == "Medium":
+                card_class = "risk-card-medium"
+                emoji = "⚠️"
+                color = "#ffc107"
+            else:
+                card_class = "risk-card-high"
+                emoji = "🚨"
+                color = "#dc3545"
+
+            st.markdown(f"""
+            <div class='{card_class}'>
+                <h2 class='risk-title' style='color: {color};'>{emoji} {risk_level.upper()} RISK</h2>
+                <p class='risk-score'>Risk Score: <strong>{risk_score}/100</strong></p>
+                <p style='margin: 0; font-size: 1.1rem;'>Patient ID: <strong>{patient_id}</strong></p>
+            </div>
+            """, unsafe_allow_html=True)
+
+            # Vital signs metrics
+            st.markdown("### 📊 Vital Signs Summary")
+
+            metric_col1, metric_col2 = st.columns(2)
+
+            with metric_col1:
+                st.metric("BMI", f"{result['bmi']}",
+                         delta="Normal" if result['bmi'] < 25 else "High",
+                         delta_color="normal" if result['bmi'] < 25 else "inverse")
+                st.metric("Blood Pressure", f"{systolic_bp}/{diastolic_bp}",
+                         delta="Normal" if systolic_bp < 130 else "High",
+                         delta_color="normal" if systolic_bp < 130 else "inverse")
+
+            with metric_col2:
+                st.metric("Glucose", f"{glucose} mg/dL",
+                         delta="Normal" if glucose < 100 else "High",
+                         delta_color="normal" if glucose < 100 else "inverse")
+                st.metric("Pulse", f"{pulse} bpm",
+                         delta="Normal" if 60 <= pulse <= 100 else "Check",
+                         delta_color="normal" if 60 <= pulse <= 100 else "inverse")
+
+        with result_col2:
+            # Gauge chart
+            with span('screening.chart.gauge'):
+                st.plotly_chart(create_gauge_chart(risk_score, "Risk Score"),
+                              use_container_width=True)
+
+            # Probability breakdown
+            st.markdown("### 📊 Probability Breakdown")
+
+            with span('screening.chart.probabilities'):
+                st.plotly_chart(create_probability_chart(result['risk_probabilities']), use_container_width=True)
+
+        # Patient-level explanation
+        explainer = load_explainer() if engine is not None else None
+        if explainer is not None:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("### 🧠 Key Risk Factors")
+            st.markdown(f"Features that most influenced this **{risk_level.upper()} RISK** assessment "
+                        f"(positive values push towards {risk_level} risk):")
+
+            with span('screening.explain'):
+                explanation = explainer.explain(patient_data, risk_level=risk_level, top=6)
+            with span('screening.chart.contributions'):
+                st.plotly_chart(create_contribution_chart(explanation), use_container_width=True)
+
+        # Changes since earlier visits (the timeline includes this screening)
+        with span('screening.history'):
+            timeline = history.timeline(patient_id) if screening_id is not None else None
+        if timeline is not None and timeline['screening_count'] > 1:
+            st.markdown("<br>", unsafe_allow_html=True)
+            st.markdown("### 📈 Patient History")
+            render_timeline(timeline)
+
+        # Recommendations section
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.markdown("### 💡 Personalized Recommendations")
+
+        rec_col1, rec_col2 = st.columns(2)
+
+        for i, rec in enumerate(result['recommendations']):
+            if i % 2 == 0:
+                with rec_col1:
+                    st.markdown(f"""
+                    <div class='info-card'>
+                        <p style='margin: 0; font-size: 1rem;'>{rec}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+            else:
+                with rec_col2:
+                    st.markdown(f"""
+                    <div class='info-card'>
+                        <p style='margin: 0; font-size: 1rem;'>{rec}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+
+        # Action buttons
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        action_col1, action_col2, action_col3 = st.columns(3)
+
+        with action_col1:
+            with span('screening.report'):
+                report = report_pdf(patient_data, result)
+            st.download_button("📄 Download PDF Report", data=report,
+                               file_name=f"health_report_{patient_id}.pdf", mime="application/pdf",
+                               use_container_width=True)
+
+        with action_col2:
+            if st.button("📧 Send to Patient", use_container_width=True):
+                st.success("✅ SMS/Email sent to patient!")
+
+        with action_col3:
+            if screening_id is not None:
+                st.success(f"💾 Saved to database (screening #{screening_id})")
+            else:
+                st.warning("⚠️ Could not save record to database")
+
+        observe('screening.assessment', time.perf_counter() - assessment_started)